@@ -0,0 +1,237 @@
+"""
+Offline benchmark for the scrape -> score pipeline.
+
+Runs the real `run_scraping_task` from socketio_events against a stub
+llama.cpp server (benchmarks/stub_llama_server.py), a synthetic scraper that
+produces jobs at a fixed rate and a throwaway SQLite database, for every
+combination of worker count and queue size. No browser, GPU or PostgreSQL
+is needed. With `--scraper http` the real HTTP scraper backend is used
+instead, against the LinkedIn stand-in (benchmarks/stub_linkedin_server.py). With
+`--queue durable` scraped jobs go through the pending_scoring table
+(pending_scoring.PendingScoringQueue) instead of the in-memory queue.
+
+Reports per configuration, as JSON:
+    jobs_per_second          scored and saved jobs / wall time of the run
+    latency_p50/p95_seconds  enqueue -> job_processed event, per job
+    queue_wait_p50/p95       enqueue -> picked up by a rating worker
+    slot_wait_p50/p95        time requests waited for a free stub slot
+
+Usage:
+    python benchmarks/bench_pipeline.py --jobs 60 --workers 1,2,4 --queue-sizes 10,50 \
+        --slots 3 --latency 0.2 --output bench_output.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from queue import Queue
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from flask import Flask
+from flask_socketio import SocketIO
+
+import scoring_pool
+import socketio_events
+from models import db, SearchCriteria, UserProfile, Job, ScoreCache, ParkedJob, PendingScoring
+from pending_scoring import PendingScoringQueue
+import scrapers
+from stub_llama_server import StubLlamaServer
+from stub_linkedin_server import StubLinkedInServer
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return round(ordered[index], 4)
+
+
+class QueueTimings:
+    """Mixin for queues that records when each job (by title) was put and taken."""
+
+    put_times = {}
+    get_times = {}
+
+    def put(self, item, block=True, timeout=None):
+        super().put(item, block, timeout)
+        if item is not None:
+            QueueTimings.put_times[item['title']] = time.perf_counter()
+
+    def get(self, block=True, timeout=None):
+        item = super().get(block, timeout)
+        if item is not None:
+            QueueTimings.get_times.setdefault(item['title'], time.perf_counter())
+        return item
+
+
+class InstrumentedQueue(QueueTimings, Queue):
+    pass
+
+
+class InstrumentedPendingQueue(QueueTimings, PendingScoringQueue):
+    pass
+
+
+def make_synthetic_scraper(n_jobs, interval, tag):
+    """create_scraper replacement whose scraper emits `n_jobs` postings, one every `interval` seconds."""
+
+    class SyntheticScraper:
+        def __init__(self, *args, stop_callback=None, **kwargs):
+            self.stop_callback = stop_callback or (lambda: False)
+
+        def scrape_jobs(self, queue=None):
+            for i in range(n_jobs):
+                if self.stop_callback():
+                    return
+                time.sleep(interval)
+                queue.put({
+                    'title': f'{tag} job {i}',
+                    'company': f'Company {i % 7}',
+                    'location': 'Munich',
+                    'description': f'Synthetic posting {i} for {tag}. Python, PyTorch, LLMs. ' * 20,
+                    'application_link': f'https://example.com/{tag}/{i}',
+                })
+
+    return lambda backend, **kwargs: SyntheticScraper(**kwargs)
+
+
+def build_app(db_path):
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{db_path}'
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {'connect_args': {'timeout': 30, 'check_same_thread': False}}
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    socketio = SocketIO(app, async_mode='threading')
+    return app, socketio
+
+
+def run_configuration(app, socketio, run_scraping_task, stub, args, workers, queue_size, linkedin=None):
+    tag = f'w{workers}-q{queue_size}'
+    with app.app_context():
+        for model in (Job, ScoreCache, ParkedJob, PendingScoring):
+            model.query.delete()
+        db.session.commit()
+        template_id = SearchCriteria.query.filter_by(is_template=True).first().id
+
+    # Fixed-size pool and queue for this configuration
+    scoring_pool.SCORING_WORKERS_MIN = workers
+    scoring_pool.SCORING_WORKERS_MAX = workers
+    socketio_events.SCORING_QUEUE_SIZE = queue_size
+    if linkedin is None:
+        socketio_events.create_scraper = make_synthetic_scraper(args.jobs, args.scrape_interval, tag)
+    else:
+        # Real HTTP backend against the stand-in; a fresh location per run so nothing is a known duplicate
+        linkedin.jobs_per_location = args.jobs
+        with app.app_context():
+            template = SearchCriteria.query.get(template_id)
+            template.scraper_backend = 'http'
+            template.locations = tag
+            template.pages = (args.jobs + linkedin.page_size - 1) // linkedin.page_size
+            db.session.commit()
+    QueueTimings.put_times, QueueTimings.get_times = {}, {}
+    stub.slot_wait_seconds = []
+
+    processed = {}
+    original_emit = socketio.emit
+
+    def recording_emit(event, payload=None, *a, **kw):
+        if event == 'job_processed':
+            processed[payload['job']] = time.perf_counter()
+        return original_emit(event, payload, *a, **kw)
+
+    socketio.emit = recording_emit
+    start = time.perf_counter()
+    try:
+        run_scraping_task({'id': template_id})
+    finally:
+        socketio.emit = original_emit
+    wall = time.perf_counter() - start
+
+    put_times, get_times = QueueTimings.put_times, QueueTimings.get_times
+    latencies = [processed[t] - put_times[t] for t in processed if t in put_times]
+    waits = [get_times[t] - put_times[t] for t in get_times if t in put_times]
+    return {
+        'workers': workers,
+        'queue_size': queue_size,
+        'jobs_scraped': len(put_times),
+        'jobs_processed': len(processed),
+        'wall_seconds': round(wall, 3),
+        'jobs_per_second': round(len(processed) / wall, 3) if wall else None,
+        'latency_p50_seconds': percentile(latencies, 50),
+        'latency_p95_seconds': percentile(latencies, 95),
+        'queue_wait_p50_seconds': percentile(waits, 50),
+        'queue_wait_p95_seconds': percentile(waits, 95),
+        'slot_wait_p50_seconds': percentile(stub.slot_wait_seconds, 50),
+        'slot_wait_p95_seconds': percentile(stub.slot_wait_seconds, 95),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--jobs', type=int, default=30, help='Jobs produced by the synthetic scraper per run')
+    parser.add_argument('--scrape-interval', type=float, default=0.05, help='Seconds between scraped jobs')
+    parser.add_argument('--workers', default='1,2,4', help='Comma-separated worker counts')
+    parser.add_argument('--queue-sizes', default='10,50', help='Comma-separated queue sizes')
+    parser.add_argument('--slots', type=int, default=3, help='Slots of the stub server')
+    parser.add_argument('--latency', type=float, default=0.2, help='Stub prompt processing time (s)')
+    parser.add_argument('--tokens-per-second', type=float, default=500.0)
+    parser.add_argument('--completion-tokens', type=int, default=100)
+    parser.add_argument('--scraper', choices=['synthetic', 'http'], default='synthetic',
+                        help='Synthetic job generator, or the HTTP backend against the LinkedIn stand-in')
+    parser.add_argument('--queue', choices=['memory', 'durable'], default='memory',
+                        help='In-memory scoring queue, or the pending_scoring table (PENDING_SCORING_ENABLED)')
+    parser.add_argument('--output', help='Write the JSON report here instead of stdout')
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)  # The pipeline logs every job
+
+    with tempfile.TemporaryDirectory() as tmp, StubLlamaServer(
+        slots=args.slots, prompt_latency=args.latency, tokens_per_second=args.tokens_per_second,
+        completion_tokens=args.completion_tokens
+    ) as stub, StubLinkedInServer(latency=args.scrape_interval) as linkedin:
+        os.environ['LLAMA_CPP_HOST'] = stub.url
+        scrapers.HttpLinkedInScraper.BASE_URL = linkedin.url
+        app, socketio = build_app(Path(tmp) / 'bench.db')
+        socketio_events.Queue = InstrumentedQueue
+        socketio_events.PendingScoringQueue = InstrumentedPendingQueue
+        socketio_events.PENDING_SCORING_ENABLED = args.queue == 'durable'
+        run_scraping_task = socketio_events.register_socketio_events(socketio, app)
+
+        with app.app_context():
+            db.create_all()
+            db.session.add(UserProfile(cv_text='Synthetic CV: Python, PyTorch, ML. ' * 50,
+                                       job_preferences='AI engineering roles.'))
+            db.session.add(SearchCriteria(keywords='AI', locations='Munich', pages=1, is_template=True))
+            db.session.commit()
+
+        results = []
+        for workers in [int(w) for w in args.workers.split(',')]:
+            for queue_size in [int(q) for q in args.queue_sizes.split(',')]:
+                results.append(run_configuration(app, socketio, run_scraping_task, stub, args, workers, queue_size,
+                                                 linkedin if args.scraper == 'http' else None))
+
+    report = {
+        'timestamp': time.time(),
+        'parameters': vars(args),
+        'threads_alive_after': threading.active_count(),
+        'results': results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text)
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
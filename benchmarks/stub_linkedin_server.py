@@ -0,0 +1,153 @@
+"""
+Stand-in for LinkedIn's guest job endpoints, for running the HTTP scraper
+backend (scrapers.HttpLinkedInScraper) offline.
+
+Serves the two endpoints the backend uses, rendered from the HTML fixtures in
+benchmarks/fixtures/linkedin/ (which follow the markup of the real guest
+responses):
+
+    /jobs-guest/jobs/api/seeMoreJobPostings/search?keywords=..&location=..&start=N
+    /jobs-guest/jobs/api/jobPosting/<job_id>
+
+Every location has `jobs_per_location` postings, returned `page_size` at a
+time; `latency` seconds are added to every response.
+
+Run standalone and point the scraper at it:
+    python benchmarks/stub_linkedin_server.py --port 11600
+    LINKEDIN_BASE_URL=http://127.0.0.1:11600 ...
+"""
+
+import argparse
+import hashlib
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from string import Template
+from urllib.parse import urlparse, parse_qs
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures" / "linkedin"
+
+TITLES = ["Machine Learning Engineer", "AI Engineer", "Data Scientist", "MLOps Engineer", "Research Engineer"]
+COMPANIES = ["Acme Robotics", "Blue Lake AI", "Northwind Analytics", "Contoso Health", "Fabrikam Mobility"]
+
+
+def _slug(text):
+    return "-".join(text.lower().split())
+
+
+class StubLinkedInServer:
+    """Threaded HTTP server mimicking the guest search and job-posting endpoints."""
+
+    def __init__(self, host="127.0.0.1", port=0, jobs_per_location=25, page_size=10, latency=0.05):
+        self.jobs_per_location = jobs_per_location
+        self.page_size = page_size
+        self.latency = latency
+        self.card_template = Template((FIXTURES / "search_card.html").read_text())
+        self.posting_template = Template((FIXTURES / "job_posting.html").read_text())
+        self._lock = threading.Lock()
+        self.requests_served = 0
+
+        self.httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    # ------------------------------------------------------------------
+    # Synthetic postings
+    # ------------------------------------------------------------------
+    @staticmethod
+    def job_id(location, index):
+        """Stable numeric id of the `index`-th posting in `location`."""
+        digest = hashlib.sha256(f"{location}/{index}".encode("utf-8")).hexdigest()
+        return str(3_000_000_000 + int(digest[:8], 16) % 1_000_000_000)
+
+    def _posting(self, job_id):
+        # The id alone determines the posting, like on the real site
+        n = int(job_id)
+        title, company = TITLES[n % len(TITLES)], COMPANIES[(n // 7) % len(COMPANIES)]
+        return {
+            # Unique titles: the benchmark keys its per-job timings by title
+            "job_id": job_id, "title": f"{title} #{job_id[-6:]}", "slug": _slug(title), "company": company,
+            "company_slug": _slug(company), "location": "Munich, Bavaria, Germany", "years": 2 + n % 4,
+        }
+
+    def search_page(self, location, start):
+        indices = range(start, min(start + self.page_size, self.jobs_per_location))
+        cards = []
+        for index in indices:
+            fields = self._posting(self.job_id(location, index))
+            fields.update(location=location, index=index + 1)
+            cards.append(self.card_template.substitute(fields))
+        return "\n".join(cards)
+
+    def job_posting(self, job_id):
+        return self.posting_template.substitute(self._posting(job_id))
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass  # Keep benchmark output clean
+
+            def _send_html(self, html, status=200):
+                body = html.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                time.sleep(server.latency)
+                with server._lock:
+                    server.requests_served += 1
+                parsed = urlparse(self.path)
+                if parsed.path == "/jobs-guest/jobs/api/seeMoreJobPostings/search":
+                    query = parse_qs(parsed.query)
+                    location = query.get("location", [""])[0]
+                    start = int(query.get("start", ["0"])[0])
+                    self._send_html(server.search_page(location, start))
+                elif parsed.path.startswith("/jobs-guest/jobs/api/jobPosting/"):
+                    self._send_html(server.job_posting(parsed.path.rsplit("/", 1)[-1]))
+                else:
+                    self._send_html("<html><body>Not found</body></html>", status=404)
+
+        return Handler
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11600)
+    parser.add_argument("--jobs-per-location", type=int, default=25)
+    parser.add_argument("--page-size", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds added to every response")
+    args = parser.parse_args()
+
+    stub = StubLinkedInServer(args.host, args.port, args.jobs_per_location, args.page_size, args.latency)
+    print(f"Stub LinkedIn guest API listening on {stub.url}")
+    try:
+        stub.httpd.serve_forever()
+    except KeyboardInterrupt:
+        stub.stop()
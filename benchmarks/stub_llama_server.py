@@ -0,0 +1,165 @@
+"""
+Stand-in for llama-cpp-server used by the offline benchmarks.
+
+Implements the endpoints the scoring pipeline talks to (/health, /props,
+/slots, /v1/chat/completions, /v1/embeddings) with a simple latency model:
+every completion occupies one of `slots` slots for
+`prompt_latency + completion_tokens / tokens_per_second` seconds. Requests
+beyond the slot count wait for a free slot, like the real server does.
+
+Run standalone:
+    python benchmarks/stub_llama_server.py --port 11500 --slots 3 --latency 0.5
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CATEGORIES = [
+    "Skillset Match",
+    "Academic Requirements",
+    "Experience Level",
+    "Professional Experience",
+    "Language Requirements",
+    "Preference Alignment",
+]
+
+
+class StubLlamaServer:
+    """Threaded HTTP server mimicking llama.cpp's OpenAI-compatible API."""
+
+    def __init__(self, host="127.0.0.1", port=0, slots=3, prompt_latency=0.5,
+                 tokens_per_second=50.0, completion_tokens=300, jitter=0.1, embedding_dim=64):
+        self.slots = slots
+        self.prompt_latency = prompt_latency
+        self.tokens_per_second = tokens_per_second
+        self.completion_tokens = completion_tokens
+        self.jitter = jitter
+        self.embedding_dim = embedding_dim
+        self._slot_semaphore = threading.BoundedSemaphore(slots)
+        self._lock = threading.Lock()
+        self.requests_served = 0
+        self.slot_wait_seconds = []
+
+        handler = self._make_handler()
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    # ------------------------------------------------------------------
+    # Responses
+    # ------------------------------------------------------------------
+    def _completion(self, body):
+        queued_at = time.perf_counter()
+        with self._slot_semaphore:
+            wait = time.perf_counter() - queued_at
+            service = self.prompt_latency + self.completion_tokens / self.tokens_per_second
+            time.sleep(max(0.0, service * random.uniform(1 - self.jitter, 1 + self.jitter)))
+        with self._lock:
+            self.requests_served += 1
+            self.slot_wait_seconds.append(wait)
+
+        prompt_chars = sum(len(m.get("content", "")) for m in body.get("messages", []))
+        prompt_tokens = prompt_chars // 4
+        # Pretend the system prompt (CV) was cached when the client asked for it
+        system_tokens = len(body["messages"][0]["content"]) // 4 if body.get("messages") else 0
+        cached = system_tokens if body.get("cache_prompt") else 0
+        assessment = {name: {"evidence": "stub", "score": random.randint(0, 10)} for name in CATEGORIES}
+        return {
+            "choices": [{"message": {"role": "assistant", "content": json.dumps(assessment)}}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": self.completion_tokens},
+            "timings": {"cache_n": cached, "prompt_n": prompt_tokens - cached,
+                        "predicted_n": self.completion_tokens},
+        }
+
+    def _embeddings(self, body):
+        inputs = body.get("input", [])
+        if isinstance(inputs, str):
+            inputs = [inputs]
+        data = []
+        for index, text in enumerate(inputs):
+            # Deterministic pseudo-embedding so similar texts are comparable across runs
+            seed = int(hashlib.sha256(text.encode("utf-8")).hexdigest()[:8], 16)
+            rng = random.Random(seed)
+            data.append({"index": index, "embedding": [rng.uniform(-1, 1) for _ in range(self.embedding_dim)]})
+        return {"data": data}
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass  # Keep benchmark output clean
+
+            def _send_json(self, payload, status=200):
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                if self.path == "/health":
+                    self._send_json({"status": "ok"})
+                elif self.path == "/props":
+                    self._send_json({"total_slots": server.slots})
+                elif self.path == "/slots":
+                    self._send_json([{"id": i} for i in range(server.slots)])
+                else:
+                    self._send_json({"error": "not found"}, status=404)
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+                if self.path == "/v1/chat/completions":
+                    self._send_json(server._completion(body))
+                elif self.path == "/v1/embeddings":
+                    self._send_json(server._embeddings(body))
+                else:
+                    self._send_json({"error": "not found"}, status=404)
+
+        return Handler
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11500)
+    parser.add_argument("--slots", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.5, help="Prompt processing time per request (s)")
+    parser.add_argument("--tokens-per-second", type=float, default=50.0)
+    parser.add_argument("--completion-tokens", type=int, default=300)
+    args = parser.parse_args()
+
+    stub = StubLlamaServer(args.host, args.port, args.slots, args.latency,
+                           args.tokens_per_second, args.completion_tokens)
+    print(f"Stub llama.cpp server listening on {stub.url} ({args.slots} slots)")
+    try:
+        stub.httpd.serve_forever()
+    except KeyboardInterrupt:
+        stub.stop()
@@ -0,0 +1,257 @@
+"""
+Full-text search over the scraped jobs (title, company, description).
+
+On PostgreSQL, job.search_vector is a stored generated tsvector column with
+the title weighted A, the company B and the description C. The database
+keeps it current on every insert and update, and a GIN index
+(ix_job_search_vector, migration 7) answers the `@@` match. Queries use
+websearch_to_tsquery syntax (words are ANDed; "quoted phrases", `or` and
+`-excluded` work too). Results are ranked with ts_rank and keyset-paginated
+on (rank, id). ts_headline, which re-parses the text, only runs on the rows
+of the requested page.
+
+Other databases (the SQLite benchmark and test setups) use an in-process
+inverted index instead. It is built on the first search; every later one
+indexes new jobs and re-indexes jobs updated since the last search (by
+updated_at). Routes that delete jobs call forget_jobs(); a search only scans
+all job ids when the job count shows a deletion it wasn't told about. It
+understands plain words and `-excluded` words, and ranks with the same field
+weights.
+
+Highlights are HTML: the matched text is escaped and the hits are wrapped in
+<mark>. All functions expect a Flask app context.
+"""
+
+import html
+import math
+import re
+import threading
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, or_, select, text
+
+from models import db, Job
+
+# Text search configuration: postings are in English and German, so no stemming
+SEARCH_TEXT_CONFIG = 'simple'
+SEARCH_SNIPPET_WORDS = 30
+
+# Generated column of migration 7 (PostgreSQL)
+SEARCH_VECTOR_SQL = (
+    f"setweight(to_tsvector('{SEARCH_TEXT_CONFIG}', coalesce(title, '')), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_TEXT_CONFIG}', coalesce(company, '')), 'B') || "
+    f"setweight(to_tsvector('{SEARCH_TEXT_CONFIG}', coalesce(description, '')), 'C')"
+)
+
+# Private-use characters that mark hits until the text is HTML-escaped
+_START, _STOP = '\ue000', '\ue001'
+_HEADLINE_OPTIONS = f'StartSel={_START}, StopSel={_STOP}'
+
+_TOKEN = re.compile(r'\w+')
+_FIELD_WEIGHTS = (('title', 1.0), ('company', 0.4), ('description', 0.2))  # ts_rank's A, B, C weights
+_SYNC_SLACK_SECONDS = 60
+
+
+def _highlight_html(marked: str) -> str:
+    return html.escape(marked).replace(_START, '<mark>').replace(_STOP, '</mark>')
+
+
+def search_jobs(query: str, limit: int, cursor=None, search_criteria_id: int = None):
+    """
+    One page of jobs matching `query`, best first.
+
+    `cursor` is the (rank, id) of the last hit of the previous page. Returns
+    (hits, next_cursor), where hits are dicts with id, rank, title_highlight
+    and snippet, and next_cursor is None on the last page.
+    """
+    if db.engine.dialect.name == 'postgresql':
+        hits = _search_postgresql(query, limit + 1, cursor, search_criteria_id)
+    else:
+        hits = _fallback_index.search(query, limit + 1, cursor, search_criteria_id)
+
+    next_cursor = None
+    if len(hits) > limit:
+        hits = hits[:limit]
+        next_cursor = (hits[-1]['rank'], hits[-1]['id'])
+    return hits, next_cursor
+
+
+def forget_jobs(job_ids):
+    """Drop deleted jobs from the in-process index (call after the delete is committed)."""
+    _fallback_index.forget(job_ids)
+
+
+# ----------------------------------------------------------------------
+# PostgreSQL
+# ----------------------------------------------------------------------
+def _search_postgresql(query, limit, cursor, search_criteria_id):
+    filters = ''
+    params = {'config': SEARCH_TEXT_CONFIG, 'q': query, 'limit': limit,
+              'title_options': f'{_HEADLINE_OPTIONS}, HighlightAll=true',
+              'snippet_options': f'{_HEADLINE_OPTIONS}, MaxWords={SEARCH_SNIPPET_WORDS}, MinWords=10, MaxFragments=2'}
+    if search_criteria_id is not None:
+        filters += ' AND job.search_criteria_id = :search_criteria_id'
+        params['search_criteria_id'] = search_criteria_id
+    page_filter = ''
+    if cursor is not None:
+        page_filter = 'WHERE (matches.rank, matches.id) < (CAST(:cursor_rank AS float8), :cursor_id)'
+        params['cursor_rank'], params['cursor_id'] = cursor
+
+    # Rank every match (GIN index scan), keep one page, and only highlight that page.
+    # ts_rank is a float4; as float8 the rank survives the round trip through the
+    # cursor exactly, so pages neither repeat nor skip hits with equal rank.
+    rows = db.session.execute(text(f"""
+        SELECT page.id, page.rank,
+               ts_headline(CAST(:config AS regconfig), job.title, page.query, :title_options),
+               ts_headline(CAST(:config AS regconfig), coalesce(job.description, ''), page.query, :snippet_options)
+        FROM (
+            SELECT matches.id, matches.rank, matches.query
+            FROM (
+                SELECT job.id, CAST(ts_rank(job.search_vector, query) AS float8) AS rank, query
+                FROM job, websearch_to_tsquery(CAST(:config AS regconfig), :q) AS query
+                WHERE job.search_vector @@ query{filters}
+            ) AS matches
+            {page_filter}
+            ORDER BY matches.rank DESC, matches.id DESC
+            LIMIT :limit
+        ) AS page
+        JOIN job ON job.id = page.id
+        ORDER BY page.rank DESC, page.id DESC
+    """), params).all()
+
+    return [{
+        'id': job_id,
+        'rank': rank,
+        'title_highlight': _highlight_html(title),
+        'snippet': _highlight_html(snippet),
+    } for job_id, rank, title, snippet in rows]
+
+
+# ----------------------------------------------------------------------
+# In-process fallback
+# ----------------------------------------------------------------------
+def _tokens(value):
+    return _TOKEN.findall((value or '').lower())
+
+
+class InvertedIndex:
+    """Term -> {job id: weighted term frequency} over the Job table, kept in this process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._postings = {}
+        self._terms_of = {}  # job id -> its terms, to drop deleted jobs
+        self._last_id = 0
+        self._last_synced_at = None
+
+    def _add(self, job_id, fields):
+        weights = {}
+        for (field, weight), value in zip(_FIELD_WEIGHTS, fields):
+            for term in _tokens(value):
+                weights[term] = weights.get(term, 0.0) + weight
+        for term, weight in weights.items():
+            self._postings.setdefault(term, {})[job_id] = weight
+        self._terms_of[job_id] = tuple(weights)
+
+    def _remove(self, job_id):
+        for term in self._terms_of.pop(job_id, ()):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(job_id, None)
+                if not postings:
+                    del self._postings[term]
+
+    def _sync(self):
+        """Index new jobs, re-index edited ones and forget deleted ones."""
+        synced_at = datetime.utcnow()
+        changed = Job.id > self._last_id
+        if self._last_synced_at is not None:
+            # Slack for transactions that committed after their updated_at was set
+            changed = or_(changed, Job.updated_at >= self._last_synced_at - timedelta(seconds=_SYNC_SLACK_SECONDS))
+        last_seen = 0
+        while True:
+            rows = db.session.execute(
+                select(Job.id, Job.title, Job.company, Job.description)
+                .where(changed, Job.id > last_seen).order_by(Job.id).limit(5000)
+            ).all()
+            if not rows:
+                break
+            for job_id, *fields in rows:
+                self._remove(job_id)
+                self._add(job_id, fields)
+            last_seen = rows[-1][0]
+            self._last_id = max(self._last_id, last_seen)
+        self._last_synced_at = synced_at
+
+        # Every job is indexed now, so more indexed ids than jobs means some were
+        # deleted without forget(); only then look up which
+        if db.session.execute(select(func.count(Job.id))).scalar() != len(self._terms_of):
+            existing = set(db.session.execute(select(Job.id)).scalars())
+            for job_id in [job_id for job_id in self._terms_of if job_id not in existing]:
+                self._remove(job_id)
+
+    def forget(self, job_ids):
+        with self._lock:
+            for job_id in job_ids:
+                self._remove(job_id)
+
+    def search(self, query, limit, cursor=None, search_criteria_id=None):
+        words = query.split()
+        included = [term for word in words if not word.startswith('-') for term in _tokens(word)]
+        excluded = [term for word in words if word.startswith('-') for term in _tokens(word)]
+        if not included:
+            return []
+
+        with self._lock:
+            self._sync()
+            postings = [self._postings.get(term, {}) for term in included]
+            postings.sort(key=len)
+            matches = set(postings[0])
+            for other in postings[1:]:
+                matches.intersection_update(other)
+            for term in excluded:
+                matches.difference_update(self._postings.get(term, {}))
+            if search_criteria_id is not None:
+                matches.intersection_update(db.session.execute(
+                    select(Job.id).where(Job.search_criteria_id == search_criteria_id)).scalars())
+
+            total = max(1, len(self._terms_of))
+            idf = [math.log(1 + total / len(p)) if p else 0.0 for p in postings]
+            ranked = []
+            for job_id in matches:
+                rank = sum(w * (1 + math.log(1 + p[job_id])) for p, w in zip(postings, idf))
+                ranked.append((rank, job_id))
+
+        if cursor is not None:
+            ranked = [hit for hit in ranked if hit < tuple(cursor)]
+        page = sorted(ranked, reverse=True)[:limit]
+
+        texts = dict((job_id, (title, description)) for job_id, title, description in db.session.execute(
+            select(Job.id, Job.title, Job.description).where(Job.id.in_([job_id for _, job_id in page]))))
+        hits = []
+        for rank, job_id in page:
+            if job_id not in texts:
+                continue  # Deleted since the sync
+            title, description = texts[job_id]
+            hits.append({
+                'id': job_id,
+                'rank': rank,
+                'title_highlight': _highlight_html(_mark(title or '', set(included))),
+                'snippet': _highlight_html(_mark(_snippet(description or '', set(included)), set(included))),
+            })
+        return hits
+
+
+def _mark(value, terms):
+    return _TOKEN.sub(lambda m: f'{_START}{m.group(0)}{_STOP}' if m.group(0).lower() in terms else m.group(0), value)
+
+
+def _snippet(description, terms):
+    """About SEARCH_SNIPPET_WORDS words of the description around its first hit."""
+    words = description.split()
+    first = next((i for i, word in enumerate(words) if any(t in terms for t in _tokens(word))), 0)
+    start = max(0, first - SEARCH_SNIPPET_WORDS // 3)
+    return ' '.join(words[start:start + SEARCH_SNIPPET_WORDS])
+
+
+_fallback_index = InvertedIndex()
@@ -0,0 +1,190 @@
+"""
+Single writer stage for scored jobs.
+
+Rating workers hand their finished jobs to a JobWriter instead of committing
+each one themselves. The writer thread collects them and flushes a batch when
+JOB_WRITER_BATCH_SIZE jobs are waiting or JOB_WRITER_FLUSH_SECONDS have passed
+since the first one arrived. Each flush is one
+`INSERT ... ON CONFLICT (application_link) DO NOTHING RETURNING application_link`
+and one commit, so duplicates are dropped by the database instead of by a
+check-then-insert race, and `on_saved` is only called for rows that were
+really inserted, after the commit. Jobs that came from the durable scoring
+queue are removed from pending_scoring in the same commit.
+
+If a batch fails, its jobs are saved one by one, and the ones that still
+fail are handed to `on_failed` (the pipeline parks them for the next run)
+instead of being dropped with the batch.
+"""
+
+import logging
+import os
+import threading
+import time
+from queue import Queue, Empty
+
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from models import db, Job, score_column_values
+from pending_scoring import remove_pending, release_pending
+from scrape_summaries import invalidate_scrape_summaries
+
+logger = logging.getLogger('queue')
+
+JOB_WRITER_BATCH_SIZE = int(os.getenv('JOB_WRITER_BATCH_SIZE', '20'))
+JOB_WRITER_FLUSH_SECONDS = float(os.getenv('JOB_WRITER_FLUSH_SECONDS', '2'))
+
+# Dialects with an upsert-capable INSERT (the benchmarks run on SQLite)
+_INSERTS = {
+    'postgresql': postgresql_insert,
+    'sqlite': sqlite_insert,
+}
+
+# Job columns a scraped + scored job provides; everything else uses the model defaults
+_JOB_FIELDS = ('title', 'company', 'location', 'description', 'application_link',
+               'matching_score', 'score_details')
+
+
+class JobWriter:
+    """Background thread that batches scored jobs into the Job table."""
+
+    def __init__(self, app, on_saved=None, on_failed=None, batch_size: int = None, flush_seconds: float = None):
+        self.app = app
+        self.on_saved = on_saved  # Called with each job_data dict once it is committed
+        # Called with (job_data, error, pending_id), in an app context, for jobs that could not be saved
+        self.on_failed = on_failed
+        self.batch_size = max(1, batch_size or JOB_WRITER_BATCH_SIZE)
+        self.flush_seconds = flush_seconds if flush_seconds is not None else JOB_WRITER_FLUSH_SECONDS
+        self._queue = Queue()
+        self._thread = None
+        self.jobs_saved = 0
+        self.duplicates_skipped = 0
+        self.jobs_failed = 0
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def submit(self, job_data: dict, search_criteria_id: int, pending_id: int = None):
+        """Queue one scored job for the next flush. `pending_id` is its pending_scoring row, if any."""
+        self._queue.put((job_data, search_criteria_id, pending_id))
+
+    def close(self):
+        """Flush everything that was submitted and stop the writer thread."""
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+        logger.info(f"Job writer stopped: {self.jobs_saved} saved, {self.duplicates_skipped} duplicates skipped, "
+                    f"{self.jobs_failed} failed")
+
+    def _run(self):
+        finished = False
+        while not finished:
+            # Block for the first job, then collect until the batch is full or the window closes
+            item = self._queue.get()
+            if item is None:
+                break
+            batch = [item]
+            deadline = time.monotonic() + self.flush_seconds
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except Empty:
+                    break
+                if item is None:
+                    finished = True
+                    break
+                batch.append(item)
+            self._flush(batch)
+
+    def _flush(self, batch):
+        # Later duplicates within a batch would be dropped by ON CONFLICT anyway
+        jobs, links, duplicate_pending_ids = [], set(), []
+        for job_data, search_criteria_id, pending_id in batch:
+            link = job_data.get('application_link')
+            if link is not None and link in links:
+                self.duplicates_skipped += 1
+                duplicate_pending_ids.append(pending_id)
+                continue
+            links.add(link)
+            row = dict({field: job_data.get(field) for field in _JOB_FIELDS},
+                       search_criteria_id=search_criteria_id,
+                       **score_column_values(job_data.get('score_details')))
+            jobs.append((job_data, row, pending_id))
+        rows = [row for _, row, _ in jobs]
+
+        failed_before = self.jobs_failed
+        with self.app.app_context():
+            try:
+                # Duplicates are done too
+                inserted = self._insert(rows, [pending_id for _, _, pending_id in jobs] + duplicate_pending_ids)
+            except Exception as e:
+                db.session.rollback()
+                logger.warning(f"Saving a batch of {len(rows)} job(s) failed, saving them one by one: {e}")
+                inserted = self._insert_one_by_one(jobs, duplicate_pending_ids)
+
+        if inserted:
+            invalidate_scrape_summaries()
+        saved_links = set(inserted)
+        self.jobs_saved += len(inserted)
+        self.duplicates_skipped += len(rows) - len(inserted) - (self.jobs_failed - failed_before)
+        for job_data, _, _ in jobs:
+            if job_data.get('application_link') in saved_links and self.on_saved:
+                try:
+                    self.on_saved(job_data)
+                except Exception as e:
+                    logger.debug(f"on_saved callback failed: {e}")
+
+    def _insert(self, rows, pending_ids):
+        """Insert `rows`, skipping known links, and drop `pending_ids` from the queue in one commit."""
+        inserted = []
+        if rows:
+            insert = _INSERTS.get(db.engine.dialect.name, postgresql_insert)
+            statement = (
+                insert(Job)
+                .values(rows)
+                .on_conflict_do_nothing(index_elements=['application_link'])
+                .returning(Job.application_link)
+            )
+            inserted = list(db.session.execute(statement).scalars())
+        remove_pending(pending_ids)
+        db.session.commit()
+        return inserted
+
+    def _insert_one_by_one(self, jobs, duplicate_pending_ids):
+        """Save a failed batch row by row, so one bad job doesn't lose the others; hand the bad ones to on_failed."""
+        try:
+            self._insert([], duplicate_pending_ids)
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Removing {len(duplicate_pending_ids)} duplicate(s) from the scoring queue failed: {e}")
+
+        inserted = []
+        for job_data, row, pending_id in jobs:
+            try:
+                inserted += self._insert([row], [pending_id])
+            except Exception as e:
+                db.session.rollback()
+                logger.error(f"Saving job {job_data.get('title')} failed: {e}")
+                self._failed(job_data, row['search_criteria_id'], e, pending_id)
+        return inserted
+
+    def _failed(self, job_data, search_criteria_id, error, pending_id):
+        self.jobs_failed += 1
+        try:
+            if self.on_failed is not None:
+                self.on_failed(job_data, search_criteria_id, f"Saving failed: {error}", pending_id)
+                return
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Keeping unsaved job {job_data.get('title')} failed: {e}")
+        # Not kept elsewhere: give a durable job back to the queue instead of leaving it claimed
+        try:
+            release_pending([pending_id])
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Releasing pending job {pending_id} failed: {e}")
@@ -0,0 +1,128 @@
+"""
+In-memory set of application links that are already in the database.
+
+Loaded once when a scrape run starts, so the scraper thread can drop
+duplicates before they are queued instead of every rating worker running its
+own existence query. Links claimed during the run are added as they go.
+
+For large tables the preloaded links are kept in a Bloom filter instead of a
+set. A Bloom hit may be a false positive, so it is confirmed with one exact
+query; a miss is always exact.
+
+Loading expects a Flask app context. claim() is also called from scraper
+session threads that have none, so the Bloom-hit lookup runs in its own
+context of the app the links were loaded in.
+"""
+
+import hashlib
+import logging
+import math
+import os
+import threading
+from datetime import datetime, timedelta
+
+from flask import current_app
+
+from models import db, Job
+
+logger = logging.getLogger('queue')
+
+KNOWN_LINKS_WINDOW_DAYS = int(os.getenv('KNOWN_LINKS_WINDOW_DAYS', '90'))
+KNOWN_LINKS_BLOOM_THRESHOLD = int(os.getenv('KNOWN_LINKS_BLOOM_THRESHOLD', '200000'))
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings (double hashing on sha256)."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        capacity = max(1, capacity)
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str):
+        digest = hashlib.sha256(item.encode('utf-8')).digest()
+        h1 = int.from_bytes(digest[:8], 'big')
+        h2 = int.from_bytes(digest[8:16], 'big') | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hash_count))
+
+    def add(self, item: str):
+        for pos in self._positions(item):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+def _link_in_db(link: str) -> bool:
+    return db.session.query(Job.id).filter_by(application_link=link).first() is not None
+
+
+class KnownLinks:
+    """Thread-safe registry of application links that must not be scored again."""
+
+    def __init__(self, links=(), use_bloom: bool = False, expected: int = 0, app=None):
+        self._lock = threading.Lock()
+        self._app = app  # For the exact lookup behind a Bloom hit; None = caller's app context
+        self._claimed = set()  # Links added during this run (always exact)
+        self._bloom = BloomFilter(expected) if use_bloom else None
+        self._preloaded = set() if not use_bloom else None
+        for link in links:
+            if self._bloom is not None:
+                self._bloom.add(link)
+            else:
+                self._preloaded.add(link)
+
+    @classmethod
+    def load(cls, window_days: int = KNOWN_LINKS_WINDOW_DAYS) -> "KnownLinks":
+        """Preload links of jobs scraped in the last `window_days` days in one query."""
+        cutoff = datetime.utcnow() - timedelta(days=window_days)
+        query = db.session.query(Job.application_link).filter(
+            Job.scraped_at >= cutoff,
+            Job.application_link.isnot(None)
+        )
+        expected = query.count()
+        use_bloom = expected > KNOWN_LINKS_BLOOM_THRESHOLD
+        known = cls((link for (link,) in query.yield_per(10000)), use_bloom=use_bloom, expected=expected,
+                    app=current_app._get_current_object())
+        logger.info(f"Loaded {expected} known application links"
+                    f"{' into a Bloom filter' if use_bloom else ''} (last {window_days} days)")
+        return known
+
+    def claim(self, link: str) -> bool:
+        """
+        Register `link` for this run. Returns False if it is already known
+        (in the database or claimed earlier), True if the caller may process it.
+        """
+        with self._lock:
+            if link in self._claimed:
+                return False
+            if self._preloaded is not None and link in self._preloaded:
+                return False
+            if self._bloom is None or link not in self._bloom:
+                self._claimed.add(link)
+                return True
+
+        # Bloom hit: confirm with one exact query, outside the lock so other sessions aren't held up
+        if self._in_db(link):
+            return False
+        with self._lock:
+            if link in self._claimed:
+                return False
+            self._claimed.add(link)
+            return True
+
+    def _in_db(self, link: str) -> bool:
+        if self._app is None:
+            return _link_in_db(link)
+        with self._app.app_context():
+            return _link_in_db(link)
+
+    def add(self, link: str):
+        """Record a link that was inserted by other means."""
+        with self._lock:
+            self._claimed.add(link)
+
+    def is_known(self, link: str) -> bool:
+        """Scraper callback: True for duplicates, claims the link otherwise."""
+        return not self.claim(link)
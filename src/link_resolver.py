@@ -0,0 +1,130 @@
+"""
+Deferred resolution of external application URLs.
+
+The scraper stores each job under its canonical LinkedIn URL and does not
+click through to the external apply page. That click-through (new tab, wait,
+read URL, close) is done here instead, only for jobs that are worth it:
+
+- in the background after a scrape, for jobs scoring at least
+  APPLY_LINK_SCORE_THRESHOLD, best first
+- when the job details are opened: the job jumps to the front of the same
+  background resolver (request_resolution), and the UI polls for the result
+
+Requests never open a browser themselves. The resolver holds one WebDriver
+session on top of the SCRAPER_SESSIONS of a running scrape, so the Selenium
+node must allow SCRAPER_SESSIONS + 1 sessions.
+
+The result is stored in Job.external_link; NULL means "not resolved yet".
+"""
+
+import logging
+import os
+import threading
+
+from models import db, Job
+from scrapers import ApplyLinkResolver
+
+logger = logging.getLogger('queue')
+
+APPLY_LINK_SCORE_THRESHOLD = float(os.getenv('APPLY_LINK_SCORE_THRESHOLD', '60'))
+LINKEDIN_JOB_URL_PREFIX = 'https://www.linkedin.com/jobs/view/'
+
+# One background resolver at a time (it holds a browser session)
+_resolver_lock = threading.Lock()
+
+# Jobs opened in the UI, resolved before the score-ordered backlog
+_requested = []
+_requested_lock = threading.Lock()
+
+
+def needs_resolution(job) -> bool:
+    """True for scraped LinkedIn jobs whose external apply URL is still unknown."""
+    return (job.external_link is None and job.application_link is not None
+            and job.application_link.startswith(LINKEDIN_JOB_URL_PREFIX))
+
+
+def apply_link(job) -> str:
+    """Best link to apply to `job` with: the external URL when known, else the stored link."""
+    if job.external_link and job.external_link != "Not Available":
+        return job.external_link
+    return job.application_link
+
+
+def request_resolution(app, job_id: int):
+    """Queue one job for the background resolver, ahead of the backlog, and make sure it runs."""
+    with _requested_lock:
+        if job_id not in _requested:
+            _requested.append(job_id)
+    start_link_resolver(app)
+
+
+def _next_job_id(backlog):
+    with _requested_lock:
+        if _requested:
+            return _requested.pop(0)
+    return backlog.pop(0) if backlog else None
+
+
+def resolve_pending_links(app, min_score: float = None, stop_callback=None) -> int:
+    """
+    Resolve the requested jobs, then all unresolved jobs scoring at least
+    `min_score`, best first. Returns the count.
+    """
+    min_score = APPLY_LINK_SCORE_THRESHOLD if min_score is None else min_score
+    stop_callback = stop_callback or (lambda: False)
+    resolved = 0
+    with app.app_context():
+        job_ids = [job_id for (job_id,) in db.session.query(Job.id).filter(
+            Job.external_link.is_(None),
+            Job.application_link.startswith(LINKEDIN_JOB_URL_PREFIX),
+            Job.matching_score >= min_score
+        ).order_by(Job.matching_score.desc())]
+        with _requested_lock:
+            requested = len(_requested)
+        if not job_ids and not requested:
+            return 0
+
+        logger.info(f"Resolving application links of {requested} opened job(s) "
+                    f"and {len(job_ids)} job(s) scoring >= {min_score:g}")
+        with ApplyLinkResolver() as resolver:
+            while not stop_callback():
+                job_id = _next_job_id(job_ids)
+                if job_id is None:
+                    break
+                job = Job.query.get(job_id)
+                # Deleted (confirm_scrape) or resolved earlier (requested and in the backlog)
+                if job is None or not needs_resolution(job):
+                    continue
+                try:
+                    job.external_link = resolver.resolve(job.application_link)
+                    db.session.commit()
+                    resolved += 1
+                except Exception as e:
+                    db.session.rollback()
+                    logger.warning(f"Resolving the application link of {job.title} failed: {e}")
+    logger.info(f"Resolved {resolved} application link(s)")
+    return resolved
+
+
+def start_link_resolver(app, min_score: float = None):
+    """Run resolve_pending_links in a daemon thread unless one is already running."""
+    def run():
+        while True:
+            if not _resolver_lock.acquire(blocking=False):
+                return  # The running resolver picks up new requests too
+            try:
+                resolve_pending_links(app, min_score)
+            except Exception as e:
+                logger.warning(f"Application link resolver failed: {e}")
+                with _requested_lock:
+                    _requested.clear()  # Don't retry in a loop; opening the job again requests it again
+            finally:
+                _resolver_lock.release()
+            # Requests that came in while the resolver was finishing
+            with _requested_lock:
+                if not _requested:
+                    return
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread
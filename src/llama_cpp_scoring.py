@@ -9,10 +9,14 @@ from __future__ import annotations
 
 import os
 import time
+import random
+import asyncio
+import hashlib
 import logging
+import threading
 from enum import Enum
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, AsyncIterator, Iterable
 from pathlib import Path
 import httpx
 from pydantic import BaseModel, Field, ConfigDict
@@ -59,22 +63,273 @@ class LlamaCppConfig:
     """Configuration for llama.cpp server connection."""
 
     host: str = "http://llama-cpp-server:11434"
+    model: str = "Qwen3-4B-Q4_K_M"  # Informational only (llama.cpp serves one model), used in cache keys
     timeout_seconds: float = 120.0
-    max_retries: int = 2
+    max_retries: int = 2  # Retries per request for transient errors (connect errors, timeouts, 429/502/503/504)
+    retry_backoff_seconds: float = 1.0  # Base of the jittered exponential backoff
+    retry_backoff_max_seconds: float = 30.0
     temperature: float = 0.0
     max_tokens: int = 2048
+    cache_prompt: bool = True  # Let the server reuse the KV cache of the shared CV/preferences prefix
+    parallel_slots: int = 1  # Must match the server's --parallel setting (per backend)
+    hosts: tuple[str, ...] = ()  # Additional llama.cpp backends to balance across; empty = only `host`
+    embedding_host: str = ""  # llama.cpp server started with --embeddings; empty = same as `host`
+    eject_after_failures: int = 3  # Consecutive failures before a backend is taken out of rotation
+    probe_interval_seconds: float = 30.0  # How often an ejected backend is probed for re-admission
+    circuit_failure_threshold: int = 3  # Consecutive failed requests (after retries) that open the circuit
+    circuit_reset_seconds: float = 30.0  # How long the circuit stays open before a trial request
+    circuit_max_wait_seconds: float = 300.0  # How long a worker waits for an open circuit before giving up
+
+    @property
+    def backend_hosts(self) -> tuple[str, ...]:
+        """All backends requests may be routed to."""
+        return self.hosts or (self.host,)
 
     @classmethod
     def from_env(cls) -> "LlamaCppConfig":
         """Create config from environment variables."""
         return cls(
             host=os.getenv("LLAMA_CPP_HOST", "http://llama-cpp-server:11434"),
+            model=os.getenv("LLAMA_CPP_MODEL", "Qwen3-4B-Q4_K_M"),
             timeout_seconds=float(os.getenv("LLAMA_CPP_TIMEOUT", "120")),
             temperature=float(os.getenv("LLAMA_CPP_TEMPERATURE", "0")),
             max_tokens=int(os.getenv("LLAMA_CPP_MAX_TOKENS", "2048")),
+            cache_prompt=os.getenv("LLAMA_CPP_CACHE_PROMPT", "1") == "1",
+            parallel_slots=max(1, int(os.getenv("LLAMA_CPP_PARALLEL", "1"))),
+            hosts=tuple(h.strip() for h in os.getenv("LLAMA_CPP_HOSTS", "").split(",") if h.strip()),
+            embedding_host=os.getenv("LLAMA_CPP_EMBEDDING_HOST", ""),
+            eject_after_failures=int(os.getenv("LLAMA_CPP_EJECT_AFTER_FAILURES", "3")),
+            probe_interval_seconds=float(os.getenv("LLAMA_CPP_PROBE_INTERVAL", "30")),
+            max_retries=int(os.getenv("LLAMA_CPP_MAX_RETRIES", "2")),
+            retry_backoff_seconds=float(os.getenv("LLAMA_CPP_RETRY_BACKOFF", "1")),
+            circuit_failure_threshold=int(os.getenv("LLAMA_CPP_CIRCUIT_THRESHOLD", "3")),
+            circuit_reset_seconds=float(os.getenv("LLAMA_CPP_CIRCUIT_RESET", "30")),
+            circuit_max_wait_seconds=float(os.getenv("LLAMA_CPP_CIRCUIT_MAX_WAIT", "300")),
         )
 
 
+# --- 2b. Backend Load Balancing ---
+@dataclass
+class Backend:
+    """Routing state of one llama.cpp server."""
+
+    host: str
+    outstanding: int = 0
+    consecutive_failures: int = 0
+    healthy: bool = True
+    next_probe_at: float = 0.0
+
+
+class CircuitBreaker:
+    """
+    Stops all workers from hammering llama.cpp while it is down.
+
+    After `failure_threshold` consecutive failed requests the circuit opens and
+    requests are held back. Once `reset_seconds` have passed a single trial
+    request is let through (half-open); its outcome closes or re-opens the circuit.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        """True if a request may be sent now."""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_seconds:
+                self.state = self.HALF_OPEN  # This caller sends the trial request
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            if self.state != self.CLOSED:
+                logger.info("llama.cpp is reachable again, closing circuit")
+            self.state = self.CLOSED
+            self._failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self.state == self.HALF_OPEN or (
+                self.state == self.CLOSED and self._failures >= self.failure_threshold
+            ):
+                if self.state == self.CLOSED:
+                    logger.error(
+                        f"Opening circuit after {self._failures} consecutive failures, "
+                        f"pausing scoring for {self.reset_seconds:.0f}s"
+                    )
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    def wait_until_closed(self, timeout: float, poll_seconds: float = 1.0) -> bool:
+        """Block until a request may be sent. Returns False if `timeout` elapses first."""
+        deadline = time.monotonic() + timeout
+        while not self.allow_request():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(poll_seconds, remaining))
+        return True
+
+    async def wait_until_closed_async(self, timeout: float, poll_seconds: float = 1.0) -> bool:
+        """Async version of wait_until_closed()."""
+        deadline = time.monotonic() + timeout
+        while not self.allow_request():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            await asyncio.sleep(min(poll_seconds, remaining))
+        return True
+
+
+class BackendPool:
+    """
+    Routes requests across several llama.cpp servers.
+
+    Requests go to the backend preferred for their affinity key (rendezvous hash
+    of the CV fingerprint, so the same CV prefix keeps hitting the same KV cache)
+    as long as it has a free slot, otherwise to the healthy backend with the
+    fewest outstanding requests. Backends are ejected after repeated failures
+    and re-admitted once a /health probe succeeds.
+
+    One pool is shared per set of hosts so all workers in the process see the
+    same outstanding-request counts.
+    """
+
+    _shared: dict[tuple[str, ...], "BackendPool"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, config: LlamaCppConfig):
+        self.config = config
+        self.backends = [Backend(host=h.rstrip("/")) for h in config.backend_hosts]
+        self.breaker = CircuitBreaker(config.circuit_failure_threshold, config.circuit_reset_seconds)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_config(cls, config: LlamaCppConfig) -> "BackendPool":
+        with cls._shared_lock:
+            pool = cls._shared.get(config.backend_hosts)
+            if pool is None:
+                pool = cls._shared[config.backend_hosts] = cls(config)
+            else:
+                pool.config = config  # Pick up e.g. a detected parallel_slots value
+            return pool
+
+    @staticmethod
+    def _rendezvous_score(key: str, host: str) -> str:
+        return hashlib.sha256(f"{key}|{host}".encode("utf-8")).hexdigest()
+
+    def _record_probe(self, backend: Backend, healthy: bool) -> bool:
+        with self._lock:
+            if healthy:
+                backend.healthy = True
+                backend.consecutive_failures = 0
+                logger.info(f"Backend {backend.host} re-admitted after successful probe")
+            else:
+                backend.next_probe_at = time.monotonic() + self.config.probe_interval_seconds
+        return healthy
+
+    def _probe(self, backend: Backend) -> bool:
+        """Check an ejected backend's /health; re-admit it on success."""
+        try:
+            healthy = httpx.get(f"{backend.host}/health", timeout=2.0).status_code == 200
+        except httpx.RequestError:
+            healthy = False
+        return self._record_probe(backend, healthy)
+
+    async def _probe_async(self, backend: Backend) -> bool:
+        """Async version of _probe(), so the event loop is not blocked while probing."""
+        try:
+            async with httpx.AsyncClient(timeout=2.0) as client:
+                healthy = (await client.get(f"{backend.host}/health")).status_code == 200
+        except httpx.RequestError:
+            healthy = False
+        return self._record_probe(backend, healthy)
+
+    def _due_probes(self) -> list[Backend]:
+        """Ejected backends whose next probe is due, claimed for this caller."""
+        now = time.monotonic()
+        with self._lock:
+            due = [b for b in self.backends if not b.healthy and b.next_probe_at <= now]
+            for backend in due:
+                # Push the next probe out so concurrent callers don't all probe at once
+                backend.next_probe_at = now + self.config.probe_interval_seconds
+        return due
+
+    def _choose(self, affinity_key: str | None) -> Backend:
+        with self._lock:
+            candidates = [b for b in self.backends if b.healthy] or self.backends
+            chosen = min(candidates, key=lambda b: b.outstanding)
+            if affinity_key is not None:
+                preferred = max(candidates, key=lambda b: self._rendezvous_score(affinity_key, b.host))
+                if preferred.outstanding < self.config.parallel_slots:
+                    chosen = preferred
+            chosen.outstanding += 1
+            return chosen
+
+    def acquire(self, affinity_key: str | None = None) -> Backend:
+        """Pick a backend for one request and count it as outstanding."""
+        for backend in self._due_probes():
+            self._probe(backend)
+        return self._choose(affinity_key)
+
+    async def acquire_async(self, affinity_key: str | None = None) -> Backend:
+        """Async version of acquire(); probes ejected backends without blocking the event loop."""
+        for backend in self._due_probes():
+            await self._probe_async(backend)
+        return self._choose(affinity_key)
+
+    def release(self, backend: Backend, failed: bool = False):
+        """Finish a request; repeated failures eject the backend."""
+        with self._lock:
+            backend.outstanding = max(0, backend.outstanding - 1)
+            if not failed:
+                backend.consecutive_failures = 0
+                return
+            backend.consecutive_failures += 1
+            if backend.healthy and backend.consecutive_failures >= self.config.eject_after_failures:
+                backend.healthy = False
+                backend.next_probe_at = time.monotonic() + self.config.probe_interval_seconds
+                logger.warning(
+                    f"Backend {backend.host} ejected after {backend.consecutive_failures} consecutive failures"
+                )
+
+    def mark_health(self, backend: Backend, healthy: bool):
+        """Record the outcome of an explicit health check."""
+        with self._lock:
+            backend.healthy = healthy
+            if healthy:
+                backend.consecutive_failures = 0
+            else:
+                backend.next_probe_at = time.monotonic() + self.config.probe_interval_seconds
+
+
+def is_backend_failure(error: Exception) -> bool:
+    """Errors that say something about the server's health rather than about the request."""
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code >= 500
+    return isinstance(error, httpx.RequestError)
+
+
+TRANSIENT_STATUS_CODES = {429, 502, 503, 504}  # 503 = llama.cpp still loading the model
+
+
+def is_transient_error(error: Exception) -> bool:
+    """Errors worth retrying: connect errors, timeouts and overload/loading responses."""
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code in TRANSIENT_STATUS_CODES
+    return isinstance(error, httpx.RequestError)
+
+
 # class EvaluationDetail(BaseModel):
 #     """Explicit structure for individual evaluation categories."""
 #     rating: RatingEnum = Field(..., description="The qualitative grade assigned to this category")
@@ -185,11 +440,20 @@ class EvaluationResult:
     assessment: NumCandidateAssessment | None
     duration_seconds: float
     error: str | None = None
+    retryable: bool = False  # Failed because the server was unavailable, not because of this job
+    cached_tokens: int = 0  # Prompt tokens served from the slot's KV cache
+    evaluated_tokens: int = 0  # Prompt tokens the server actually had to process
 
     @property
     def success(self) -> bool:
         return self.assessment is not None and self.error is None
 
+    @property
+    def cache_hit_ratio(self) -> float:
+        """Share of the prompt that was reused from the KV cache (0-1)."""
+        total = self.cached_tokens + self.evaluated_tokens
+        return self.cached_tokens / total if total else 0.0
+
 
 # --- 3. Prompt Templates ---
 SYSTEM_PROMPT = """
@@ -231,6 +495,12 @@ USER_PROMPT_TEMPLATE = """
         </JOB>
 """
 
+# Changes whenever the prompts or the output schema change, so cached scores
+# produced by an older prompt are never reused.
+PROMPT_VERSION = hashlib.sha256(
+    (SYSTEM_PROMPT + USER_PROMPT_TEMPLATE + str(NumCandidateAssessment.model_json_schema())).encode("utf-8")
+).hexdigest()[:12]
+
 
 # --- 4. Evaluator Class ---
 class CandidateEvaluator:
@@ -238,8 +508,17 @@ class CandidateEvaluator:
     Evaluates candidates against job descriptions using llama.cpp server.
     """
 
-    def __init__(self, config: LlamaCppConfig | None = None):
+    def __init__(self, config: LlamaCppConfig | None = None, slot_id: int | None = None):
+        """
+        Args:
+            config: Server connection settings (read from env if omitted)
+            slot_id: llama.cpp slot to pin this evaluator to. Keeping one worker on
+                one slot means the CV/preferences prefix stays in that slot's KV cache
+                and only the job-specific suffix is processed per request.
+        """
         self.config = config or LlamaCppConfig.from_env()
+        self.slot_id = None if slot_id is None else slot_id % self.config.parallel_slots
+        self.backends = BackendPool.for_config(self.config)
         self._client: httpx.Client | None = None
         self._schema = NumCandidateAssessment.model_json_schema()
 
@@ -266,12 +545,59 @@ class CandidateEvaluator:
         self.close()
 
     def health_check(self) -> bool:
-        """Check if llama.cpp server is available."""
+        """Check all llama.cpp backends and return True if at least one is available."""
+        any_healthy = False
+        for backend in self.backends.backends:
+            try:
+                healthy = self.client.get(f"{backend.host}/health").status_code == 200
+            except httpx.RequestError:
+                healthy = False
+            self.backends.mark_health(backend, healthy)
+            any_healthy = any_healthy or healthy
+        return any_healthy
+
+    def _backend_slot_count(self, host: str) -> int | None:
+        """Slots of one backend via /props, falling back to /slots."""
         try:
-            response = self.client.get(f"{self.config.host}/health")
-            return response.status_code == 200
-        except httpx.RequestError:
-            return False
+            response = self.client.get(f"{host}/props")
+            if response.status_code == 200:
+                total_slots = response.json().get("total_slots")
+                if total_slots:
+                    return int(total_slots)
+
+            response = self.client.get(f"{host}/slots")
+            if response.status_code == 200:
+                return len(response.json()) or None
+        except (httpx.RequestError, ValueError):
+            pass
+        return None
+
+    def server_slot_count(self) -> int | None:
+        """
+        Number of parallel slots per llama.cpp backend (the servers' --parallel value).
+
+        With several backends the smallest reachable value is returned so slot ids
+        are valid on every backend. Returns None if no backend is reachable.
+        """
+        counts = [c for c in (self._backend_slot_count(b.host) for b in self.backends.backends) if c]
+        return min(counts) if counts else None
+
+    def embed(self, texts: list[str]) -> list[list[float]]:
+        """
+        Embed texts with the llama.cpp /v1/embeddings endpoint.
+
+        Raises httpx errors if the server has no embedding support (--embeddings).
+        """
+        host = (self.config.embedding_host or self.config.host).rstrip("/")
+        response = self.client.post(f"{host}/v1/embeddings", json={"input": texts})
+        response.raise_for_status()
+        data = sorted(response.json()["data"], key=lambda item: item["index"])
+        return [item["embedding"] for item in data]
+
+    @staticmethod
+    def _affinity_key(cv: str, preferences: str) -> str:
+        """Requests with the same CV/preferences prefix prefer the same backend."""
+        return hashlib.sha256(f"{cv}\x1f{preferences}".encode("utf-8")).hexdigest()
 
     def _build_messages(
         self, job: dict[str, Any], cv: str, preferences: str
@@ -291,13 +617,28 @@ class CandidateEvaluator:
             {"role": "user", "content": user_content}
         ]
 
-    
-    def _make_reasoning_request(self, messages: str) -> str:
+    @staticmethod
+    def _prompt_token_counts(response_data: dict) -> tuple[int, int]:
+        """Extract (cached, evaluated) prompt token counts from a llama.cpp response."""
+        timings = response_data.get("timings") or {}
+        if "cache_n" in timings or "prompt_n" in timings:
+            return int(timings.get("cache_n", 0)), int(timings.get("prompt_n", 0))
+
+        # OpenAI-style usage block (older/newer server builds)
+        usage = response_data.get("usage") or {}
+        cached = int((usage.get("prompt_tokens_details") or {}).get("cached_tokens", 0))
+        return cached, max(0, int(usage.get("prompt_tokens", 0)) - cached)
+
+    def _build_payload(
+        self, messages: list[dict[str, str]], slot_id: int | None = None
+    ) -> dict[str, Any]:
+        """Build the chat completion payload (shared by the sync and async paths)."""
         payload = {
             "messages": messages,
             "temperature": self.config.temperature,
             "max_tokens": self.config.max_tokens,
             "stream": False,
+            "cache_prompt": self.config.cache_prompt,
             "response_format": {
                 "type": "json_schema",
                 "json_schema": {
@@ -307,14 +648,90 @@ class CandidateEvaluator:
                 },
             },
         }
+        if slot_id is not None:
+            payload["id_slot"] = slot_id
+        return payload
 
-        response = self.client.post(
-            f"{self.config.host}/v1/chat/completions",
-            json=payload,
+    def _parse_response(
+        self, response_data: dict, start_time: float, slot_id: int | None = None
+    ) -> EvaluationResult:
+        """Validate the model output and wrap it into an EvaluationResult."""
+        raw_json = response_data["choices"][0]["message"]["content"]
+        assessment = NumCandidateAssessment.model_validate_json(raw_json)
+        cached_tokens, evaluated_tokens = self._prompt_token_counts(response_data)
+
+        duration = time.perf_counter() - start_time
+        logger.info(
+            f"Evaluation completed in {duration:.2f}s "
+            f"(slot {slot_id}, prompt tokens cached/evaluated: {cached_tokens}/{evaluated_tokens})"
         )
-        response.raise_for_status()
 
-        return response.json()
+        return EvaluationResult(
+            assessment=assessment,
+            duration_seconds=duration,
+            cached_tokens=cached_tokens,
+            evaluated_tokens=evaluated_tokens,
+        )
+
+    @staticmethod
+    def _error_result(error: Exception, start_time: float) -> EvaluationResult:
+        """Turn an exception into a failed EvaluationResult."""
+        if isinstance(error, httpx.HTTPStatusError):
+            error_msg = f"API error {error.response.status_code}: {error.response.text[:200]}"
+        else:
+            error_msg = f"{type(error).__name__}: {error}"
+        logger.error(f"Evaluation failed: {error_msg}")
+        return EvaluationResult(
+            assessment=None,
+            duration_seconds=time.perf_counter() - start_time,
+            error=error_msg,
+            retryable=is_transient_error(error),
+        )
+
+    @staticmethod
+    def _circuit_open_result(start_time: float) -> EvaluationResult:
+        return EvaluationResult(
+            assessment=None,
+            duration_seconds=time.perf_counter() - start_time,
+            error="llama.cpp unavailable (circuit open)",
+            retryable=True,
+        )
+
+    def _backoff_delay(self, attempt: int) -> float:
+        """Full-jitter exponential backoff for the given (0-based) retry attempt."""
+        cap = min(self.config.retry_backoff_max_seconds, self.config.retry_backoff_seconds * 2 ** attempt)
+        return random.uniform(0, cap)
+
+    def _record_outcome(self, error: Exception | None):
+        """Feed the circuit breaker: any server response counts as the server being up."""
+        if error is not None and is_transient_error(error):
+            self.backends.breaker.record_failure()
+        else:
+            self.backends.breaker.record_success()
+
+    def _make_reasoning_request(
+        self, messages: list[dict[str, str]], affinity_key: str | None = None
+    ) -> dict:
+        """POST the request, retrying transient errors with jittered exponential backoff."""
+        payload = self._build_payload(messages, self.slot_id)
+        for attempt in range(self.config.max_retries + 1):
+            backend = self.backends.acquire(affinity_key)
+            try:
+                response = self.client.post(f"{backend.host}/v1/chat/completions", json=payload)
+                response.raise_for_status()
+            except Exception as e:
+                self.backends.release(backend, failed=is_backend_failure(e))
+                if attempt >= self.config.max_retries or not is_transient_error(e):
+                    raise
+                delay = self._backoff_delay(attempt)
+                logger.warning(
+                    f"Transient error from {backend.host} ({type(e).__name__}), "
+                    f"retry {attempt + 1}/{self.config.max_retries} in {delay:.1f}s"
+                )
+                time.sleep(delay)
+                continue
+            self.backends.release(backend)
+            return response.json()
         #return response.json()["choices"][0]["text"]
 
 
@@ -409,42 +826,35 @@ class CandidateEvaluator:
         """
         start_time = time.perf_counter()
 
-        try:
-            messages = self._build_messages(job, cv, preferences)
-            response_data = self._make_reasoning_request(messages)
+        # Pause here while the server is known to be down instead of failing fast
+        if not self.backends.breaker.wait_until_closed(self.config.circuit_max_wait_seconds):
+            return self._circuit_open_result(start_time)
 
-            raw_json = response_data["choices"][0]["message"]["content"]
-            #assessment = raw_json
-            assessment = NumCandidateAssessment.model_validate_json(raw_json)
-
-            duration = time.perf_counter() - start_time
-            logger.info(
-                f"Evaluation completed in {duration:.2f}s, "
-               # f"average score: {assessment.average_score:.0f}"
-            )
-
-            return EvaluationResult(assessment=assessment, duration_seconds=duration)
-
-        except httpx.HTTPStatusError as e:
-            duration = time.perf_counter() - start_time
-            error_msg = f"API error {e.response.status_code}: {e.response.text[:200]}"
-            logger.error(error_msg)
-            return EvaluationResult(
-                assessment=None, duration_seconds=duration, error=error_msg
-            )
+        try:
+            try:
+                messages = self._build_messages(job, cv, preferences)
+                response_data = self._make_reasoning_request(
+                    messages, self._affinity_key(cv, preferences)
+                )
+            except Exception as e:
+                self._record_outcome(e)
+                raise
+            self._record_outcome(None)
+            return self._parse_response(response_data, start_time, self.slot_id)
 
         except Exception as e:
-            duration = time.perf_counter() - start_time
-            error_msg = f"{type(e).__name__}: {e}"
-            logger.error(f"Evaluation failed: {error_msg}")
-            return EvaluationResult(
-                assessment=None, duration_seconds=duration, error=error_msg
-            )
+            return self._error_result(e, start_time)
 
 
 # --- 5. Async Version ---
 class AsyncCandidateEvaluator(CandidateEvaluator):
-    """Async version for evaluating multiple candidates concurrently."""
+    """
+    Async version for evaluating many jobs concurrently.
+
+    All requests go through one shared httpx.AsyncClient and concurrency is
+    bounded by the number of llama.cpp slots, so every slot stays busy without
+    queueing requests server-side.
+    """
 
     def __init__(self, config: LlamaCppConfig | None = None):
         super().__init__(config)
@@ -455,7 +865,9 @@ class AsyncCandidateEvaluator(CandidateEvaluator):
         if self._async_client is None:
             self._async_client = httpx.AsyncClient(
                 timeout=httpx.Timeout(self.config.timeout_seconds),
-                limits=httpx.Limits(max_connections=20),
+                limits=httpx.Limits(
+                    max_connections=max(20, self.config.parallel_slots * len(self.backends.backends))
+                ),
             )
         return self._async_client
 
@@ -475,48 +887,95 @@ class AsyncCandidateEvaluator(CandidateEvaluator):
         job: dict[str, Any],
         cv: str,
         preferences: str = "",
+        slot_id: int | None = None,
     ) -> EvaluationResult:
-        """Async version of evaluate()."""
+        """Async version of evaluate(). `slot_id` pins the request to a llama.cpp slot."""
         start_time = time.perf_counter()
 
-        try:
-            messages = self._build_messages(job, cv, preferences)
-
-            payload = {
-                "messages": messages,
-                "temperature": self.config.temperature,
-                "max_tokens": self.config.max_tokens,
-                "stream": False,
-                "response_format": {
-                    "type": "json_schema",
-                    "json_schema": {
-                        "name": "CandidateAssessment",
-                        "strict": True,
-                        "schema": self._schema,
-                    },
-                },
-            }
+        if not await self.backends.breaker.wait_until_closed_async(self.config.circuit_max_wait_seconds):
+            return self._circuit_open_result(start_time)
 
-            response = await self.async_client.post(
-                f"{self.config.host}/v1/chat/completions",
-                json=payload,
-            )
-            response.raise_for_status()
+        try:
+            try:
+                messages = self._build_messages(job, cv, preferences)
+                response_data = await self._make_reasoning_request_async(
+                    messages, self._affinity_key(cv, preferences), slot_id
+                )
+            except Exception as e:
+                self._record_outcome(e)
+                raise
+            self._record_outcome(None)
+            return self._parse_response(response_data, start_time, slot_id)
 
-            raw_json = response.json()["choices"][0]["message"]["content"]
-            assessment = CandidateAssessment.model_validate_json(raw_json)
+        except Exception as e:
+            return self._error_result(e, start_time)
+
+    async def _make_reasoning_request_async(
+        self, messages: list[dict[str, str]], affinity_key: str | None, slot_id: int | None
+    ) -> dict:
+        """Async version of _make_reasoning_request() with the same retry policy."""
+        payload = self._build_payload(messages, slot_id)
+        for attempt in range(self.config.max_retries + 1):
+            backend = await self.backends.acquire_async(affinity_key)
+            try:
+                response = await self.async_client.post(f"{backend.host}/v1/chat/completions", json=payload)
+                response.raise_for_status()
+            except Exception as e:
+                self.backends.release(backend, failed=is_backend_failure(e))
+                if attempt >= self.config.max_retries or not is_transient_error(e):
+                    raise
+                delay = self._backoff_delay(attempt)
+                logger.warning(
+                    f"Transient error from {backend.host} ({type(e).__name__}), "
+                    f"retry {attempt + 1}/{self.config.max_retries} in {delay:.1f}s"
+                )
+                await asyncio.sleep(delay)
+                continue
+            self.backends.release(backend)
+            return response.json()
+
+    async def evaluate_many(
+        self,
+        jobs: Iterable[dict[str, Any]],
+        cv: str,
+        preferences: str = "",
+        concurrency: int | None = None,
+    ) -> AsyncIterator[tuple[dict[str, Any], EvaluationResult]]:
+        """
+        Evaluate many jobs concurrently and yield (job, result) pairs as they complete.
 
-            return EvaluationResult(
-                assessment=assessment,
-                duration_seconds=time.perf_counter() - start_time,
-            )
+        Args:
+            jobs: Job dicts with 'title', 'company', and 'description' keys
+            cv: The candidate's CV/resume text
+            preferences: Optional candidate preferences string
+            concurrency: Maximum number of in-flight requests. Defaults to the
+                total slot count (`LlamaCppConfig.parallel_slots` x backends).
 
-        except Exception as e:
-            return EvaluationResult(
-                assessment=None,
-                duration_seconds=time.perf_counter() - start_time,
-                error=f"{type(e).__name__}: {e}",
-            )
+        Yields:
+            (job, EvaluationResult) in completion order, not input order
+        """
+        concurrency = max(1, concurrency or self.config.parallel_slots * len(self.backends.backends))
+        semaphore = asyncio.Semaphore(concurrency)
+        # Each in-flight request borrows a slot id so the shared CV prefix stays
+        # cached in that slot; the semaphore guarantees one is always free.
+        free_slots = [i % self.config.parallel_slots for i in range(concurrency)]
+
+        async def run(job: dict[str, Any]) -> tuple[dict[str, Any], EvaluationResult]:
+            async with semaphore:
+                slot_id = free_slots.pop()
+                try:
+                    return job, await self.evaluate_async(job, cv, preferences, slot_id=slot_id)
+                finally:
+                    free_slots.append(slot_id)
+
+        tasks = [asyncio.create_task(run(job)) for job in jobs]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Consumer stopped early (break/exception): don't leave requests running
+            for task in tasks:
+                task.cancel()
 
 
 if __name__ == "__main__":
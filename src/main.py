@@ -27,6 +27,9 @@ from routes.prompt import prompt_bp
 # Import scheduler and socketio event handlers
 from scheduler import sync_scheduler_jobs
 from socketio_events import register_socketio_events
+from pending_scoring import resume_pending_scoring
+from worker_channel import SCRAPE_IN_WORKERS, start_worker_relay
+from migrations import run_migrations
 
 # --- App and DB Setup ---
 app = Flask(__name__, template_folder='../templates')
@@ -108,7 +111,7 @@ app.register_blueprint(prompt_bp)
 
 # --- Register SocketIO Events ---
 # Get the run_scraping_task function for use with scheduler
-run_scraping_task_func = register_socketio_events(socketio, app)
+run_scraping_task_func = register_socketio_events(socketio, app, run_in_workers=SCRAPE_IN_WORKERS)
 
 # --- Home Route ---
 @app.route('/')
@@ -121,14 +124,8 @@ if __name__ == '__main__':
     with app.app_context():
         db.create_all()
 
-        # Add schedule_interval_hours column if missing (db.create_all won't add to existing tables)
-        from sqlalchemy import inspect, text
-        inspector = inspect(db.engine)
-        columns = [col['name'] for col in inspector.get_columns('search_criteria')]
-        if 'schedule_interval_hours' not in columns:
-            db.session.execute(text('ALTER TABLE search_criteria ADD COLUMN schedule_interval_hours INTEGER DEFAULT 24'))
-            db.session.commit()
-            logging.info("Added schedule_interval_hours column to search_criteria")
+        # Bring existing tables up to date (db.create_all won't alter them)
+        run_migrations()
 
         # Sync scheduled jobs on startup
         sync_scheduler_jobs(app, run_scraping_task_func)
@@ -137,6 +134,14 @@ if __name__ == '__main__':
     # Disable Flask's reloader when using debugpy to avoid port conflicts
     use_reloader = os.environ.get('ENABLE_DEBUGPY', '0') != '1'
 
+    # Score jobs that were scraped but not scored before the last shutdown
+    # (only in the serving process, not in the reloader's file watcher)
+    if not use_reloader or os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        resume_pending_scoring(app, run_scraping_task_func)
+        if SCRAPE_IN_WORKERS:
+            # Runs happen in scrape_worker.py processes; relay their events and statuses
+            start_worker_relay(app, socketio)
+
     # Run with threading mode
     # allow_unsafe_werkzeug=True is required for threading mode in development
     # This is safe for local development; use proper WSGI server (gunicorn/uwsgi) in production
@@ -0,0 +1,181 @@
+"""
+Versioned schema migrations, applied at startup.
+
+db.create_all() creates missing tables but never changes existing ones, so
+every change to an existing table is a numbered migration in MIGRATIONS.
+run_migrations() applies the ones not yet recorded in schema_migration, in
+order, each in its own transaction. On PostgreSQL an advisory lock keeps the
+web process and scrape workers from migrating at the same time.
+
+Migrations must be idempotent (inspect before altering): a fresh database
+already gets the current schema from create_all(), and the first migrations
+replay the ad-hoc ALTER TABLEs that main.py used to run, which older
+databases may already have.
+
+To change the schema, update models.py and append a migration with the next
+version number.
+"""
+
+import json
+import logging
+from datetime import datetime
+
+from sqlalchemy import inspect, select, text
+from sqlalchemy.dialects.postgresql import JSONB
+
+from job_search import SEARCH_VECTOR_SQL
+from models import db, Job, JobDate, SearchCriteria, SchemaMigration, SCORE_COLUMNS, score_column_values
+
+logger = logging.getLogger(__name__)
+
+_ADVISORY_LOCK_KEY = 7_236_001  # Arbitrary, unique to this app's migrations
+_BACKFILL_BATCH = 1000
+
+
+def _columns(connection, table: str) -> set:
+    return {column['name'] for column in inspect(connection).get_columns(table)}
+
+
+def _add_columns(connection, table: str, columns: dict):
+    """ALTER TABLE ... ADD COLUMN for every `name: ddl` the table doesn't have yet."""
+    existing = _columns(connection, table)
+    for name, ddl in columns.items():
+        if name not in existing:
+            connection.execute(text(f'ALTER TABLE {table} ADD COLUMN {name} {ddl}'))
+
+
+def _create_indexes(connection, model, names):
+    """Create the named indexes declared on `model` unless they exist already."""
+    for index in model.__table__.indexes:
+        if index.name in names:
+            index.create(connection, checkfirst=True)
+
+
+# ----------------------------------------------------------------------
+# Migrations
+# ----------------------------------------------------------------------
+def _add_schedule_interval_hours(connection):
+    _add_columns(connection, 'search_criteria', {'schedule_interval_hours': 'INTEGER DEFAULT 24'})
+
+
+def _add_scraper_backend(connection):
+    _add_columns(connection, 'search_criteria', {'scraper_backend': "VARCHAR(20) NOT NULL DEFAULT 'browser'"})
+
+
+def _add_incremental_scraping(connection):
+    _add_columns(connection, 'search_criteria', {
+        'incremental': 'BOOLEAN NOT NULL DEFAULT FALSE',
+        'high_water_mark': 'BIGINT',
+    })
+
+
+def _add_external_link(connection):
+    _add_columns(connection, 'job', {'external_link': 'TEXT'})
+
+
+def _add_hot_path_indexes(connection):
+    _create_indexes(connection, Job, {
+        'ix_job_search_criteria_score',
+        'ix_job_search_criteria_shortlisted',
+        'ix_job_shortlisted',
+        'ix_job_scraped_at_link',
+    })
+    _create_indexes(connection, JobDate, {'ix_job_date_job_id', 'ix_job_date_date'})
+    _create_indexes(connection, SearchCriteria, {'ix_search_criteria_template_schedule'})
+
+
+def _backfill_score_columns(connection):
+    """Fill the typed score columns from score_details, in id order, a batch at a time."""
+    job = Job.__table__
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            select(job.c.id, job.c.score_details)
+            .where(job.c.id > last_id, job.c.score_details.isnot(None))
+            .order_by(job.c.id).limit(_BACKFILL_BATCH)
+        ).all()
+        if not rows:
+            return
+        for job_id, score_details in rows:
+            if isinstance(score_details, str):  # Rows written before score_details was a JSON column
+                try:
+                    score_details = json.loads(score_details)
+                except ValueError:
+                    score_details = None
+            connection.execute(job.update().where(job.c.id == job_id).values(
+                score_details=score_details, **score_column_values(score_details)))
+        last_id = rows[-1][0]
+
+
+def _score_details_jsonb(connection):
+    _add_columns(connection, 'job', {column: 'SMALLINT' for column in SCORE_COLUMNS.values()})
+
+    if connection.dialect.name == 'postgresql':
+        for table in ('job', 'user_job_interaction'):
+            column = next(c for c in inspect(connection).get_columns(table) if c['name'] == 'score_details')
+            if not isinstance(column['type'], JSONB):
+                connection.execute(text(
+                    f"ALTER TABLE {table} ALTER COLUMN score_details TYPE JSONB "
+                    f"USING NULLIF(score_details, '')::jsonb"))
+        # One UPDATE instead of a round trip per job
+        assignments = ', '.join(
+            f"{column} = round((score_details->>'{category}')::numeric)::smallint"
+            for category, column in SCORE_COLUMNS.items())
+        connection.execute(text(
+            f"UPDATE job SET {assignments} WHERE jsonb_typeof(score_details) = 'object'"))
+    else:
+        # Elsewhere JSON is stored as text already; only the typed columns need filling
+        _backfill_score_columns(connection)
+
+    _create_indexes(connection, Job, {f'ix_job_search_criteria_{category}' for category in SCORE_COLUMNS})
+
+
+def _add_search_vector(connection):
+    # Full-text search (job_search.py); other databases search with an in-process index
+    if connection.dialect.name != 'postgresql':
+        return
+    if 'search_vector' not in _columns(connection, 'job'):
+        connection.execute(text(
+            f"ALTER TABLE job ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ({SEARCH_VECTOR_SQL}) STORED"))
+    connection.execute(text('CREATE INDEX IF NOT EXISTS ix_job_search_vector ON job USING GIN (search_vector)'))
+
+
+MIGRATIONS = [
+    (1, 'add_schedule_interval_hours', _add_schedule_interval_hours),
+    (2, 'add_scraper_backend', _add_scraper_backend),
+    (3, 'add_incremental_scraping', _add_incremental_scraping),
+    (4, 'add_external_link', _add_external_link),
+    (5, 'add_hot_path_indexes', _add_hot_path_indexes),
+    (6, 'score_details_jsonb', _score_details_jsonb),
+    (7, 'add_search_vector', _add_search_vector),
+]
+
+
+def run_migrations(engine=None) -> list:
+    """Apply all pending migrations; returns the versions applied (needs app context)."""
+    engine = engine or db.engine
+    SchemaMigration.__table__.create(engine, checkfirst=True)
+    is_postgresql = engine.dialect.name == 'postgresql'
+    applied = []
+
+    with engine.connect() as lock_connection:
+        if is_postgresql:
+            lock_connection.execute(text('SELECT pg_advisory_lock(:key)'), {'key': _ADVISORY_LOCK_KEY})
+            lock_connection.commit()
+        try:
+            with engine.connect() as connection:
+                done = set(connection.execute(select(SchemaMigration.version)).scalars())
+            for version, name, migrate in MIGRATIONS:
+                if version in done:
+                    continue
+                with engine.begin() as connection:
+                    migrate(connection)
+                    connection.execute(SchemaMigration.__table__.insert().values(
+                        version=version, name=name, applied_at=datetime.utcnow()))
+                logger.info(f"Applied schema migration {version}: {name}")
+                applied.append(version)
+        finally:
+            if is_postgresql:
+                lock_connection.execute(text('SELECT pg_advisory_unlock(:key)'), {'key': _ADVISORY_LOCK_KEY})
+                lock_connection.commit()
+    return applied
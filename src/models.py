@@ -1,9 +1,29 @@
 from datetime import datetime
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy.dialects.postgresql import JSONB
 import json
 
 db = SQLAlchemy()
 
+# Score categories of a job assessment (keys of NumCandidateAssessment.to_legacy_format())
+SCORE_CATEGORIES = ('skillset', 'academic', 'experience', 'professional', 'language', 'preference')
+# Job column holding each category's score (0-100), copied out of score_details for filtering and sorting
+SCORE_COLUMNS = {category: f'{category}_score' for category in SCORE_CATEGORIES}
+
+# JSON document column: JSONB on PostgreSQL, JSON text elsewhere
+JSONDocument = db.JSON().with_variant(JSONB(), 'postgresql')
+
+
+def score_column_values(score_details) -> dict:
+    """Values of the typed SCORE_COLUMNS for a score_details dict (None where a category is missing)."""
+    details = score_details if isinstance(score_details, dict) else {}
+    values = {}
+    for category, column in SCORE_COLUMNS.items():
+        score = details.get(category)
+        values[column] = int(round(score)) if isinstance(score, (int, float)) and not isinstance(score, bool) else None
+    return values
+
+
 class SearchCriteria(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     keywords = db.Column(db.String(255), nullable=False)
@@ -13,6 +33,9 @@ class SearchCriteria(db.Model):
     exp_level = db.Column(db.String(255), nullable=True)
     job_type = db.Column(db.String(255), nullable=True)
     pages = db.Column(db.Integer, nullable=False, default=1)
+    scraper_backend = db.Column(db.String(20), nullable=False, default='browser')  # 'browser' (Selenium) or 'http'
+    incremental = db.Column(db.Boolean, nullable=False, default=False)  # Newest first, stop at known postings
+    high_water_mark = db.Column(db.BigInteger, nullable=True)  # Newest LinkedIn job id of the last complete incremental run
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.now())
     is_processed = db.Column(db.Boolean, nullable=False, default=False)
     is_template = db.Column(db.Boolean, nullable=False, default=True)  # True = saved config, False = search run
@@ -25,6 +48,10 @@ class SearchCriteria(db.Model):
     schedule_timezone = db.Column(db.String(50), nullable=False, default='UTC')  # IANA timezone (e.g., 'Europe/Berlin', 'America/New_York')
     last_run = db.Column(db.DateTime, nullable=True)
 
+    __table_args__ = (
+        db.Index('ix_search_criteria_template_schedule', 'is_template', 'schedule_enabled'),  # Scheduler sync, /jobs index
+    )
+
 class Job(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(255), nullable=False)
@@ -32,13 +59,21 @@ class Job(db.Model):
     location = db.Column(db.String(255))
     description = db.Column(db.Text)
     application_link = db.Column(db.Text, unique=True)
+    external_link = db.Column(db.Text, nullable=True) # Resolved external apply URL, NULL until resolved
     scraped_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
     status = db.Column(db.String(50), nullable=False, default='New') # New, Interested, Applied, Interviewing, Offer, Rejected
     shortlisted = db.Column(db.Boolean, nullable=False, default=False)
     matching_score = db.Column(db.Float, nullable=False, default=0.0) # 0-100 percentage score (overall score)
-    score_details = db.Column(db.Text, nullable=True) # JSON string with full scoring breakdown
+    score_details = db.Column(JSONDocument, nullable=True) # Full scoring breakdown (to_legacy_format() dict)
+    # Category scores from score_details (see SCORE_COLUMNS), indexed per run for filtering and sorting
+    skillset_score = db.Column(db.SmallInteger, nullable=True)
+    academic_score = db.Column(db.SmallInteger, nullable=True)
+    experience_score = db.Column(db.SmallInteger, nullable=True)
+    professional_score = db.Column(db.SmallInteger, nullable=True)
+    language_score = db.Column(db.SmallInteger, nullable=True)
+    preference_score = db.Column(db.SmallInteger, nullable=True)
     notes = db.Column(db.Text, nullable=True)
     interview_step = db.Column(db.Integer, nullable=True) # 1, 2, 3... for Interviewing status
     interview_stage_name = db.Column(db.String(100), nullable=True) # "Phone Screen", "Technical", etc.
@@ -47,6 +82,19 @@ class Job(db.Model):
     search_criteria = db.relationship('SearchCriteria', backref=db.backref('jobs', lazy=True))
     dates = db.relationship('JobDate', backref='job', lazy=True, cascade="all, delete-orphan")
     contacts = db.relationship('Contact', backref='job', lazy=True, cascade="all, delete-orphan")
+    # On PostgreSQL the table also has a generated search_vector tsvector column (migration 7, job_search.py)
+
+    __table_args__ = (
+        # A run's jobs by score (listing, keyset pagination) and its counts (/jobs index, confirm, archive)
+        db.Index('ix_job_search_criteria_score', 'search_criteria_id', 'matching_score', 'id'),
+        db.Index('ix_job_search_criteria_shortlisted', 'search_criteria_id', 'shortlisted'),
+        db.Index('ix_job_shortlisted', 'shortlisted', 'id'),  # Kanban board (shortlisted, newest first)
+        # Known links window loaded at every scrape, answered from the index alone
+        db.Index('ix_job_scraped_at_link', 'scraped_at', 'application_link'),
+        # A run's jobs filtered / sorted by one score category
+        *(db.Index(f'ix_job_search_criteria_{category}', 'search_criteria_id', column, 'id')
+          for category, column in SCORE_COLUMNS.items()),
+    )
 
     def __repr__(self):
         return f'<Job {self.title} @ {self.company}>'
@@ -60,8 +108,8 @@ class Contact(db.Model):
 
 class JobDate(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    job_id = db.Column(db.Integer, db.ForeignKey('job.id'), nullable=False)
-    date = db.Column(db.DateTime, nullable=False)
+    job_id = db.Column(db.Integer, db.ForeignKey('job.id'), nullable=False, index=True)
+    date = db.Column(db.DateTime, nullable=False, index=True)
     category = db.Column(db.String(50), nullable=False)
     title = db.Column(db.String(255), nullable=True)
     description = db.Column(db.Text, nullable=True)
@@ -87,7 +135,7 @@ class UserJobInteraction(db.Model):
     old_value = db.Column(db.String(50), nullable=True)  # For status changes: old status
     new_value = db.Column(db.String(50), nullable=True)  # For status changes: new status, for shortlist: 'true'/'false'
     matching_score = db.Column(db.Float, nullable=True)  # Job's score at time of interaction
-    score_details = db.Column(db.Text, nullable=True)  # Full score breakdown (JSON) at time of interaction
+    score_details = db.Column(JSONDocument, nullable=True)  # Full score breakdown at time of interaction
     timestamp = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
 
     # Relationships
@@ -96,3 +144,75 @@ class UserJobInteraction(db.Model):
 
     def __repr__(self):
         return f'<UserJobInteraction user={self.user_id} job={self.job_id} type={self.interaction_type}>'
+
+class ScoreCache(db.Model):
+    """Content-addressed cache of LLM scoring results so re-scraped postings are not re-scored."""
+    key = db.Column(db.String(64), primary_key=True)  # sha256 of job text + profile fingerprint + model + prompt version
+    matching_score = db.Column(db.Float, nullable=False)
+    score_details = db.Column(db.Text, nullable=False)  # JSON string, same format as Job.score_details
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    last_used_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<ScoreCache {self.key[:12]}>'
+
+class ParkedJob(db.Model):
+    """Scraped job whose scoring failed (e.g. llama.cpp down); re-queued on the next scrape run."""
+    id = db.Column(db.Integer, primary_key=True)
+    application_link = db.Column(db.Text, unique=True)
+    job_data = db.Column(db.Text, nullable=False)  # JSON of the scraped job dict
+    error = db.Column(db.Text, nullable=True)  # Last scoring error
+    attempts = db.Column(db.Integer, nullable=False, default=1)
+    parked_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<ParkedJob {self.application_link}>'
+
+class PendingScoring(db.Model):
+    """Scraped job waiting to be scored; the durable scoring queue (see pending_scoring.py)."""
+    id = db.Column(db.Integer, primary_key=True)
+    search_criteria_id = db.Column(db.Integer, db.ForeignKey('search_criteria.id'), nullable=True, index=True)
+    application_link = db.Column(db.Text, nullable=True)
+    job_data = db.Column(db.Text, nullable=False)  # JSON of the scraped job dict
+    claimed_by = db.Column(db.String(100), nullable=True)  # Worker holding the job, NULL = free
+    claimed_at = db.Column(db.DateTime, nullable=True, index=True)
+    claims = db.Column(db.Integer, nullable=False, default=0)  # How often a worker picked it up
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<PendingScoring {self.application_link}>'
+
+class WorkerRun(db.Model):
+    """Scrape run handed to a standalone scrape worker process (see worker_channel.py)."""
+    id = db.Column(db.String(12), primary_key=True)  # ScrapeRun id, shared by web and worker process
+    template_id = db.Column(db.Integer, nullable=True)
+    trigger = db.Column(db.String(20), nullable=False, default='manual')
+    status = db.Column(db.String(20), nullable=False, default='queued', index=True)  # queued, running, stopping, finished, stopped, failed
+    worker = db.Column(db.String(100), nullable=True)  # Worker that claimed the run, NULL = not claimed yet
+    cancel_requested = db.Column(db.Boolean, nullable=False, default=False)
+    search_criteria_id = db.Column(db.Integer, nullable=True)
+    error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    heartbeat_at = db.Column(db.DateTime, nullable=True)  # Last status update from the worker
+
+    def __repr__(self):
+        return f'<WorkerRun {self.id} {self.status}>'
+
+class WorkerEvent(db.Model):
+    """SocketIO event emitted by a worker process, relayed to the browsers by the web process."""
+    id = db.Column(db.Integer, primary_key=True)
+    event = db.Column(db.String(50), nullable=False)
+    payload = db.Column(db.Text, nullable=True)  # JSON
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<WorkerEvent {self.id} {self.event}>'
+
+class SchemaMigration(db.Model):
+    """Schema migrations applied to this database (see migrations.py)."""
+    version = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    name = db.Column(db.String(100), nullable=False)
+    applied_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<SchemaMigration {self.version} {self.name}>'
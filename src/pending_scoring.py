@@ -0,0 +1,252 @@
+"""
+Durable scoring queue backed by the pending_scoring table.
+
+Scraped jobs are written to pending_scoring instead of only being held in an
+in-memory Queue, so restarting the app container no longer loses jobs that
+were scraped but not scored yet; on startup they are scored by a 'resume'
+run. Workers claim one row at a time with `SELECT ... FOR UPDATE SKIP LOCKED`
+on PostgreSQL, so any number of them (threads here or other processes) can
+share the table without getting the same job. A row is deleted in the same
+transaction that saves the scored job (JobWriter) or parks it (park_job);
+if scoring or saving fails the claim is released so the job can be picked up
+again right away. Claims of workers that died are taken over after
+PENDING_SCORING_LEASE_SECONDS.
+
+A 'resume' run serves the jobs of orphaned runs only: runs that have jobs in
+the queue but are not running anywhere (in this process or a scrape worker
+with a recent heartbeat). Their claims are released when the resume run
+starts, since whoever held them is gone.
+
+PendingScoringQueue implements the part of the queue.Queue API the pipeline
+uses (put, get, task_done, join, qsize, maxsize), so ScoringPool and the
+rating workers work with either queue.
+"""
+
+import json
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from queue import Empty
+
+from sqlalchemy import or_
+
+from models import db, PendingScoring, WorkerRun
+from scrape_runs import scrape_runs
+from worker_channel import WORKER_HEARTBEAT_TIMEOUT
+
+logger = logging.getLogger('queue')
+
+PENDING_SCORING_ENABLED = os.getenv('PENDING_SCORING_ENABLED', '1') == '1'
+PENDING_SCORING_LEASE_SECONDS = float(os.getenv('PENDING_SCORING_LEASE_SECONDS', '600'))
+PENDING_SCORING_POLL_SECONDS = float(os.getenv('PENDING_SCORING_POLL_SECONDS', '1'))
+# A job whose scoring keeps failing is parked after this many claims instead of released again
+PENDING_SCORING_MAX_CLAIMS = int(os.getenv('PENDING_SCORING_MAX_CLAIMS', '5'))
+
+
+def _claimable(now):
+    """Rows nobody holds, or whose holder has not finished within the lease."""
+    return or_(
+        PendingScoring.claimed_at.is_(None),
+        PendingScoring.claimed_at < now - timedelta(seconds=PENDING_SCORING_LEASE_SECONDS)
+    )
+
+
+def remove_pending(pending_ids):
+    """Delete finished rows in the current transaction; the caller commits (needs app context)."""
+    pending_ids = [pending_id for pending_id in pending_ids if pending_id is not None]
+    if pending_ids:
+        PendingScoring.query.filter(PendingScoring.id.in_(pending_ids)).delete(synchronize_session=False)
+
+
+def release_pending(pending_ids):
+    """Give claimed rows back to the queue in the current transaction; the caller commits (needs app context)."""
+    pending_ids = [pending_id for pending_id in pending_ids if pending_id is not None]
+    if pending_ids:
+        PendingScoring.query.filter(PendingScoring.id.in_(pending_ids)).update(
+            {'claimed_by': None, 'claimed_at': None}, synchronize_session=False)
+
+
+def _in_runs(run_ids):
+    """Filter for rows of `run_ids`, where None stands for rows without a run."""
+    clause = PendingScoring.search_criteria_id.in_([run_id for run_id in run_ids if run_id is not None])
+    if None in run_ids:
+        clause = or_(clause, PendingScoring.search_criteria_id.is_(None))
+    return clause
+
+
+def live_run_ids() -> set:
+    """Runs scoring right now, in this process or in a scrape worker that is still alive (needs app context)."""
+    run_ids = {run.search_criteria_id for run in scrape_runs.active() if run.search_criteria_id is not None}
+    heartbeat_cutoff = datetime.utcnow() - timedelta(seconds=WORKER_HEARTBEAT_TIMEOUT)
+    run_ids.update(search_criteria_id for (search_criteria_id,) in db.session.query(WorkerRun.search_criteria_id).filter(
+        WorkerRun.status.in_(('running', 'stopping')),
+        WorkerRun.search_criteria_id.isnot(None),
+        WorkerRun.heartbeat_at >= heartbeat_cutoff
+    ))
+    return run_ids
+
+
+def orphaned_run_ids() -> set:
+    """Runs that still have jobs in the queue but are not running anywhere (needs app context)."""
+    queued = {run_id for (run_id,) in db.session.query(PendingScoring.search_criteria_id).distinct()}
+    return queued - live_run_ids()
+
+
+def pending_job_count(run_ids=None) -> int:
+    """Jobs waiting in the queue, claimed or not; only those of `run_ids` if given (needs app context)."""
+    query = PendingScoring.query
+    if run_ids is not None:
+        query = query.filter(_in_runs(run_ids))
+    return query.count()
+
+
+class PendingScoringQueue:
+    """queue.Queue look-alike on top of the pending_scoring table."""
+
+    maxsize = 0  # Unbounded: waiting jobs live in the database, not in memory
+
+    def __init__(self, app, search_criteria_id: int = None, run_ids=None):
+        self.app = app
+        self.search_criteria_id = search_criteria_id  # Run whose jobs this queue serves (and put() adds to)
+        self.run_ids = run_ids  # Serve these runs' jobs instead (resume run); None = only search_criteria_id's
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._condition = threading.Condition()
+        self._in_flight = 0  # Jobs claimed through this queue and not marked done yet
+
+    @classmethod
+    def for_orphaned_runs(cls, app):
+        """Queue over the jobs of orphaned runs, with their stale claims released (for resume runs)."""
+        with app.app_context():
+            run_ids = orphaned_run_ids()
+            if run_ids:
+                PendingScoring.query.filter(_in_runs(run_ids), PendingScoring.claimed_by.isnot(None)).update(
+                    {'claimed_by': None, 'claimed_at': None}, synchronize_session=False)
+            db.session.commit()
+        return cls(app, run_ids=run_ids)
+
+    def _scoped(self, query):
+        if self.run_ids is not None:
+            return query.filter(_in_runs(self.run_ids))
+        return query.filter(PendingScoring.search_criteria_id == self.search_criteria_id)
+
+    def put(self, job_data: dict, block=True, timeout=None):
+        with self.app.app_context():
+            self.add(job_data)
+            db.session.commit()
+        self.notify()
+
+    def add(self, job_data: dict):
+        """put() in the caller's transaction: the caller commits, then calls notify() (needs app context)."""
+        db.session.add(PendingScoring(
+            search_criteria_id=self.search_criteria_id,
+            application_link=job_data.get('application_link'),
+            job_data=json.dumps(job_data)
+        ))
+
+    def notify(self):
+        """Wake a waiting worker for a job added with add()."""
+        with self._condition:
+            self._condition.notify()
+
+    def get(self, block=True, timeout=None) -> dict:
+        """
+        Claim the oldest free job. The returned dict carries `pending_id` and
+        `search_criteria_id`, which the worker hands to the writer, and
+        `pending_claims`, how often the job has been claimed so far. A
+        re-queued parked job keeps the search_criteria_id it was scraped for.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            job_data = self._claim()
+            if job_data is not None:
+                with self._condition:
+                    self._in_flight += 1
+                return job_data
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if not block or (remaining is not None and remaining <= 0):
+                raise Empty
+            # Woken early by a local put; jobs from other processes show up on the next poll
+            with self._condition:
+                self._condition.wait(PENDING_SCORING_POLL_SECONDS if remaining is None
+                                     else min(remaining, PENDING_SCORING_POLL_SECONDS))
+
+    def _claim(self):
+        with self.app.app_context():
+            while True:
+                now = datetime.utcnow()
+                try:
+                    query = self._scoped(PendingScoring.query.filter(_claimable(now))).order_by(PendingScoring.id)
+                    if db.engine.dialect.name == 'postgresql':
+                        # Skip rows other workers are claiming right now instead of waiting for them
+                        query = query.with_for_update(skip_locked=True)
+                    row = query.first()
+                    if row is None:
+                        db.session.commit()
+                        return None
+
+                    pending_id, search_criteria_id = row.id, row.search_criteria_id
+                    job_data, previous_owner, claims = row.job_data, row.claimed_by, row.claims
+                    # Conditional update, so two workers can't both claim a row on
+                    # databases without row locks (SQLite) either
+                    claimed = PendingScoring.query.filter(
+                        PendingScoring.id == pending_id, _claimable(now)
+                    ).update({
+                        'claimed_by': self.owner,
+                        'claimed_at': now,
+                        'claims': PendingScoring.claims + 1
+                    }, synchronize_session=False)
+                    db.session.commit()
+                except Exception:
+                    db.session.rollback()
+                    raise
+
+                if claimed:
+                    if previous_owner is not None:
+                        logger.warning(f"Took over pending job {pending_id} from {previous_owner} (lease expired)")
+                    job_data = json.loads(job_data)
+                    job_data['pending_id'] = pending_id
+                    job_data['pending_claims'] = (claims or 0) + 1
+                    job_data['search_criteria_id'] = job_data.get('search_criteria_id') or search_criteria_id
+                    return job_data
+                # Another worker was faster, try the next row
+
+    def task_done(self):
+        with self._condition:
+            self._in_flight -= 1
+            self._condition.notify_all()
+
+    def join(self):
+        """Block until every job of this queue is claimed and all claimed jobs are done."""
+        while True:
+            if self.qsize() == 0:
+                with self._condition:
+                    if self._in_flight <= 0:
+                        return
+                    self._condition.wait(PENDING_SCORING_POLL_SECONDS)
+            else:
+                time.sleep(PENDING_SCORING_POLL_SECONDS)
+
+    def qsize(self) -> int:
+        """Jobs not claimed by any worker yet."""
+        with self.app.app_context():
+            return self._scoped(PendingScoring.query.filter(_claimable(datetime.utcnow()))).count()
+
+
+def resume_pending_scoring(app, run_scraping_task_func):
+    """Start a scoring-only run for the jobs of orphaned runs (see above), if there are any."""
+    if not PENDING_SCORING_ENABLED:
+        return None
+    with app.app_context():
+        pending = pending_job_count(orphaned_run_ids())
+    if not pending:
+        return None
+
+    logger.info(f"Resuming scoring of {pending} job(s) left over from before the restart")
+    run = scrape_runs.create(None, trigger='resume')
+    thread = threading.Thread(target=run_scraping_task_func, args=({}, run), daemon=True)
+    thread.start()
+    return run
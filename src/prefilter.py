@@ -0,0 +1,74 @@
+"""
+Embedding-based pre-filter for scraped jobs.
+
+Broad searches return plenty of postings that obviously don't fit the
+candidate. Before they reach the LLM, jobs are embedded in small batches and
+compared to an embedding of the CV/preferences; jobs whose cosine similarity
+is below PREFILTER_THRESHOLD skip the full evaluation and get a low score
+marked as auto-filtered.
+"""
+
+import logging
+import os
+
+import numpy as np
+
+from llama_cpp_scoring import CandidateEvaluator
+
+logger = logging.getLogger('queue')
+
+PREFILTER_ENABLED = os.getenv('PREFILTER_ENABLED', '0') == '1'
+PREFILTER_THRESHOLD = float(os.getenv('PREFILTER_THRESHOLD', '0.35'))
+PREFILTER_BATCH_SIZE = int(os.getenv('PREFILTER_BATCH_SIZE', '16'))
+PREFILTER_MAX_CHARS = 4000  # Keep job texts within the embedding model's context
+
+CATEGORY_KEYS = {
+    "skillset": "skillset_match",
+    "academic": "academic_requirements",
+    "experience": "experience_level",
+    "professional": "professional_experience",
+    "language": "language_requirements",
+    "preference": "preference_alignment",
+}
+
+
+def _job_text(job_data: dict) -> str:
+    text = f"{job_data.get('title', '')}\n{job_data.get('company', '')}\n{job_data.get('description', '')}"
+    return text[:PREFILTER_MAX_CHARS]
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return matrix / np.where(norms == 0, 1, norms)
+
+
+class EmbeddingPrefilter:
+    """Scores job batches by cosine similarity to the candidate profile."""
+
+    def __init__(self, evaluator: CandidateEvaluator, cv: str, preferences: str,
+                 threshold: float = PREFILTER_THRESHOLD):
+        self.evaluator = evaluator
+        self.threshold = threshold
+        profile_text = f"{cv}\n{preferences}"[:PREFILTER_MAX_CHARS]
+        # Embedded once per run; every job batch is compared against it
+        self.profile_vector = _normalize_rows(np.asarray(evaluator.embed([profile_text])[0], dtype=np.float32))
+
+    def similarities(self, jobs: list) -> np.ndarray:
+        """Cosine similarity of each job to the profile, in input order."""
+        vectors = np.asarray(self.evaluator.embed([_job_text(job) for job in jobs]), dtype=np.float32)
+        return _normalize_rows(vectors) @ self.profile_vector
+
+    def is_filtered(self, similarity: float) -> bool:
+        return similarity < self.threshold
+
+    def filtered_score(self, similarity: float) -> dict:
+        """Low score in the legacy format for a job that skipped the LLM evaluation."""
+        score = int(max(0.0, similarity) * 100)
+        evidence = f"Auto-filtered: profile similarity {similarity:.2f} below threshold {self.threshold:.2f}"
+        score_dict = {key: score for key in CATEGORY_KEYS}
+        score_dict["overall"] = score
+        score_dict["auto_filtered"] = True
+        score_dict["reasoning"] = {
+            name: {"score": score, "evidence": evidence} for name in CATEGORY_KEYS.values()
+        }
+        return score_dict
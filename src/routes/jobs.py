@@ -1,5 +1,10 @@
-from flask import Blueprint, jsonify, request, render_template
-from models import db, Job, SearchCriteria, Contact, UserProfile, UserJobInteraction
+from flask import Blueprint, jsonify, request, render_template, current_app
+from sqlalchemy import tuple_
+from sqlalchemy.orm import joinedload, load_only
+from models import db, Job, SearchCriteria, Contact, UserProfile, UserJobInteraction, SCORE_COLUMNS
+from link_resolver import needs_resolution, request_resolution, apply_link
+from job_search import search_jobs, forget_jobs
+from scrape_summaries import scrape_summaries, invalidate_scrape_summaries
 from datetime import datetime
 import random
 
@@ -11,51 +16,8 @@ jobs_bp = Blueprint('jobs', __name__)
 
 @jobs_bp.route('/jobs')
 def index():
-    # Get search runs (not templates) with job counts
-    search_criterias = SearchCriteria.query.filter_by(is_template=False).all()
-    scrapes = []
-    for sc in search_criterias:
-        job_count = Job.query.filter_by(search_criteria_id=sc.id).count()
-        if job_count > 0:  # Only include scrapes that have jobs
-            non_shortlisted_count = Job.query.filter_by(search_criteria_id=sc.id, shortlisted=False).count()
-
-            scrapes.append({
-                'id': sc.id,
-                'keywords': sc.keywords,
-                'locations': sc.locations,
-                'distance_in_km': sc.distance_in_km,
-                'date_posted': sc.date_posted,
-                'exp_level': sc.exp_level,
-                'job_type': sc.job_type,
-                'job_count': job_count,
-                'non_shortlisted_count': non_shortlisted_count,
-                'is_processed': sc.is_processed,
-                'created_at': sc.created_at,
-                'is_archived': False
-            })
-
-    # Add archived jobs (jobs with no search_criteria_id and shortlisted) as a special scrape
-    archived_job_count = Job.query.filter_by(search_criteria_id=None, shortlisted=True).count()
-    if archived_job_count > 0:
-        scrapes.append({
-            'id': 'archived',
-            'keywords': 'Archived Jobs',
-            'locations': 'Various',
-            'distance_in_km': None,
-            'date_posted': None,
-            'exp_level': None,
-            'job_type': None,
-            'job_count': archived_job_count,
-            'non_shortlisted_count': 0,
-            'is_processed': True,
-            'created_at': datetime.utcnow(),
-            'is_archived': True
-        })
-
-    # Sort by most recent
-    scrapes.sort(key=lambda x: x['created_at'], reverse=True)
-
-    return render_template('index.html', scrapes=scrapes, active_page='index')
+    # Search runs (not templates) with job counts, plus archived jobs, in one query
+    return render_template('index.html', scrapes=scrape_summaries(), active_page='index')
 
 # ============================================================================
 # JOB API ENDPOINTS
@@ -87,6 +49,7 @@ def create_job():
         )
         db.session.add(new_job)
         db.session.commit()
+        invalidate_scrape_summaries()  # Shortlisted manual jobs show up as archived
 
         return jsonify({
             'id': new_job.id,
@@ -103,6 +66,8 @@ def delete_job(job_id):
         job = Job.query.get_or_404(job_id)
         db.session.delete(job)
         db.session.commit()
+        invalidate_scrape_summaries()
+        forget_jobs([job_id])
         return jsonify({'status': 'success', 'message': 'Job deleted'})
     except Exception as e:
         return jsonify({'status': 'error', 'message': str(e)}), 500
@@ -191,6 +156,7 @@ def toggle_shortlist(job_id):
             job.status = 'New'
 
         db.session.commit()
+        invalidate_scrape_summaries()
         return jsonify({'status': 'success', 'shortlisted': job.shortlisted, 'job_status': job.status})
     except Exception as e:
         db.session.rollback()
@@ -200,6 +166,13 @@ def toggle_shortlist(job_id):
 def get_job_details(job_id):
     try:
         job = Job.query.get_or_404(job_id)
+
+        # Scraped jobs only know their LinkedIn URL until someone looks at them; resolving
+        # opens a browser, so it runs in the background and the page polls /job/<id>/apply_link
+        link_resolving = needs_resolution(job)
+        if link_resolving:
+            request_resolution(current_app._get_current_object(), job.id)
+
         dates = []
         for d in job.dates:
             dates.append({
@@ -222,7 +195,9 @@ def get_job_details(job_id):
             'company': job.company,
             'location': job.location,
             'description': job.description,
-            'application_link': job.application_link,
+            'application_link': apply_link(job),
+            'linkedin_link': job.application_link,
+            'link_resolving': link_resolving,
             'status': job.status,
             'shortlisted': job.shortlisted,
             'notes': job.notes,
@@ -237,6 +212,19 @@ def get_job_details(job_id):
     except Exception as e:
         return jsonify({'status': 'error', 'message': str(e)}), 500
 
+@jobs_bp.route('/job/<int:job_id>/apply_link', methods=['GET'])
+def get_apply_link(job_id):
+    """Current apply link of a job, and whether the background resolver is still on it."""
+    try:
+        job = Job.query.options(load_only(Job.id, Job.application_link, Job.external_link)).get_or_404(job_id)
+        return jsonify({
+            'id': job.id,
+            'application_link': apply_link(job),
+            'link_resolving': needs_resolution(job)
+        })
+    except Exception as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 500
+
 @jobs_bp.route('/job/<int:job_id>/details', methods=['POST'])
 def update_job_details(job_id):
     try:
@@ -312,33 +300,180 @@ def add_interview_date(job_id):
         print(f"Error adding interview date: {e}")
         return jsonify({'status': 'error', 'message': str(e)}), 500
 
+# Fields of the /scrape/<id>/jobs listing: field -> (Job columns it needs, serializer)
+SCRAPE_JOB_FIELDS = {
+    'id': ((), lambda job: job.id),
+    'title': ((Job.title,), lambda job: job.title),
+    'company': ((Job.company,), lambda job: job.company),
+    'location': ((Job.location,), lambda job: job.location),
+    'description': ((Job.description,), lambda job: job.description),
+    'application_link': ((Job.application_link, Job.external_link), apply_link),
+    'shortlisted': ((Job.shortlisted,), lambda job: job.shortlisted),
+    'matching_score': ((Job.matching_score,), lambda job: job.matching_score),
+    'scores': (tuple(getattr(Job, column) for column in SCORE_COLUMNS.values()) + (Job.matching_score,),
+               lambda job: score_summary(job)),
+    'score_details': ((Job.score_details,), lambda job: job.score_details),
+    'scraped_at': ((Job.scraped_at,), lambda job: job.scraped_at.isoformat()),
+    'updated_at': ((Job.updated_at,), lambda job: job.updated_at.isoformat()),
+    'search_criteria_id': ((Job.search_criteria_id,), lambda job: job.search_criteria_id),
+    'search_criteria': ((Job.search_criteria_id,), lambda job: {
+        'keywords': job.search_criteria.keywords,
+        'locations': job.search_criteria.locations
+    } if job.search_criteria else {'keywords': 'Archived', 'locations': 'Various'}),
+}
+# Everything but the heavy description and full score breakdown (see /job/<id>/description)
+DEFAULT_SCRAPE_JOB_FIELDS = ('id', 'title', 'company', 'location', 'application_link', 'shortlisted',
+                             'matching_score', 'scores', 'scraped_at', 'updated_at', 'search_criteria_id',
+                             'search_criteria')
+# Orders (and min_<key> filters) of the listing: the overall score or one category's
+SCRAPE_JOB_SORTS = dict({'score': Job.matching_score},
+                        **{category: getattr(Job, column) for category, column in SCORE_COLUMNS.items()})
+SCRAPE_JOBS_PAGE_SIZE = 100
+SCRAPE_JOBS_MAX_PAGE_SIZE = 500
+
+
+def score_summary(job):
+    """Per-category and overall scores from the typed score columns, without the evidence."""
+    scores = {category: getattr(job, column) for category, column in SCORE_COLUMNS.items()}
+    if all(score is None for score in scores.values()):
+        return None
+    scores['overall'] = job.matching_score
+    return scores
+
+
 @jobs_bp.route('/scrape/<scrape_id>/jobs')
 def get_scrape_jobs(scrape_id):
+    """
+    One page of a run's jobs, best first. Pages are keyset-paginated on
+    (matching_score, id): pass the returned `next_cursor` as `cursor` to get
+    the next one. `fields` is a comma-separated subset of SCRAPE_JOB_FIELDS.
+
+    `sort` orders by a score category instead (a key of SCRAPE_JOB_SORTS;
+    jobs without a breakdown are left out then), and `min_<key>` keeps the
+    jobs scoring at least that much, e.g. `?sort=language&min_language=70`.
+    """
     try:
+        fields = request.args.get('fields')
+        fields = [f.strip() for f in fields.split(',') if f.strip()] if fields else list(DEFAULT_SCRAPE_JOB_FIELDS)
+        unknown = [f for f in fields if f not in SCRAPE_JOB_FIELDS]
+        if unknown:
+            return jsonify({'status': 'error', 'message': f"Unknown field(s): {', '.join(unknown)}"}), 400
+        limit = min(max(1, request.args.get('limit', SCRAPE_JOBS_PAGE_SIZE, type=int)), SCRAPE_JOBS_MAX_PAGE_SIZE)
+        sort = request.args.get('sort', 'score')
+        if sort not in SCRAPE_JOB_SORTS:
+            return jsonify({'status': 'error', 'message': f"Unknown sort: {sort}"}), 400
+        sort_column = SCRAPE_JOB_SORTS[sort]
+
         # Handle archived jobs specially - only show shortlisted jobs
         if scrape_id == 'archived':
-            jobs = Job.query.filter_by(search_criteria_id=None, shortlisted=True).order_by(Job.matching_score.desc()).all()
+            query = Job.query.filter_by(search_criteria_id=None, shortlisted=True)
         else:
-            jobs = Job.query.filter_by(search_criteria_id=int(scrape_id)).order_by(Job.matching_score.desc()).all()
+            query = Job.query.filter_by(search_criteria_id=int(scrape_id))
+
+        # Score filters and orders use the typed per-category columns (indexed per run)
+        for key, column in SCRAPE_JOB_SORTS.items():
+            minimum = request.args.get(f'min_{key}')
+            if minimum is None:
+                continue
+            try:
+                query = query.filter(column >= float(minimum))
+            except ValueError:
+                return jsonify({'status': 'error', 'message': f"Invalid min_{key}: {minimum}"}), 400
+        if sort != 'score':
+            query = query.filter(sort_column.isnot(None))
+
+        # Load only the columns the requested fields need, and the criteria in the same query
+        columns = {Job.id, Job.matching_score, sort_column}
+        for field in fields:
+            columns.update(SCRAPE_JOB_FIELDS[field][0])
+        query = query.options(load_only(*columns))
+        if 'search_criteria' in fields:
+            query = query.options(joinedload(Job.search_criteria).load_only(SearchCriteria.keywords, SearchCriteria.locations))
+
+        cursor = request.args.get('cursor')
+        if cursor:
+            try:
+                cursor_score, cursor_id = cursor.split(':')
+                cursor_score, cursor_id = float(cursor_score), int(cursor_id)
+            except ValueError:
+                return jsonify({'status': 'error', 'message': 'Invalid cursor'}), 400
+            query = query.filter(tuple_(sort_column, Job.id) < tuple_(cursor_score, cursor_id))
+
+        jobs = query.order_by(sort_column.desc(), Job.id.desc()).limit(limit + 1).all()
+        next_cursor = None
+        if len(jobs) > limit:
+            jobs = jobs[:limit]
+            next_cursor = f"{getattr(jobs[-1], sort_column.key)!r}:{jobs[-1].id}"
 
-        return jsonify([{
+        return jsonify({
+            'jobs': [{field: SCRAPE_JOB_FIELDS[field][1](job) for field in fields} for job in jobs],
+            'next_cursor': next_cursor
+        })
+    except Exception as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 500
+
+@jobs_bp.route('/jobs/search')
+def search_scraped_jobs():
+    """
+    Full-text search over all jobs' title, company and description, best
+    match first (see job_search.py). Takes `q`, optionally `scrape_id`, and
+    pages like /scrape/<id>/jobs (`limit`, `cursor` -> `next_cursor`). Each
+    job has the default listing fields plus `rank`, and `title_highlight`
+    and `snippet` as HTML with the hits in <mark>.
+    """
+    try:
+        query = (request.args.get('q') or '').strip()
+        if not query:
+            return jsonify({'status': 'error', 'message': 'Missing search query (q)'}), 400
+        limit = min(max(1, request.args.get('limit', SCRAPE_JOBS_PAGE_SIZE, type=int)), SCRAPE_JOBS_MAX_PAGE_SIZE)
+        scrape_id = request.args.get('scrape_id')
+
+        cursor = request.args.get('cursor')
+        try:
+            scrape_id = int(scrape_id) if scrape_id else None
+            if cursor:
+                cursor_rank, cursor_id = cursor.split(':')
+                cursor = (float(cursor_rank), int(cursor_id))
+        except ValueError:
+            return jsonify({'status': 'error', 'message': 'Invalid cursor or scrape_id'}), 400
+
+        hits, next_cursor = search_jobs(query, limit, cursor, scrape_id)
+
+        fields = DEFAULT_SCRAPE_JOB_FIELDS
+        columns = {Job.id}
+        for field in fields:
+            columns.update(SCRAPE_JOB_FIELDS[field][0])
+        jobs = {job.id: job for job in Job.query.options(
+            load_only(*columns),
+            joinedload(Job.search_criteria).load_only(SearchCriteria.keywords, SearchCriteria.locations)
+        ).filter(Job.id.in_([hit['id'] for hit in hits]))}
+
+        results = []
+        for hit in hits:
+            job = jobs.get(hit['id'])
+            if job is None:
+                continue
+            result = {field: SCRAPE_JOB_FIELDS[field][1](job) for field in fields}
+            result.update(rank=hit['rank'], title_highlight=hit['title_highlight'], snippet=hit['snippet'])
+            results.append(result)
+
+        return jsonify({
+            'jobs': results,
+            'next_cursor': f"{next_cursor[0]!r}:{next_cursor[1]}" if next_cursor else None
+        })
+    except Exception as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 500
+
+@jobs_bp.route('/job/<int:job_id>/description', methods=['GET'])
+def get_job_description(job_id):
+    """The fields the job listing leaves out: description and full score breakdown."""
+    try:
+        job = Job.query.options(load_only(Job.id, Job.description, Job.score_details)).get_or_404(job_id)
+        return jsonify({
             'id': job.id,
-            'title': job.title,
-            'company': job.company,
-            'location': job.location,
             'description': job.description,
-            'application_link': job.application_link,
-            'shortlisted': job.shortlisted,
-            'matching_score': job.matching_score,
-            'score_details': job.score_details,
-            'scraped_at': job.scraped_at.isoformat(),
-            'updated_at': job.updated_at.isoformat(),
-            'search_criteria_id': job.search_criteria_id,
-            'search_criteria': {
-                'keywords': job.search_criteria.keywords,
-                'locations': job.search_criteria.locations
-            } if job.search_criteria else {'keywords': 'Archived', 'locations': 'Various'}
-        } for job in jobs])
+            'score_details': job.score_details
+        })
     except Exception as e:
         return jsonify({'status': 'error', 'message': str(e)}), 500
 
@@ -348,6 +483,7 @@ def confirm_scrape(scrape_id):
         # Delete all non-shortlisted jobs from this scrape
         jobs_to_delete = Job.query.filter_by(search_criteria_id=scrape_id, shortlisted=False).all()
         deleted_count = len(jobs_to_delete)
+        deleted_ids = [job.id for job in jobs_to_delete]
         for job in jobs_to_delete:
             db.session.delete(job)
 
@@ -362,6 +498,8 @@ def confirm_scrape(scrape_id):
         db.session.delete(search_criteria)
 
         db.session.commit()
+        invalidate_scrape_summaries()
+        forget_jobs(deleted_ids)
 
         return jsonify({
             'status': 'success',
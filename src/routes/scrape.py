@@ -1,6 +1,9 @@
 from flask import Blueprint, jsonify, request, render_template
 from models import db, SearchCriteria, Job
-from scrapers import LinkedInScraper
+from scrapers import LinkedInScraper, SCRAPER_BACKENDS
+from scoring_pool import active_pool_metrics
+from scrape_runs import scrape_runs
+from scrape_summaries import invalidate_scrape_summaries
 
 scrape_bp = Blueprint('scrape', __name__)
 
@@ -16,6 +19,7 @@ def scrape():
         date_map=LinkedInScraper.DATE_MAP,
         exp_level_map=LinkedInScraper.EXP_LEVEL_MAP,
         job_type_map=LinkedInScraper.JOB_TYPE_MAP,
+        scraper_backends=list(SCRAPER_BACKENDS),
         active_page='scrape'
     )
 
@@ -35,6 +39,8 @@ def create_search_criteria():
             exp_level=data.get('exp_level'),
             job_type=data.get('job_type'),
             pages=data.get('pages', 1),
+            scraper_backend=data.get('scraper_backend') or 'browser',
+            incremental=data.get('incremental', False),
             schedule_enabled=data.get('schedule_enabled', False),
             schedule_hour=data.get('schedule_hour'),
             schedule_minute=data.get('schedule_minute', 0),
@@ -68,6 +74,9 @@ def get_search_criteria(criteria_id):
             'exp_level': criteria.exp_level,
             'job_type': criteria.job_type,
             'pages': criteria.pages,
+            'scraper_backend': criteria.scraper_backend,
+            'incremental': criteria.incremental,
+            'high_water_mark': criteria.high_water_mark,
             'schedule_enabled': criteria.schedule_enabled,
             'schedule_hour': criteria.schedule_hour,
             'schedule_minute': criteria.schedule_minute,
@@ -92,6 +101,9 @@ def update_search_criteria(criteria_id):
         criteria.exp_level = data.get('exp_level', criteria.exp_level)
         criteria.job_type = data.get('job_type', criteria.job_type)
         criteria.pages = data.get('pages', criteria.pages)
+        criteria.scraper_backend = data.get('scraper_backend') or criteria.scraper_backend
+        if 'incremental' in data:
+            criteria.incremental = data['incremental']
 
         # Update scheduling fields if provided
         if 'schedule_enabled' in data:
@@ -132,6 +144,7 @@ def delete_search_criteria(criteria_id):
         # Now delete the search criteria
         db.session.delete(criteria)
         db.session.commit()
+        invalidate_scrape_summaries()
 
         # Sync scheduler to remove any scheduled jobs for this criteria
         from scheduler import sync_scheduler_jobs
@@ -156,6 +169,9 @@ def get_search_criterias():
             'exp_level': c.exp_level,
             'job_type': c.job_type,
             'pages': c.pages,
+            'scraper_backend': c.scraper_backend,
+            'incremental': c.incremental,
+            'high_water_mark': c.high_water_mark,
             'schedule_enabled': c.schedule_enabled,
             'schedule_hour': c.schedule_hour,
             'schedule_minute': c.schedule_minute,
@@ -167,3 +183,27 @@ def get_search_criterias():
         } for c in criterias])
     except Exception as e:
         return jsonify({'status': 'error', 'message': str(e)}), 500
+
+# ============================================================================
+# SCORING METRICS
+# ============================================================================
+
+@scrape_bp.route('/scoring/metrics')
+def get_scoring_metrics():
+    """Worker count, queue depth and autoscaling decisions of running scrapes."""
+    return jsonify(active_pool_metrics())
+
+# ============================================================================
+# SCRAPE RUNS
+# ============================================================================
+
+@scrape_bp.route('/scrape/runs')
+def get_scrape_runs():
+    """Queued, running and recently finished scrape runs, newest first."""
+    return jsonify(scrape_runs.snapshot())
+
+@scrape_bp.route('/scrape/runs/<run_id>/stop', methods=['POST'])
+def stop_scrape_run(run_id):
+    if not scrape_runs.stop(run_id):
+        return jsonify({'status': 'error', 'message': 'Run not found or already finished'}), 404
+    return jsonify({'status': 'success', 'run_id': run_id})
@@ -0,0 +1,107 @@
+"""
+Persistent cache for job scoring results.
+
+Scheduled scrapes keep finding the same postings, and `confirm_scrape` deletes
+the non-shortlisted ones, so the duplicate check against the Job table alone
+cannot prevent re-scoring. This cache maps a hash of the normalized job text,
+the candidate profile, the model and the prompt version to the legacy score
+dict. Entries expire after a TTL and the table is trimmed to a maximum size
+(least recently used first).
+
+All functions expect to be called inside a Flask app context.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+from datetime import datetime, timedelta
+
+from sqlalchemy.exc import IntegrityError
+
+from models import db, ScoreCache
+from llama_cpp_scoring import PROMPT_VERSION
+
+logger = logging.getLogger('queue')
+
+SCORE_CACHE_TTL_DAYS = int(os.getenv('SCORE_CACHE_TTL_DAYS', '30'))
+SCORE_CACHE_MAX_ENTRIES = int(os.getenv('SCORE_CACHE_MAX_ENTRIES', '20000'))
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def _normalize(text) -> str:
+    """Lowercase and collapse whitespace so formatting noise doesn't change the key."""
+    return _WHITESPACE_RE.sub(' ', (text or '')).strip().lower()
+
+
+def _sha256(*parts) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\x1f')  # Separator so ("ab", "c") != ("a", "bc")
+    return digest.hexdigest()
+
+
+def profile_fingerprint(cv: str, preferences: str) -> str:
+    """Fingerprint of the candidate profile the scores were produced for."""
+    return _sha256(_normalize(cv), _normalize(preferences))
+
+
+def score_cache_key(job_data: dict, fingerprint: str, model: str) -> str:
+    """Cache key for one job scored against one profile with one model/prompt."""
+    return _sha256(
+        _normalize(job_data.get('title')),
+        _normalize(job_data.get('company')),
+        _normalize(job_data.get('description')),
+        fingerprint,
+        model,
+        PROMPT_VERSION,
+    )
+
+
+def get_cached_score(key: str):
+    """Return the cached score dict for `key`, or None on a miss or expired entry."""
+    entry = db.session.get(ScoreCache, key)
+    if entry is None:
+        return None
+
+    if entry.created_at < datetime.utcnow() - timedelta(days=SCORE_CACHE_TTL_DAYS):
+        db.session.delete(entry)
+        db.session.commit()
+        return None
+
+    entry.last_used_at = datetime.utcnow()
+    db.session.commit()
+    return json.loads(entry.score_details)
+
+
+def store_score(key: str, score_dict: dict):
+    """Store a successful scoring result. Concurrent inserts of the same key are ignored."""
+    try:
+        db.session.add(ScoreCache(
+            key=key,
+            matching_score=float(score_dict.get('overall', 0)),
+            score_details=json.dumps(score_dict)
+        ))
+        db.session.commit()
+    except IntegrityError:
+        # Another worker cached the same job in the meantime
+        db.session.rollback()
+
+
+def prune_score_cache():
+    """Drop expired entries and trim the cache to SCORE_CACHE_MAX_ENTRIES (LRU)."""
+    cutoff = datetime.utcnow() - timedelta(days=SCORE_CACHE_TTL_DAYS)
+    expired = ScoreCache.query.filter(ScoreCache.created_at < cutoff).delete(synchronize_session=False)
+
+    overflow = ScoreCache.query.count() - SCORE_CACHE_MAX_ENTRIES
+    evicted = 0
+    if overflow > 0:
+        oldest = db.session.query(ScoreCache.key).order_by(ScoreCache.last_used_at.asc()).limit(overflow)
+        evicted = ScoreCache.query.filter(ScoreCache.key.in_(oldest.scalar_subquery())).delete(synchronize_session=False)
+
+    db.session.commit()
+    if expired or evicted:
+        logger.info(f"Score cache pruned: {expired} expired, {evicted} evicted")
@@ -0,0 +1,216 @@
+"""
+Autoscaling pool of rating workers for the scrape -> score pipeline.
+
+The pool starts as many workers as the llama.cpp server has slots and then
+grows or shrinks between SCORING_WORKERS_MIN and SCORING_WORKERS_MAX based on
+the queue depth and the measured per-request latency. Unless
+SCORING_WORKERS_MAX is set, the pool may grow SCORING_WORKERS_HEADROOM
+workers past the slot count (a request waiting at the server keeps its slots
+busy between requests); the latency check takes them back once the server is
+saturated:
+
+- queue backing up and latency still close to the best seen -> add a worker
+- latency degrading (server saturated) or queue idle -> retire a worker
+
+Workers are plain threads running `worker_fn(job_queue, worker_id, pool)`.
+They must call `pool.should_retire(worker_id)` before taking the next job and
+`pool.record_latency(seconds)` after scoring one. There are no sentinels:
+`shutdown()` waits for the queue to drain and then tells every worker to exit.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+from queue import Queue
+
+logger = logging.getLogger('queue')
+
+SCORING_WORKERS_MIN = int(os.getenv('SCORING_WORKERS_MIN', '1'))
+SCORING_WORKERS_MAX = int(os.getenv('SCORING_WORKERS_MAX', '0'))  # 0 = server slots + SCORING_WORKERS_HEADROOM
+SCORING_WORKERS_HEADROOM = int(os.getenv('SCORING_WORKERS_HEADROOM', '2'))
+SCORING_QUEUE_SIZE = int(os.getenv('SCORING_QUEUE_SIZE', '50'))
+SCORING_POOL_INTERVAL = float(os.getenv('SCORING_POOL_INTERVAL', '2'))
+SCORING_LATENCY_FACTOR = float(os.getenv('SCORING_LATENCY_FACTOR', '1.5'))  # Latency above best * factor = saturated
+SCORING_IDLE_TICKS = 5  # Consecutive idle controller ticks before retiring a worker
+
+# Pools of all running scrapes, for the metrics endpoint
+_active_pools = []
+_active_pools_lock = threading.Lock()
+
+
+def active_pool_metrics():
+    """Metrics snapshot of every running scoring pool."""
+    with _active_pools_lock:
+        return [pool.metrics() for pool in _active_pools]
+
+
+class ScoringPool:
+    """Dynamically sized set of rating worker threads sharing one job queue."""
+
+    def __init__(self, worker_fn, job_queue: Queue, server_slots: int = None,
+                 min_workers: int = None, max_workers: int = None, on_metrics=None):
+        self.worker_fn = worker_fn
+        self.job_queue = job_queue
+        self.server_slots = server_slots or 1
+        self.min_workers = max(1, min_workers if min_workers is not None else SCORING_WORKERS_MIN)
+        if max_workers is None:
+            max_workers = SCORING_WORKERS_MAX or self.server_slots + max(0, SCORING_WORKERS_HEADROOM)
+        self.max_workers = max_workers
+        self.max_workers = max(self.min_workers, self.max_workers)
+        self.on_metrics = on_metrics  # Called with the metrics dict after every controller tick
+
+        self._lock = threading.Lock()
+        self._threads = {}  # worker_id -> Thread
+        self._retiring = set()
+        self._stop = threading.Event()
+        self._latencies = deque(maxlen=20)
+        self._best_latency = None
+        self._jobs_scored = 0
+        self._idle_ticks = 0
+        self._last_decision = 'start'
+        self._controller = None
+
+        # Start where the server can actually work in parallel
+        self.target_workers = min(self.max_workers, max(self.min_workers, self.server_slots))
+
+    # ------------------------------------------------------------------
+    # Worker-facing API
+    # ------------------------------------------------------------------
+    def should_retire(self, worker_id: int) -> bool:
+        """True once this worker should stop taking jobs."""
+        if self._stop.is_set():
+            return True
+        with self._lock:
+            return worker_id in self._retiring
+
+    def record_latency(self, seconds: float):
+        """Report how long one job took to score."""
+        with self._lock:
+            self._latencies.append(seconds)
+            self._jobs_scored += 1
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+    def start(self):
+        logger.info(f"Starting {self.target_workers} rating workers "
+                    f"(min {self.min_workers}, max {self.max_workers}, server slots {self.server_slots})...")
+        self._reconcile()
+        self._controller = threading.Thread(target=self._control_loop, daemon=True)
+        self._controller.start()
+        with _active_pools_lock:
+            _active_pools.append(self)
+
+    def shutdown(self):
+        """Wait until every queued job is scored, then stop all workers."""
+        self.job_queue.join()
+        self.stop()
+        if self._controller:
+            self._controller.join()
+        with self._lock:
+            threads = list(self._threads.values())
+        for thread in threads:
+            thread.join()
+        logger.info(f"Scoring pool stopped after {self._jobs_scored} jobs")
+
+    def stop(self):
+        """Tell all workers to exit after their current job, without draining the queue."""
+        self._stop.set()
+        with _active_pools_lock:
+            if self in _active_pools:
+                _active_pools.remove(self)
+
+    def _run_worker(self, worker_id: int):
+        try:
+            self.worker_fn(self.job_queue, worker_id, self)
+        except Exception as e:
+            logger.error(f"Rating worker {worker_id} crashed: {e}")
+        finally:
+            with self._lock:
+                self._threads.pop(worker_id, None)
+                self._retiring.discard(worker_id)
+
+    def _reconcile(self):
+        """Start or retire threads until the live count matches target_workers."""
+        with self._lock:
+            live = [wid for wid in self._threads if wid not in self._retiring]
+            missing = self.target_workers - len(live)
+            if missing > 0:
+                for _ in range(missing):
+                    # Reuse the lowest free id so workers keep mapping onto the same llama.cpp slots
+                    worker_id = next(i for i in range(1, len(self._threads) + 2) if i not in self._threads)
+                    thread = threading.Thread(target=self._run_worker, args=(worker_id,), daemon=True)
+                    self._threads[worker_id] = thread
+                    thread.start()
+            elif missing < 0:
+                for worker_id in sorted(live, reverse=True)[:-missing]:
+                    self._retiring.add(worker_id)
+
+    # ------------------------------------------------------------------
+    # Controller
+    # ------------------------------------------------------------------
+    def _control_loop(self):
+        while not self._stop.wait(SCORING_POOL_INTERVAL):
+            self._decide()
+            self._reconcile()
+            if self.on_metrics:
+                try:
+                    self.on_metrics(self.metrics())
+                except Exception as e:
+                    logger.debug(f"Publishing scoring metrics failed: {e}")
+
+    def _average_latency(self):
+        with self._lock:
+            return sum(self._latencies) / len(self._latencies) if self._latencies else None
+
+    def _decide(self):
+        depth = self.job_queue.qsize()
+        latency = self._average_latency()
+        if latency is not None:
+            self._best_latency = latency if self._best_latency is None else min(self._best_latency, latency)
+        saturated = (latency is not None and self._best_latency is not None
+                     and latency > self._best_latency * SCORING_LATENCY_FACTOR)
+
+        self._idle_ticks = self._idle_ticks + 1 if depth == 0 else 0
+        previous = self.target_workers
+
+        if saturated and self.target_workers > self.min_workers:
+            self.target_workers -= 1
+            reason = f"latency {latency:.1f}s > {SCORING_LATENCY_FACTOR}x best {self._best_latency:.1f}s"
+        elif depth > self.target_workers and not saturated and self.target_workers < self.max_workers:
+            self.target_workers += 1
+            reason = f"queue depth {depth} > {previous} workers"
+        elif self._idle_ticks >= SCORING_IDLE_TICKS and self.target_workers > self.min_workers:
+            self.target_workers -= 1
+            self._idle_ticks = 0
+            reason = "queue idle"
+        else:
+            return
+
+        # Judge the next decision on latencies measured with the new worker count
+        with self._lock:
+            self._latencies.clear()
+        self._last_decision = f"{previous} -> {self.target_workers} workers ({reason})"
+        logger.info(f"Scoring pool: {self._last_decision}")
+
+    def metrics(self) -> dict:
+        latency = self._average_latency()
+        with self._lock:
+            live_workers = len(self._threads) - len(self._retiring)
+            jobs_scored = self._jobs_scored
+        return {
+            'workers': live_workers,
+            'target_workers': self.target_workers,
+            'min_workers': self.min_workers,
+            'max_workers': self.max_workers,
+            'server_slots': self.server_slots,
+            'queue_depth': self.job_queue.qsize(),
+            'queue_capacity': self.job_queue.maxsize,
+            'avg_latency_seconds': round(latency, 2) if latency is not None else None,
+            'best_latency_seconds': round(self._best_latency, 2) if self._best_latency is not None else None,
+            'jobs_scored': jobs_scored,
+            'last_decision': self._last_decision,
+            'timestamp': time.time(),
+        }
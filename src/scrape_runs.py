@@ -0,0 +1,145 @@
+"""
+Registry of scrape runs and their cancellation tokens.
+
+Every `run_scraping_task` call gets its own ScrapeRun with an id and a
+cancellation event, so stopping or finishing one run never affects another.
+At most SCRAPE_MAX_CONCURRENT_RUNS runs scrape at the same time; further
+runs wait in FIFO order (status 'queued') until a slot frees up or they are
+stopped while waiting.
+"""
+
+import os
+import threading
+import uuid
+from collections import deque
+from datetime import datetime
+
+SCRAPE_MAX_CONCURRENT_RUNS = int(os.getenv('SCRAPE_MAX_CONCURRENT_RUNS', '1'))
+SCRAPE_RUN_HISTORY = 50  # Finished runs kept for the status endpoint
+
+FINISHED_STATUSES = ('finished', 'stopped', 'failed')
+
+
+class ScrapeRun:
+    """One scrape run: id, template, status and cancellation token."""
+
+    def __init__(self, template_id, trigger: str = 'manual', run_id: str = None):
+        self.id = run_id or uuid.uuid4().hex[:12]
+        self.template_id = template_id
+        self.trigger = trigger  # 'manual', 'scheduled' or 'resume' (score leftover pending jobs)
+        self.status = 'queued'
+        self.search_criteria_id = None  # The run's SearchCriteria row, once created
+        self.error = None
+        self.created_at = datetime.utcnow()
+        self.started_at = None
+        self.finished_at = None
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        self._cancel.set()
+        if self.status in ('queued', 'running'):
+            self.status = 'stopping'
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def to_dict(self) -> dict:
+        return {
+            'run_id': self.id,
+            'template_id': self.template_id,
+            'search_criteria_id': self.search_criteria_id,
+            'trigger': self.trigger,
+            'status': self.status,
+            'error': self.error,
+            'created_at': self.created_at.isoformat(),
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+
+class RunRegistry:
+    """Thread-safe registry with a limit on concurrently running scrapes."""
+
+    def __init__(self, max_concurrent: int = SCRAPE_MAX_CONCURRENT_RUNS):
+        self.max_concurrent = max(1, max_concurrent)
+        self._condition = threading.Condition()
+        self._runs = {}  # run_id -> ScrapeRun (active and recent)
+        self._waiting = deque()
+        self._running = set()
+        self._history = deque()
+
+    def create(self, template_id, trigger: str = 'manual', run_id: str = None) -> ScrapeRun:
+        """Register a new run; `run_id` keeps the id a run already got in another process."""
+        run = ScrapeRun(template_id, trigger, run_id)
+        with self._condition:
+            self._runs[run.id] = run
+        return run
+
+    def acquire(self, run: ScrapeRun) -> bool:
+        """Block until `run` may start. Returns False if it was stopped while queued."""
+        with self._condition:
+            self._waiting.append(run)
+            try:
+                while not run.cancelled and (
+                    len(self._running) >= self.max_concurrent or self._waiting[0] is not run
+                ):
+                    # Timeout so a cancelled run notices without a notify
+                    self._condition.wait(timeout=1.0)
+            finally:
+                self._waiting.remove(run)
+                self._condition.notify_all()
+            if run.cancelled:
+                return False
+            self._running.add(run.id)
+            run.status = 'running'
+            run.started_at = datetime.utcnow()
+            return True
+
+    def release(self, run: ScrapeRun, status: str, error: str = None):
+        """Mark `run` as done and hand its slot to the next queued run."""
+        with self._condition:
+            self._running.discard(run.id)
+            run.status = status
+            run.error = error
+            run.finished_at = datetime.utcnow()
+            self._history.append(run.id)
+            while len(self._history) > SCRAPE_RUN_HISTORY:
+                self._runs.pop(self._history.popleft(), None)
+            self._condition.notify_all()
+
+    def is_full(self) -> bool:
+        """True if a new run would have to wait."""
+        with self._condition:
+            return len(self._running) >= self.max_concurrent or bool(self._waiting)
+
+    def get(self, run_id: str) -> ScrapeRun:
+        with self._condition:
+            return self._runs.get(run_id)
+
+    def stop(self, run_id: str) -> bool:
+        """Cancel one run (queued or running). Returns False for unknown or finished runs."""
+        run = self.get(run_id)
+        if run is None or run.status in FINISHED_STATUSES:
+            return False
+        run.cancel()
+        with self._condition:
+            self._condition.notify_all()
+        return True
+
+    def stop_all(self) -> list:
+        """Cancel every active run; returns their ids."""
+        return [run.id for run in self.active() if self.stop(run.id)]
+
+    def active(self) -> list:
+        with self._condition:
+            return [run for run in self._runs.values() if run.status not in FINISHED_STATUSES]
+
+    def snapshot(self) -> list:
+        """All known runs, newest first, as dicts."""
+        with self._condition:
+            runs = sorted(self._runs.values(), key=lambda run: run.created_at, reverse=True)
+        return [run.to_dict() for run in runs]
+
+
+scrape_runs = RunRegistry()
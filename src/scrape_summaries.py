@@ -0,0 +1,109 @@
+"""
+Per-run job counts for the /jobs index page.
+
+One aggregate query (`GROUP BY search_criteria_id` with
+`COUNT(*) FILTER (WHERE NOT shortlisted)`, joined to the runs) replaces the
+two COUNTs per search run the page used to issue, so it renders in one round
+trip however many runs there are. The result is cached for
+SCRAPE_SUMMARY_TTL_SECONDS and dropped whenever jobs are inserted,
+shortlisted, deleted or confirmed in this process; the TTL bounds how stale
+the page can be after changes made by a scrape worker process. A query that
+was already running when the cache was dropped does not store its result,
+since it may predate the change.
+
+All functions expect to be called inside a Flask app context.
+"""
+
+import os
+import threading
+import time
+from datetime import datetime
+
+from sqlalchemy import func, or_
+
+from models import db, Job, SearchCriteria
+
+SCRAPE_SUMMARY_TTL_SECONDS = float(os.getenv('SCRAPE_SUMMARY_TTL_SECONDS', '30'))
+
+_cache_lock = threading.Lock()
+_cache = {'scrapes': None, 'expires_at': 0.0, 'generation': 0}
+
+
+def invalidate_scrape_summaries():
+    """Forget the cached counts; the next page load queries them again."""
+    with _cache_lock:
+        _cache['scrapes'] = None
+        _cache['generation'] += 1
+
+
+def scrape_summaries() -> list:
+    """Search runs with jobs, plus the archived pseudo-run, newest first."""
+    with _cache_lock:
+        if _cache['scrapes'] is not None and time.monotonic() < _cache['expires_at']:
+            return _cache['scrapes']
+        generation = _cache['generation']
+
+    scrapes = _query_scrape_summaries()
+    with _cache_lock:
+        # Invalidated while the query ran: the counts may be stale, don't cache them
+        if _cache['generation'] == generation:
+            _cache['scrapes'] = scrapes
+            _cache['expires_at'] = time.monotonic() + SCRAPE_SUMMARY_TTL_SECONDS
+    return scrapes
+
+
+def _query_scrape_summaries() -> list:
+    counts = db.session.query(
+        Job.search_criteria_id.label('search_criteria_id'),
+        func.count(Job.id).label('job_count'),
+        func.count(Job.id).filter(Job.shortlisted.is_(False)).label('non_shortlisted_count'),
+        func.count(Job.id).filter(Job.shortlisted.is_(True)).label('shortlisted_count'),
+    ).group_by(Job.search_criteria_id).subquery()
+
+    # Outer join so the NULL group (archived jobs) comes back in the same query
+    rows = db.session.query(counts, SearchCriteria).outerjoin(
+        SearchCriteria, SearchCriteria.id == counts.c.search_criteria_id
+    ).filter(or_(
+        counts.c.search_criteria_id.is_(None),
+        SearchCriteria.is_template.is_(False)
+    )).all()
+
+    scrapes = []
+    for search_criteria_id, job_count, non_shortlisted_count, shortlisted_count, sc in rows:
+        if search_criteria_id is None:
+            # Archived jobs (no search_criteria_id and shortlisted) as a special scrape
+            if shortlisted_count > 0:
+                scrapes.append({
+                    'id': 'archived',
+                    'keywords': 'Archived Jobs',
+                    'locations': 'Various',
+                    'distance_in_km': None,
+                    'date_posted': None,
+                    'exp_level': None,
+                    'job_type': None,
+                    'job_count': shortlisted_count,
+                    'non_shortlisted_count': 0,
+                    'is_processed': True,
+                    'created_at': datetime.utcnow(),
+                    'is_archived': True
+                })
+            continue
+
+        scrapes.append({
+            'id': sc.id,
+            'keywords': sc.keywords,
+            'locations': sc.locations,
+            'distance_in_km': sc.distance_in_km,
+            'date_posted': sc.date_posted,
+            'exp_level': sc.exp_level,
+            'job_type': sc.job_type,
+            'job_count': job_count,
+            'non_shortlisted_count': non_shortlisted_count,
+            'is_processed': sc.is_processed,
+            'created_at': sc.created_at,
+            'is_archived': False
+        })
+
+    # Sort by most recent
+    scrapes.sort(key=lambda x: x['created_at'], reverse=True)
+    return scrapes
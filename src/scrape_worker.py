@@ -0,0 +1,117 @@
+"""
+Standalone scrape worker: runs scrape -> score pipelines outside the web process.
+
+    cd src && python -m scrape_worker [--runs 1] [--name worker-1]
+
+Claims the runs the web process queues in worker_run (SCRAPE_IN_WORKERS=1)
+and executes each with the same run_scraping_task the web process uses
+inline. Progress and logs reach the browsers through worker_event (see
+worker_channel.py). Start as many workers as the machines allow; each one
+scrapes up to --runs runs at a time.
+"""
+
+import argparse
+import logging
+import os
+import signal
+import socket
+import threading
+import time
+
+from flask import Flask
+
+from migrations import run_migrations
+from models import db
+from scrape_runs import scrape_runs
+from socketio_events import register_socketio_events
+from worker_channel import DatabaseEventBus, claim_worker_run, report_worker_run, WORKER_POLL_SECONDS
+
+
+class EventBusHandler(logging.Handler):
+    """Publishes log records as log_message events, like main.SocketIOHandler does in the web process."""
+
+    def __init__(self, bus, prefix=""):
+        super().__init__()
+        self.bus = bus
+        self.prefix = prefix
+
+    def emit(self, record):
+        self.bus.emit('log_message', {'data': f"[{self.prefix}] {record.getMessage()}"}, namespace='/')
+
+
+def create_app():
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL')
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    return app
+
+
+def setup_logging(bus):
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    for name, prefix in (('scrapers', 'SCRAPER'), ('queue', 'QUEUE')):
+        component_logger = logging.getLogger(name)
+        component_logger.setLevel(logging.INFO)
+        console = logging.StreamHandler()
+        console.setFormatter(logging.Formatter(f'[{prefix}] %(message)s'))
+        component_logger.addHandler(console)
+        component_logger.addHandler(EventBusHandler(bus, prefix=prefix))
+        component_logger.propagate = False
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=scrape_runs.max_concurrent, help='Runs scraped at the same time')
+    parser.add_argument('--name', default=f"{socket.gethostname()}:{os.getpid()}", help='Worker name shown in worker_run')
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        run_migrations()
+
+    bus = DatabaseEventBus(app)
+    setup_logging(bus)
+    run_scraping_task = register_socketio_events(bus, app)
+    scrape_runs.max_concurrent = max(1, args.runs)
+
+    stopping = threading.Event()
+
+    def handle_signal(signum, frame):
+        logging.info(f"Scrape worker {args.name} shutting down, stopping its runs...")
+        stopping.set()
+        scrape_runs.stop_all()
+
+    signal.signal(signal.SIGTERM, handle_signal)
+    signal.signal(signal.SIGINT, handle_signal)
+
+    logging.info(f"Scrape worker {args.name} started (up to {scrape_runs.max_concurrent} runs at a time)")
+    running = {}  # run_id -> (ScrapeRun, Thread)
+    while not stopping.is_set() or running:
+        try:
+            with app.app_context():
+                for run_id, (run, thread) in list(running.items()):
+                    finished = not thread.is_alive()
+                    report_worker_run(run)  # Heartbeat, status and stop requests
+                    if finished:
+                        del running[run_id]
+
+                while not stopping.is_set() and len(running) < scrape_runs.max_concurrent:
+                    run = claim_worker_run(args.name)
+                    if run is None:
+                        break
+                    logging.info(f"Scrape worker {args.name} picked up run {run.id}")
+                    thread = threading.Thread(
+                        target=run_scraping_task,
+                        args=({'id': run.template_id}, run),
+                        daemon=True
+                    )
+                    thread.start()
+                    running[run.id] = (run, thread)
+        except Exception as e:
+            logging.error(f"Scrape worker loop failed: {e}")
+        time.sleep(WORKER_POLL_SECONDS)
+
+
+if __name__ == '__main__':
+    main()
@@ -13,7 +13,14 @@ import json
 import time
 import os
 import logging
-from queue import Queue
+import copy
+import threading
+from contextlib import contextmanager
+from queue import Queue, Empty
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer)
 
@@ -27,6 +34,99 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+SELENIUM_URL = os.getenv('SELENIUM_URL', 'http://selenium:4444/wd/hub')
+# Parallel WebDriver sessions per scrape; the Selenium node must allow one more (SE_NODE_MAX_SESSIONS) for link_resolver
+SCRAPER_SESSIONS = int(os.getenv('SCRAPER_SESSIONS', '1'))
+JOBS_PER_PAGE = 25  # LinkedIn's `start` offset step
+# Incremental mode: stop paginating a location after this many known postings in a row
+INCREMENTAL_STOP_AFTER_KNOWN = int(os.getenv('INCREMENTAL_STOP_AFTER_KNOWN', '10'))
+# Upper bounds for the condition-based waits; they return as soon as the DOM is ready
+SCRAPER_PAGE_TIMEOUT = float(os.getenv('SCRAPER_PAGE_TIMEOUT', '100'))  # Job list of a fresh page
+SCRAPER_WAIT_TIMEOUT = float(os.getenv('SCRAPER_WAIT_TIMEOUT', '5'))  # Detail pane, new tabs, page switches
+SCRAPER_POLL_INTERVAL = float(os.getenv('SCRAPER_POLL_INTERVAL', '0.1'))
+
+# HTTP backend: LinkedIn's public guest endpoints (overridable for the offline stand-in server)
+LINKEDIN_BASE_URL = os.getenv('LINKEDIN_BASE_URL', 'https://www.linkedin.com')
+HTTP_SCRAPER_CONCURRENCY = int(os.getenv('HTTP_SCRAPER_CONCURRENCY', '4'))  # Parallel job-detail requests
+HTTP_SCRAPER_TIMEOUT = float(os.getenv('HTTP_SCRAPER_TIMEOUT', '15'))
+
+# Parse the detail pane with lxml when it is installed (much faster than html.parser)
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+# Returns only the job-detail pane instead of the whole (multi-MB) page
+DETAIL_PANE_SCRIPT = """
+const pane = document.querySelector(
+    '.jobs-search__job-details--wrapper, .jobs-search__job-details--container, .jobs-details'
+);
+return (pane || document.body).outerHTML;
+"""
+
+# Only one session may run the interactive login when no cookie file exists yet
+_login_lock = threading.Lock()
+
+
+def clean_description(element) -> str:
+    """Convert a BeautifulSoup element of a job description into markdown-ish text."""
+    if isinstance(element, NavigableString):
+        return str(element).strip()
+
+    if not element.name:
+        return ""
+
+    text_output = []
+
+    # Handle headings with markdown
+    if element.name in ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']:
+        level = int(element.name[1])
+        heading_text = element.get_text(strip=True)
+        return f"\n\n{'#' * level} {heading_text}\n"
+
+    # Handle paragraphs
+    if element.name == 'p':
+        inner_text = ''.join(clean_description(child) for child in element.contents)
+        return f"\n{inner_text.strip()}\n"
+
+    # Handle line breaks
+    if element.name == 'br':
+        return "\n"
+
+    # Handle list items
+    if element.name == 'li':
+        item_text = element.get_text(strip=True)
+        return f"\n- {item_text}"
+
+    # Handle unordered lists
+    if element.name == 'ul':
+        items = ''.join(clean_description(child) for child in element.contents)
+        return f"{items}\n"
+
+    # Handle ordered lists
+    if element.name == 'ol':
+        items_text = []
+        for idx, child in enumerate(element.find_all('li', recursive=False), 1):
+            items_text.append(f"\n{idx}. {child.get_text(strip=True)}")
+        return ''.join(items_text) + "\n"
+
+    # Handle bold/strong with markdown
+    if element.name in ['strong', 'b']:
+        inner_text = element.get_text(strip=True)
+        return f" **{inner_text}** "
+
+    # Handle italic/emphasis with markdown
+    if element.name in ['em', 'i']:
+        inner_text = element.get_text(strip=True)
+        return f" *{inner_text}* "
+
+    # Recursively process children for other elements
+    for child in element.contents:
+        text_output.append(clean_description(child))
+
+    return ''.join(filter(None, text_output))
+
 
 class LinkedInScraper:
     """Scrape LinkedIn job listings with flexible filtering."""
@@ -35,6 +135,14 @@ class LinkedInScraper:
     DATE_MAP = {"past month": 2592000, "past week": 604800, "past 24 hours": 86400}
     EXP_LEVEL_MAP = {"internship": 1, "entry level": 2, "associate": 3, "mid-senior level": 4, "director": 5, "executive": 6}
     JOB_TYPE_MAP = {"full-time": "F", "part-time": "P", "contract": "C", "temporary": "T", "other": "O", "internship": "I"}
+
+    # Precompiled selectors for the job-detail pane
+    COMPANY_CLASS = re.compile(r'company-name')
+    TITLE_CLASS = re.compile(r't-24')
+    DESCRIPTION_CLASS = re.compile(r'jobs-description-content__text')
+    LOCATION_SELECTOR = 'span[dir*="ltr"] > span[class*="tvm__text"]'
+    JOB_ID_PATTERN = re.compile(r'(?:currentJobId=|/jobs/view/)(\d+)')
+    SEARCH_URL = "https://www.linkedin.com/jobs/search/?"
     
     def __init__(self,
                  keywords: str,
@@ -44,7 +152,12 @@ class LinkedInScraper:
                  exp_level: Union[List[str], str] = None,
                  job_type: Union[List[str], str] = None,
                  pages: int = 1,
-                 stop_callback=None):
+                 stop_callback=None,
+                 known_callback=None,
+                 sessions: int = None,
+                 incremental: bool = False,
+                 high_water_mark: int = None,
+                 stop_after_known: int = None):
 
         self.keywords = keywords
         self.locations = locations if isinstance(locations, list) else [locations]
@@ -56,6 +169,19 @@ class LinkedInScraper:
         self.driver = None
         self.total_jobs_scraped = 0
         self.stop_callback = stop_callback or (lambda: False)
+        # Returns True for application links we already have, so they are never queued
+        self.known_callback = known_callback or (lambda link: False)
+        self.total_duplicates_skipped = 0
+        self.sessions = max(1, sessions or SCRAPER_SESSIONS)
+        # Incremental mode: newest postings first, skip everything up to the last run's
+        # newest job id and stop a location once a run of known postings is reached
+        self.incremental = incremental
+        self.high_water_mark = high_water_mark
+        self.stop_after_known = stop_after_known or INCREMENTAL_STOP_AFTER_KNOWN
+        self.max_job_id_seen = None  # Becomes the next high-water mark
+        self.reached_known = False
+        self._consecutive_known = 0
+        self._timings = {}  # step -> seconds spent, reset for every page
 
         logger.info(f"Initializing scraper for keyword '{keywords}' in {len(self.locations)} location(s)")
         self._validate_input()
@@ -92,8 +218,8 @@ class LinkedInScraper:
         
         logger.info("Input validation passed")
     
-    def _build_url(self, location: str) -> str:
-        """Build LinkedIn search URL with filters."""
+    def _build_url(self, location: str, page_num: int = 1) -> str:
+        """Build LinkedIn search URL with filters. Pages after the first are addressed by offset."""
         params = [f"keywords={self.keywords}", f"location={location}"]
         
         if self.distance:
@@ -109,14 +235,21 @@ class LinkedInScraper:
         if self.job_type:
             job_codes = ",".join(self.JOB_TYPE_MAP[jt.lower()] for jt in self.job_type)
             params.append(f"f_JT={job_codes}")
+
+        if self.incremental:
+            params.append("sortBy=DD")  # Most recent first
+
+        if page_num > 1:
+            params.append(f"start={(page_num - 1) * JOBS_PER_PAGE}")
         
-        return "https://www.linkedin.com/jobs/search/?" + "&".join(params)
+        return self.SEARCH_URL + "&".join(params)
     
     def _load_cookies(self, filename='linkedin_cookies.json'):
         """Load cookies or perform manual login."""
-        if not os.path.exists(filename):
-            logger.info("No cookies found, initiating manual login...")
-            self._login_manual(filename)
+        with _login_lock:
+            if not os.path.exists(filename):
+                logger.info("No cookies found, initiating manual login...")
+                self._login_manual(filename)
         
         try:
             with open(filename, 'r') as f:
@@ -157,106 +290,123 @@ class LinkedInScraper:
             logger.error("Login timeout exceeded (180s)")
             raise TimeoutError("Login timeout exceeded (180s)")
     
+    def _wait(self, timeout: float = None) -> WebDriverWait:
+        return WebDriverWait(self.driver, timeout or SCRAPER_WAIT_TIMEOUT, poll_frequency=SCRAPER_POLL_INTERVAL)
+
+    @contextmanager
+    def _timed(self, step: str):
+        """Add the time spent in the block to this page's timing of `step`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._timings[step] = self._timings.get(step, 0.0) + time.perf_counter() - start
+
+    def _log_timings(self, location: str, page_num: int):
+        if self._timings:
+            steps = ", ".join(f"{step} {seconds:.2f}s" for step, seconds in self._timings.items())
+            logger.info(f"[{location}] Page {page_num} timings: {steps}")
+
+    def _wait_for_stable_count(self, css_selector: str, timeout: float = None) -> list:
+        """Wait until at least one element matches and the count stops changing between polls."""
+        last = {'count': -1}
+
+        def stable(driver):
+            elements = driver.find_elements(By.CSS_SELECTOR, css_selector)
+            count, last['count'] = last['count'], len(elements)
+            return elements if elements and len(elements) == count else False
+
+        try:
+            return self._wait(timeout).until(stable)
+        except Exception:
+            # Still growing at the timeout; take what is there
+            return self.driver.find_elements(By.CSS_SELECTOR, css_selector)
+
+    def _current_title(self) -> str:
+        try:
+            return self.driver.find_element(By.CSS_SELECTOR, 'h1.t-24').text
+        except Exception:
+            return None
+
+    @staticmethod
+    def _job_url(job_id) -> str:
+        """Canonical LinkedIn URL of a job id; this is the job's identity key."""
+        return f"https://www.linkedin.com/jobs/view/{job_id}/"
+
+    def _linkedin_job_url(self) -> str:
+        """Canonical LinkedIn URL of the open job."""
+        match = self.JOB_ID_PATTERN.search(self.driver.current_url)
+        return self._job_url(match.group(1)) if match else None
+
+    def _reset_known_run(self):
+        self._consecutive_known = 0
+        self.reached_known = False
+
+    def _is_known_id(self, job_id) -> bool:
+        """
+        True if the job was scraped before: at or below the high-water mark (incremental
+        mode) or a known link. Unknown jobs are claimed via known_callback, so don't
+        check them again after extraction. Sets `reached_known` after a long enough run.
+        """
+        numeric = int(job_id)
+        self.max_job_id_seen = max(self.max_job_id_seen or 0, numeric)
+        if self.incremental and self.high_water_mark and numeric <= self.high_water_mark:
+            known = True
+        else:
+            known = bool(self.known_callback(self._job_url(job_id)))
+        self._consecutive_known = self._consecutive_known + 1 if known else 0
+        if self.incremental and self._consecutive_known >= self.stop_after_known:
+            self.reached_known = True
+        return known
+
     def _get_application_link(self) -> str:
-        """Extract application link from job posting."""
+        """Extract application link from job posting (clicks through to external apply pages)."""
         try: 
             if self.driver.find_element(By.XPATH, "//button[contains(@aria-label,'Easy Apply to')][1]"): 
-                time.sleep(0.5)
                 return self.driver.current_url
         except: 
             pass 
         
         try:
-            apply_button = self.driver.find_element(By.XPATH, "//button[contains(@id,'jobs-apply-button-id')][1]")
-            apply_button.click()
-            time.sleep(0.4)
-            
-            self.driver.switch_to.window(self.driver.window_handles[1])
-            link = self.driver.current_url
-            self.driver.close()
-            self.driver.switch_to.window(self.driver.window_handles[0])
+            with self._timed('apply_link'):
+                apply_button = self.driver.find_element(By.XPATH, "//button[contains(@id,'jobs-apply-button-id')][1]")
+                handles = len(self.driver.window_handles)
+                apply_button.click()
+                # The external apply page opens in a new tab; wait for it and for its URL
+                self._wait().until(EC.number_of_windows_to_be(handles + 1))
+                
+                self.driver.switch_to.window(self.driver.window_handles[-1])
+                self._wait().until(lambda driver: driver.current_url not in ('', 'about:blank'))
+                link = self.driver.current_url
+                self.driver.close()
+                self.driver.switch_to.window(self.driver.window_handles[0])
             return link
         except:
+            # Don't leave a half-opened tab focused for the next job
+            if len(self.driver.window_handles) > 1:
+                self.driver.switch_to.window(self.driver.window_handles[0])
             return "Not Available"
         
         
     def extract_info(self):                    
 
-        page_soup = BeautifulSoup(self.driver.page_source, 'html.parser')
+        # One script call for the detail pane's outerHTML, parsed on its own
+        pane_soup = BeautifulSoup(self.driver.execute_script(DETAIL_PANE_SCRIPT), HTML_PARSER)
 
-        company_div = page_soup.find('div', class_=re.compile(r'company-name'))
+        company_div = pane_soup.find('div', class_=self.COMPANY_CLASS)
         company_link = company_div.find('a') if company_div else None
         company_text = company_link.get_text(strip=True) if company_link else "Not Available"
 
-        try:
-            location_elem = self.driver.find_element(By.XPATH, "//span[contains(@dir, 'ltr')]/span[contains(@class,'tvm__text')][1]")
-            location_text = location_elem.text
-        except:
-            location_text = "Not Available"
+        location_elem = pane_soup.select_one(self.LOCATION_SELECTOR)
+        location_text = location_elem.get_text(strip=True) if location_elem else "Not Available"
 
-        title_elem = page_soup.find('h1', class_=re.compile(r't-24'))
+        title_elem = pane_soup.find('h1', class_=self.TITLE_CLASS)
         job_title = title_elem.get_text(strip=True) if title_elem else "Not Available"
 
-        def _clean_description(element):
-            if isinstance(element, NavigableString):
-                return str(element).strip()
-
-            if not element.name:
-                return ""
-
-            text_output = []
-
-            # Handle headings with markdown
-            if element.name in ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']:
-                level = int(element.name[1])
-                heading_text = element.get_text(strip=True)
-                return f"\n\n{'#' * level} {heading_text}\n"
-
-            # Handle paragraphs
-            if element.name == 'p':
-                inner_text = ''.join(_clean_description(child) for child in element.contents)
-                return f"\n{inner_text.strip()}\n"
-
-            # Handle line breaks
-            if element.name == 'br':
-                return "\n"
-
-            # Handle list items
-            if element.name == 'li':
-                item_text = element.get_text(strip=True)
-                return f"\n- {item_text}"
-
-            # Handle unordered lists
-            if element.name == 'ul':
-                items = ''.join(_clean_description(child) for child in element.contents)
-                return f"{items}\n"
-
-            # Handle ordered lists
-            if element.name == 'ol':
-                items_text = []
-                for idx, child in enumerate(element.find_all('li', recursive=False), 1):
-                    items_text.append(f"\n{idx}. {child.get_text(strip=True)}")
-                return ''.join(items_text) + "\n"
-
-            # Handle bold/strong with markdown
-            if element.name in ['strong', 'b']:
-                inner_text = element.get_text(strip=True)
-                return f" **{inner_text}** "
-
-            # Handle italic/emphasis with markdown
-            if element.name in ['em', 'i']:
-                inner_text = element.get_text(strip=True)
-                return f" *{inner_text}* "
-
-            # Recursively process children for other elements
-            for child in element.contents:
-                text_output.append(_clean_description(child))
-
-            return ''.join(filter(None, text_output))
-                        
-        desc_elem = page_soup.find('div', class_=re.compile(r'jobs-description-content__text'))
-        description = "\n".join([_clean_description(main_el) for main_el in desc_elem]).strip() if desc_elem else "Not Available"
-        app_link = self._get_application_link()
+        desc_elem = pane_soup.find('div', class_=self.DESCRIPTION_CLASS)
+        description = "\n".join([clean_description(main_el) for main_el in desc_elem]).strip() if desc_elem else "Not Available"
+        # The external apply URL is resolved later, and only for jobs worth it (see link_resolver.py)
+        app_link = self._linkedin_job_url()
                 
         data = {
             'title': job_title,
@@ -269,6 +419,114 @@ class LinkedInScraper:
         return data
             
             
+    def _create_driver(self):
+        """Open one remote Chrome session on the Selenium server."""
+        opts = webdriver.ChromeOptions()
+        opts.add_argument('--disable-blink-features=AutomationControlled')
+        opts.add_experimental_option('excludeSwitches', ['enable-automation'])
+        opts.add_experimental_option('useAutomationExtension', False)
+        opts.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36')
+        opts.add_argument("--start-maximized")  
+        return webdriver.Remote(
+            command_executor=SELENIUM_URL,
+            options=opts
+        )
+
+    def _finish(self, jobs_data) -> Union[None,pd.DataFrame]:
+        """Log the totals and, when scraping into a list, return the de-duplicated DataFrame."""
+        logger.info("=" * 60)
+        logger.info(f"Scraping complete! Total jobs scraped: {self.total_jobs_scraped}, known duplicates skipped: {self.total_duplicates_skipped}")
+        logger.info("=" * 60)
+            
+        if type(jobs_data) == list: 
+            df = pd.DataFrame(jobs_data)
+            prev_len = len(df)
+            df.drop_duplicates(subset=["company", "title"], inplace=True)
+            logger.info(f"{prev_len-len(df)} duplicate instances was/were detected and deleted.")
+
+            return df
+
+    def _scrape_parallel(self, jobs_data: Union[Queue,List[dict]]):
+        """
+        Shard (location, page) pairs across `self.sessions` WebDriver sessions.
+        Every session loads the cookies once and then takes pages from a shared
+        task queue, writing into the same `jobs_data`. Tasks are ordered page by
+        page across locations, so a location that runs out of pages is usually
+        known before its later pages are picked up and those are skipped.
+        """
+        tasks = Queue()
+        for page_num in range(1, self.pages + 1):
+            for location in self.locations:
+                tasks.put((location, page_num))
+
+        exhausted = set()  # Locations without a next page
+        lock = threading.Lock()
+        sessions = []
+        errors = []
+
+        def run_session(session_idx):
+            # Each session is a shallow copy with its own driver and counters
+            session = copy.copy(self)
+            session.total_jobs_scraped = 0
+            session.total_duplicates_skipped = 0
+            session.driver = None
+            with lock:
+                sessions.append(session)
+            try:
+                session.driver = session._create_driver()
+                session._load_cookies()
+                while not self.stop_callback():
+                    try:
+                        location, page_num = tasks.get_nowait()
+                    except Empty:
+                        break
+                    with lock:
+                        if location in exhausted:
+                            continue
+                    logger.info(f"[session {session_idx}] Scraping {location} page {page_num}/{self.pages}")
+                    try:
+                        session.driver.get(self._build_url(location, page_num))
+                        session._reset_known_run()
+                        session._scrape_page(jobs_data, location, page_num)
+                        next_btn = session.driver.find_elements(By.XPATH, "//button[span[text()='Next']]")
+                        if session.reached_known:
+                            with lock:
+                                exhausted.add(location)
+                        elif not next_btn or not next_btn[0].is_enabled():
+                            logger.info(f"[{location}] No more pages available")
+                            with lock:
+                                exhausted.add(location)
+                    except Exception as e:
+                        logger.warning(f"[{location}] Error on page {page_num}: {e}")
+                        with lock:
+                            exhausted.add(location)
+                if self.stop_callback():
+                    logger.info(f"[session {session_idx}] Scraping stopped by user request")
+            except Exception as e:
+                logger.error(f"[session {session_idx}] LinkedIn scraping failed: {e}")
+                with lock:
+                    errors.append(e)
+            finally:
+                if session.driver is not None:
+                    session.driver.quit()
+                    logger.info(f"[session {session_idx}] Browser closed")
+
+        n_sessions = min(self.sessions, tasks.qsize())
+        logger.info(f"Scraping {tasks.qsize()} page(s) with {n_sessions} parallel browser sessions")
+        threads = [threading.Thread(target=run_session, args=(i,), daemon=True) for i in range(1, n_sessions + 1)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.total_jobs_scraped = sum(s.total_jobs_scraped for s in sessions)
+        self.total_duplicates_skipped = sum(s.total_duplicates_skipped for s in sessions)
+        seen = [s.max_job_id_seen for s in sessions if s.max_job_id_seen]
+        self.max_job_id_seen = max(seen) if seen else None
+
+        if errors and len(errors) == n_sessions:
+            raise RuntimeError(f"LinkedIn scraping failed with exception {errors[0]}")
+
     def _scrape_page(self, jobs_data: Union[Queue,List[dict]], location: str, page_num: int):
         """Extract job listings from current page."""
         
@@ -276,19 +534,22 @@ class LinkedInScraper:
         # First wait until the website loads
         ######################################
         
-        # wait until the page is loaded and check how many jobs there are.
-        WebDriverWait(self.driver, 100).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, 'li.scaffold-layout__list-item'))
-        )
-        time.sleep(1)
-        items = self.driver.find_elements(By.CSS_SELECTOR, 'li.scaffold-layout__list-item')
+        self._timings = {}
+
+        # wait until the page is loaded and the number of listings stops changing
+        with self._timed('list_load'):
+            WebDriverWait(self.driver, SCRAPER_PAGE_TIMEOUT, poll_frequency=SCRAPER_POLL_INTERVAL).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, 'li.scaffold-layout__list-item'))
+            )
+            items = self._wait_for_stable_count('li.scaffold-layout__list-item')
         logger.info(f"[{location}] Page {page_num}: Found {len(items)} job listings")
         
         # Scroll to bottom of job list to load all lazy-loaded items
         # This ensures all jobs are in the DOM before we start clicking
-        job_list_container = self.driver.find_element(By.CSS_SELECTOR, 'li.scaffold-layout__list-item')
-        self.driver.execute_script("arguments[0].scrollTo(0, arguments[0].scrollHeight);", job_list_container)
-        time.sleep(1)  # Wait for any lazy-loaded items to appear
+        with self._timed('scroll'):
+            job_list_container = self.driver.find_element(By.CSS_SELECTOR, 'li.scaffold-layout__list-item')
+            self.driver.execute_script("arguments[0].scrollTo(0, arguments[0].scrollHeight);", job_list_container)
+            items = self._wait_for_stable_count('li.scaffold-layout__list-item')
    
    
         #########################################################################
@@ -304,6 +565,17 @@ class LinkedInScraper:
             if self.stop_callback():
                 logger.info("Scraping stopped by user request")
                 return
+
+            # Known postings are skipped without clicking into them
+            job_id = item.get_attribute('data-occludable-job-id')
+            if job_id and self._is_known_id(job_id):
+                self.total_duplicates_skipped += 1
+                if old_title is None:
+                    old_title = self._current_title()  # the pane still shows the preloaded job
+                if self.reached_known:
+                    logger.info(f"[{location}] {self._consecutive_known} known postings in a row, stopping here")
+                    break
+                continue
             
             # Close warning dialogs
             try:
@@ -317,18 +589,18 @@ class LinkedInScraper:
             # introduced this block to have better loading behavior and make sure that changes occured
             # also leads to better error handling
             try: 
-                if idx != 1: 
-                    WebDriverWait(self.driver, 5).until(
-                        lambda driver: driver.find_element(By.CSS_SELECTOR, 'h1.t-24').text == old_title
-                    )
-                    item.click()
-                    time.sleep(0.1)
-                    item.click()
-                    WebDriverWait(self.driver, 5).until(
-                        lambda driver: driver.find_element(By.CSS_SELECTOR, 'h1.t-24').text != old_title
-                    )
-                    # title has changed update for next iter
-                old_title = self.driver.find_element(By.CSS_SELECTOR, 'h1.t-24').text   
+                with self._timed('open_job'):
+                    if idx != 1: 
+                        self._wait().until(lambda driver: self._current_title() == old_title)
+                        item.click()
+                        try:
+                            # usually one click is enough; re-click only if the pane did not switch
+                            self._wait(SCRAPER_POLL_INTERVAL * 5).until(lambda driver: self._current_title() != old_title)
+                        except Exception:
+                            item.click()
+                            self._wait().until(lambda driver: self._current_title() != old_title)
+                        # title has changed update for next iter
+                    old_title = self.driver.find_element(By.CSS_SELECTOR, 'h1.t-24').text   
             except: 
                 continue
             
@@ -336,22 +608,33 @@ class LinkedInScraper:
             # extract info
             ###################
             try: 
-                data = self.extract_info()
+                with self._timed('extract'):
+                    data = self.extract_info()
             except Exception as e:
                 logger.warning(f"[{location}] Failed to scrape job {idx}/{len(items)}: {e}")
                 continue
                 
             # we id jobs through their application links. If they are not found we cannot use it
             if data["application_link"] is None: continue
+
+            # drop duplicates here instead of letting every rating worker query the DB
+            # (only needed when the list item had no job id to check before clicking)
+            if not job_id and self.known_callback(data["application_link"]):
+                self.total_duplicates_skipped += 1
+                logger.info(f"[{location}] Job {idx}/{len(items)}: skipped known posting {data['title']} @ {data['company']}")
+                continue
             
             if is_list:
                 jobs_data.append(data)
             else:
                 # Putting into queue
-                jobs_data.put(data)
+                with self._timed('enqueue'):
+                    jobs_data.put(data)
                 logger.info(f"[{location}] Job {idx}/{len(items)}: {data['title']} @ {data['company']} (queue size: ~{jobs_data.qsize()})")
 
-            self.total_jobs_scraped += 1   
+            self.total_jobs_scraped += 1
+
+        self._log_timings(location, page_num)   
             
     
     def scrape_jobs(self, queue:Queue=None) -> Union[None,pd.DataFrame]:
@@ -361,22 +644,17 @@ class LinkedInScraper:
         logger.info("Starting LinkedIn job scraping")
         logger.info("=" * 60)
 
-        opts = webdriver.ChromeOptions()
-        opts.add_argument('--disable-blink-features=AutomationControlled')
-        opts.add_experimental_option('excludeSwitches', ['enable-automation'])
-        opts.add_experimental_option('useAutomationExtension', False)
-        opts.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36')
-        opts.add_argument("--start-maximized")  
-        self.driver = webdriver.Remote(
-            command_executor='http://selenium:4444/wd/hub',
-            options=opts
-        )
+        jobs_data = [] if not queue else queue
+
+        if self.sessions > 1:
+            self._scrape_parallel(jobs_data)
+            return self._finish(jobs_data)
+
+        self.driver = self._create_driver()
 
         try:
             self._load_cookies()
 
-            jobs_data = [] if not queue else queue
-
             for loc_idx, location in enumerate(self.locations, 1):
                 # Check if stop was requested
                 if self.stop_callback():
@@ -385,6 +663,7 @@ class LinkedInScraper:
 
                 logger.info(f"Scraping location {loc_idx}/{len(self.locations)}: {location}")
                 self.driver.get(self._build_url(location))
+                self._reset_known_run()
 
                 page_num = 1
                 while page_num <= self.pages:
@@ -395,13 +674,19 @@ class LinkedInScraper:
 
                     try:
                         self._scrape_page(jobs_data, location, page_num)
+                        if self.reached_known:
+                            break
 
                         next_btn = self.driver.find_element(By.XPATH, "//button[span[text()='Next']]")
                         if not next_btn.is_enabled():
                             logger.info(f"[{location}] No more pages available")
                             break
+                        # wait for the old listings to be replaced instead of sleeping
+                        first_item = self.driver.find_element(By.CSS_SELECTOR, 'li.scaffold-layout__list-item')
                         next_btn.click()
-                        time.sleep(2)
+                        started = time.perf_counter()
+                        self._wait().until(EC.staleness_of(first_item))
+                        logger.info(f"[{location}] Next page loaded in {time.perf_counter() - started:.2f}s")
                         page_num += 1
                     except Exception as e:
                         logger.warning(f"[{location}] Error on page {page_num}: {e}")
@@ -414,17 +699,7 @@ class LinkedInScraper:
 
                 logger.info(f"Completed {location} - Total jobs scraped so far: {self.total_jobs_scraped}\n")
 
-            logger.info("=" * 60)
-            logger.info(f"Scraping complete! Total jobs scraped: {self.total_jobs_scraped}")
-            logger.info("=" * 60)
-                
-            if type(jobs_data) == list: 
-                df = pd.DataFrame(jobs_data)
-                prev_len = len(df)
-                df.drop_duplicates(subset=["company", "title"], inplace=True)
-                logger.info(f"{prev_len-len(df)} duplicate instances was/were detected and deleted.")
-
-                return df
+            return self._finish(jobs_data)
 
         except Exception as e:
             logger.error(f"LinkedIn scraping failed: {e}")
@@ -433,6 +708,207 @@ class LinkedInScraper:
         finally:
             self.driver.quit()
             logger.info("Browser closed")
+
+
+class ApplyLinkResolver(LinkedInScraper):
+    """
+    Single browser session that opens already scraped LinkedIn job pages and
+    reads their external application URL. Easy Apply jobs resolve to the
+    LinkedIn URL itself. Use as a context manager.
+    """
+
+    def __init__(self, cookie_file='linkedin_cookies.json'):
+        self.driver = None
+        self.cookie_file = cookie_file
+        self._timings = {}
+
+    def __enter__(self):
+        # Never fall back to the interactive login from a background thread or request
+        if not os.path.exists(self.cookie_file):
+            raise RuntimeError("No saved LinkedIn cookies, run a scrape first")
+        self.driver = self._create_driver()
+        try:
+            self._load_cookies(self.cookie_file)
+        except Exception:
+            self.driver.quit()
+            raise
+        return self
+
+    def __exit__(self, *args):
+        if self.driver is not None:
+            self.driver.quit()
+            self.driver = None
+
+    def resolve(self, job_url: str) -> str:
+        """External application URL of the job at `job_url`, or "Not Available"."""
+        self.driver.get(job_url)
+        try:
+            self._wait(SCRAPER_PAGE_TIMEOUT).until(EC.presence_of_element_located(
+                (By.XPATH, "//button[contains(@id,'jobs-apply-button-id') or contains(@aria-label,'Easy Apply to')]")
+            ))
+        except Exception:
+            return "Not Available"
+        link = self._get_application_link()
+        # Easy Apply returns the page URL; store the canonical job URL instead
+        return job_url if link == self.driver.current_url else link
+
+
+class HttpLinkedInScraper(LinkedInScraper):
+    """
+    Browser-less backend. Fetches LinkedIn's guest search and job-posting
+    endpoints over a pooled HTTP session instead of rendering pages in
+    Selenium. Same constructor, filters (`_build_url`) and description
+    conversion (`clean_description`) as the browser scraper, and the same
+    output: dicts keyed by the canonical LinkedIn job URL.
+    """
+
+    BASE_URL = LINKEDIN_BASE_URL
+    JOB_URN_PATTERN = re.compile(r'urn:li:jobPosting:(\d+)')
+
+    @property
+    def SEARCH_URL(self):
+        return self.BASE_URL + "/jobs-guest/jobs/api/seeMoreJobPostings/search?"
+
+    def _create_session(self) -> requests.Session:
+        session = requests.Session()
+        retries = Retry(total=3, backoff_factor=1, status_forcelist=[429, 500, 502, 503, 504])
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=HTTP_SCRAPER_CONCURRENCY, max_retries=retries)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.headers['User-Agent'] = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+        return session
+
+    def _get(self, url: str) -> str:
+        response = self.session.get(url, timeout=HTTP_SCRAPER_TIMEOUT)
+        response.raise_for_status()
+        return response.text
+
+    def _job_ids(self, html: str) -> List[str]:
+        """Job ids of the cards on one search result page, in page order."""
+        soup = BeautifulSoup(html, HTML_PARSER)
+        ids = []
+        for card in soup.select('[data-entity-urn]'):
+            match = self.JOB_URN_PATTERN.search(card['data-entity-urn'])
+            if match and match.group(1) not in ids:
+                ids.append(match.group(1))
+        return ids
+
+    def extract_info(self, job_id: str) -> dict:
+        """Fetch and parse one job posting."""
+        soup = BeautifulSoup(self._get(f"{self.BASE_URL}/jobs-guest/jobs/api/jobPosting/{job_id}"), HTML_PARSER)
+
+        def text(selector):
+            elem = soup.select_one(selector)
+            return elem.get_text(strip=True) if elem else "Not Available"
+
+        desc_elem = soup.select_one('div.show-more-less-html__markup')
+        description = "\n".join([clean_description(main_el) for main_el in desc_elem]).strip() if desc_elem else "Not Available"
+
+        return {
+            'title': text('.top-card-layout__title, .topcard__title'),
+            'company': text('a.topcard__org-name-link, .topcard__flavor'),
+            'location': text('.topcard__flavor--bullet'),
+            'description': description,
+            'application_link': self._job_url(job_id)
+        }
+
+    def _scrape_page(self, jobs_data: Union[Queue,List[dict]], location: str, page_num: int, start: int = 0) -> int:
+        """Scrape one result page starting at offset `start`. Returns the number of job cards on it."""
+        self._timings = {}
+        with self._timed('search'):
+            job_ids = self._job_ids(self._get(self._build_url(location) + f"&start={start}"))
+        logger.info(f"[{location}] Page {page_num}: Found {len(job_ids)} job listings")
+
+        # Known postings are dropped before their detail page is fetched
+        new_ids = []
+        for job_id in job_ids:
+            if self._is_known_id(job_id):
+                self.total_duplicates_skipped += 1
+                if self.reached_known:
+                    logger.info(f"[{location}] {self._consecutive_known} known postings in a row, stopping here")
+                    break
+            else:
+                new_ids.append(job_id)
+
+        is_list = type(jobs_data) == list
+        with ThreadPoolExecutor(max_workers=HTTP_SCRAPER_CONCURRENCY) as executor:
+            futures = {executor.submit(self.extract_info, job_id): idx for idx, job_id in enumerate(new_ids, 1)}
+            with self._timed('details'):
+                for future in as_completed(futures):
+                    idx = futures[future]
+                    if self.stop_callback():
+                        logger.info("Scraping stopped by user request")
+                        for pending in futures:
+                            pending.cancel()
+                        break
+                    try:
+                        data = future.result()
+                    except Exception as e:
+                        logger.warning(f"[{location}] Failed to scrape job {idx}/{len(new_ids)}: {e}")
+                        continue
+
+                    if is_list:
+                        jobs_data.append(data)
+                    else:
+                        jobs_data.put(data)
+                        logger.info(f"[{location}] Job {idx}/{len(new_ids)}: {data['title']} @ {data['company']} (queue size: ~{jobs_data.qsize()})")
+                    self.total_jobs_scraped += 1
+
+        self._log_timings(location, page_num)
+        return len(job_ids)
+
+    def scrape_jobs(self, queue:Queue=None) -> Union[None,pd.DataFrame]:
+        """Same contract as LinkedInScraper.scrape_jobs, without a browser."""
+        logger.info("=" * 60)
+        logger.info("Starting LinkedIn job scraping (HTTP backend)")
+        logger.info("=" * 60)
+
+        jobs_data = [] if not queue else queue
+        self.session = self._create_session()
+        try:
+            for loc_idx, location in enumerate(self.locations, 1):
+                if self.stop_callback():
+                    logger.info("Scraping stopped by user request")
+                    break
+
+                logger.info(f"Scraping location {loc_idx}/{len(self.locations)}: {location}")
+                self._reset_known_run()
+                start = 0
+                for page_num in range(1, self.pages + 1):
+                    if self.stop_callback():
+                        break
+                    # The guest endpoint's page size varies, so page by the cards actually returned
+                    found = self._scrape_page(jobs_data, location, page_num, start)
+                    if found == 0:
+                        logger.info(f"[{location}] No more pages available")
+                        break
+                    if self.reached_known:
+                        break
+                    start += found
+
+                logger.info(f"Completed {location} - Total jobs scraped so far: {self.total_jobs_scraped}\n")
+
+            return self._finish(jobs_data)
+
+        except Exception as e:
+            logger.error(f"LinkedIn scraping failed: {e}")
+            raise RuntimeError(f"LinkedIn scraping failed with exception {e}")
+
+        finally:
+            self.session.close()
+
+
+SCRAPER_BACKENDS = {
+    'browser': LinkedInScraper,
+    'http': HttpLinkedInScraper,
+}
+
+
+def create_scraper(backend: str = 'browser', **kwargs) -> LinkedInScraper:
+    """Scraper for a SearchCriteria's `scraper_backend` ('browser' or 'http')."""
+    if backend not in SCRAPER_BACKENDS:
+        raise ValueError(f"Unknown scraper backend '{backend}'. Must be one of: {list(SCRAPER_BACKENDS)}")
+    return SCRAPER_BACKENDS[backend](**kwargs)
     
 #-------------------------
 ## scraping without login 
@@ -1,48 +1,167 @@
 import logging
 import os
-from models import db, SearchCriteria, Job, UserProfile
-from scrapers import LinkedInScraper
-from queue import Queue
-from concurrent.futures import ThreadPoolExecutor
+from models import db, SearchCriteria, Job, UserProfile, ParkedJob
+from scrapers import create_scraper
+from queue import Queue, Empty
 import threading
-from sqlalchemy.exc import IntegrityError
+import dataclasses
 import json
 
 from llama_cpp_scoring import CandidateEvaluator, LlamaCppConfig
+from score_cache import profile_fingerprint, score_cache_key, get_cached_score, store_score, prune_score_cache
+from scoring_pool import ScoringPool, SCORING_QUEUE_SIZE
+from prefilter import EmbeddingPrefilter, PREFILTER_ENABLED, PREFILTER_BATCH_SIZE
+from known_links import KnownLinks
+from job_writer import JobWriter
+from link_resolver import start_link_resolver
+from scrape_runs import scrape_runs
+from pending_scoring import (PendingScoringQueue, PENDING_SCORING_ENABLED, PENDING_SCORING_MAX_CLAIMS,
+                             remove_pending, release_pending)
+from worker_channel import submit_scrape_run
 
 
 # Setup component-specific loggers
 # worker_logger = logging.getLogger('workers')
 queue_logger = logging.getLogger('queue')
 
-# Global flag to interrupt scraping
-scraping_active = False
-
-def register_socketio_events(socketio, app):
-    """Register all SocketIO event handlers."""
+# Jobs failing for reasons other than server unavailability are parked this many
+# times before they are stored with a placeholder score
+SCORING_MAX_ATTEMPTS = int(os.getenv('SCORING_MAX_ATTEMPTS', '3'))
+
+
+def park_job(job_data, error, attempts, pending_id=None, search_criteria_id=None):
+    """Keep a job whose scoring failed so the next run can score it (needs app context)."""
+    parked = ParkedJob.query.filter_by(application_link=job_data['application_link']).first()
+    if parked is None:
+        parked = ParkedJob(application_link=job_data['application_link'])
+        db.session.add(parked)
+    # The run it was scraped for, so the next run saves it there and not under its own search
+    parked.job_data = json.dumps(dict(job_data, search_criteria_id=search_criteria_id))
+    parked.error = error
+    parked.attempts = attempts
+    remove_pending([pending_id])  # Moves from the scoring queue to the parking lot in one commit
+    db.session.commit()
+
+
+def requeue_parked_jobs(job_queue):
+    """Move all parked jobs back into the scoring queue (needs app context)."""
+    parked_jobs = ParkedJob.query.order_by(ParkedJob.parked_at).all()
+    for parked in parked_jobs:
+        job_data = json.loads(parked.job_data)
+        job_data['scoring_attempts'] = parked.attempts
+        if isinstance(job_queue, PendingScoringQueue):
+            # Durable queue: queue the job and drop the parked row in one commit
+            job_queue.add(job_data)
+            db.session.delete(parked)
+            db.session.commit()
+            job_queue.notify()
+        else:
+            # Queue first: a crash before the delete scores the job again instead of losing it
+            job_queue.put(job_data)
+            db.session.delete(parked)
+            db.session.commit()
+    if parked_jobs:
+        queue_logger.info(f"Re-queued {len(parked_jobs)} parked job(s) for scoring")
+
+def register_socketio_events(socketio, app, run_in_workers=False):
+    """
+    Register all SocketIO event handlers. With `run_in_workers` runs are queued
+    for standalone scrape workers (scrape_worker.py) instead of run in-process.
+    """
 
     @socketio.on('stop_scrape')
-    def handle_stop_scrape():
-        global scraping_active
-        scraping_active = False
-        socketio.emit('scrape_stopped', {'data': 'Scraping interrupted by user'}, namespace='/')
+    def handle_stop_scrape(json=None):
+        # Stop one run by id; without an id (older clients) stop every active run
+        run_id = (json or {}).get('run_id')
+        stopped = [run_id] if run_id and scrape_runs.stop(run_id) else ([] if run_id else scrape_runs.stop_all())
+        for stopped_id in stopped:
+            socketio.emit('scrape_stopped', {'data': 'Scraping interrupted by user', 'run_id': stopped_id}, namespace='/')
+
+    def run_scraping_task(data, run=None):
+        """Background task to run the scraper. `run` is created here unless the caller registered one."""
+        if run is None:
+            run = scrape_runs.create((data or {}).get('id'), trigger='scheduled')
+
+        # Wait for a free slot if the maximum number of runs is already scraping
+        if scrape_runs.is_full():
+            socketio.emit('log_message', {'data': f'Scrape run {run.id} queued, waiting for a free slot...'}, namespace='/')
+        if not scrape_runs.acquire(run):
+            scrape_runs.release(run, 'stopped')
+            return
+        socketio.emit('scrape_started', run.to_dict(), namespace='/')
+
+        try:
+            run_pipeline(data, run)
+        except Exception as e:
+            logging.error(f"Error in scraping pipeline: {e}")
+            run.error = run.error or str(e)
+            socketio.emit('scrape_error', {'data': str(e), 'run_id': run.id}, namespace='/')
+        finally:
+            # Always free the slot, whatever happened, so queued runs can start
+            status = 'failed' if run.error else ('stopped' if run.cancelled else 'finished')
+            scrape_runs.release(run, status, run.error)
 
-    def run_scraping_task(data):
-        """Background task to run the scraper."""
-        global scraping_active
-        scraping_active = True  # Set active flag for both manual and scheduled scrapes
+    def run_pipeline(data, run):
+        """Scrape -> (pre-filter) -> score -> save pipeline of one run."""
 
-        # Shared variable to pass search_criteria_id between threads
-        # We use a list so it can be modified inside nested functions
-        search_criteria_id_holder = [None]
+        # ===================================================================
+        # STEP 0: Create this run's SearchCriteria before any thread starts
+        # ===================================================================
+        # Workers and scraper get its id directly; if the template is missing
+        # nothing is started at all. A resume run only scores what an earlier
+        # process left in the durable queue; its jobs keep the search criteria
+        # of the run that scraped them.
+        resume = run.trigger == 'resume'
+        template_id = (data or {}).get('id')
+        search_criteria_id = None
+        if resume:
+            socketio.emit('log_message', {'data': 'Resuming scoring of pending jobs...'}, namespace='/')
+        else:
+            with app.app_context():
+                # Send initial confirmation that scraping started
+                socketio.emit('log_message', {'data': 'Scraping task started...'}, namespace='/')
+
+                # Validate that template ID is provided
+                if not template_id:
+                    run.error = 'No search criteria template ID provided'
+                    socketio.emit('scrape_error', {'data': run.error, 'run_id': run.id}, namespace='/')
+                    return
+
+                # Fetch the template
+                template = SearchCriteria.query.get(template_id)
+                if not template:
+                    run.error = 'Search criteria template not found'
+                    socketio.emit('scrape_error', {'data': run.error, 'run_id': run.id}, namespace='/')
+                    return
+
+                # Create a new run from the template (is_template=False)
+                search_criteria = SearchCriteria(
+                    keywords=template.keywords,
+                    locations=template.locations,
+                    distance_in_km=template.distance_in_km,
+                    date_posted=template.date_posted,
+                    exp_level=template.exp_level,
+                    job_type=template.job_type,
+                    pages=template.pages,
+                    scraper_backend=template.scraper_backend,
+                    incremental=template.incremental,
+                    is_template=False  # This is a run, not a template
+                )
+                db.session.add(search_criteria)
+                db.session.commit()
+                search_criteria_id = search_criteria.id
+
+            run.search_criteria_id = search_criteria_id
+            queue_logger.info(f"Created search criteria run with ID: {search_criteria_id}")
 
         # ===================================================================
         # STEP 1: Define the rating_worker function (runs in worker threads)
         # ===================================================================
-        def rating_worker(queue, worker_id):
+        def rating_worker(queue, worker_id, pool):
             """
             Worker function that processes jobs from the queue.
-            Runs in its own thread, continuously pulling and processing jobs.
+            Runs in its own thread (managed by the ScoringPool), continuously
+            pulling and processing jobs until the pool retires it.
             """
             # worker_logger.info(f"Worker {worker_id} started")
 
@@ -62,205 +181,242 @@ def register_socketio_events(socketio, app):
                     queue_logger.warning("No user profile found. Jobs will be assigned default score of 80.")
 
             # Create CandidateEvaluator ONCE per worker for efficient connection reuse
-            # This significantly improves performance for parallel processing
-            llama_config = LlamaCppConfig.from_env()
-            evaluator = CandidateEvaluator(config=llama_config)
-
-            while True:
-                job_data = queue.get()  # Blocks here waiting for a job
+            # This significantly improves performance for parallel processing.
+            # Each worker is pinned to its own llama.cpp slot so the CV/preferences
+            # prefix stays cached there and only the job text is processed per request.
+            evaluator = CandidateEvaluator(config=llama_config, slot_id=worker_id - 1)
+            fingerprint = profile_fingerprint(cv_text, preferences)
 
+            while not pool.should_retire(worker_id):
                 try:
-                    # Check for sentinel (stop signal)
-                    if job_data is None:
-                        # worker_logger.info(f"Worker {worker_id} received stop signal, shutting down")
-                        break  # Exit the loop, worker stops
+                    # Wake up regularly so the pool can scale this worker down
+                    job_data = queue.get(timeout=0.5)
+                except Empty:
+                    continue
 
+                pending_id = None
+                try:
                     # worker_logger.info(f"Worker {worker_id} picked up: {job_data['title']} @ {job_data['company']}")
 
-                    # Wait for search_criteria_id to be available
-                    # (The scraper thread will set this once it creates the SearchCriteria)
-                    while search_criteria_id_holder[0] is None:
-                        socketio.sleep(0.1)  # Wait a bit before checking again
-
-                    search_criteria_id = search_criteria_id_holder[0]
+                    # Parked jobs carry how often scoring already failed for them
+                    attempts = job_data.pop('scoring_attempts', 0)
+                    # Set by the pre-filter stage for obvious mismatches
+                    prefilter_score = job_data.pop('prefilter_score', None)
+                    # Set by the durable queue: the job's pending_scoring row and its run
+                    pending_id = job_data.pop('pending_id', None)
+                    pending_claims = job_data.pop('pending_claims', 0)
+                    job_search_criteria_id = job_data.pop('search_criteria_id', None) or search_criteria_id
 
                     with app.app_context():
-                        # Check if job already exists in DB (avoids wasting time rating duplicates)
-                        exists = db.session.query(Job.application_link).filter_by(
-                            application_link=job_data["application_link"]
-                        ).first() is not None
-
-                        if exists:
-                            queue_logger.info(f"Found and skipped duplicate: {job_data['title']}")
+                        # Score the job
+                        if prefilter_score is not None:
+                            # Auto-filtered by embedding similarity, skip the LLM
+                            score_dict = prefilter_score
+                            matching_score = float(score_dict["overall"])
+                        elif not cv_text or not preferences:
+                            # No CV/preferences available, use default score of 80
+                            score_dict = {
+                                "skillset": 80,
+                                "academic": 80,
+                                "experience": 80,
+                                "professional": 80,
+                                "language": 80,
+                                "preference": 80,
+                                "overall": 80,
+                                "reasoning": {
+                                    "skillset_match": {
+                                        "score": 80,
+                                        "evidence": "No CV/preferences provided - default score applied"
+                                    },
+                                    "academic_requirements": {
+                                        "score": 80,
+                                        "evidence": "No CV/preferences provided - default score applied"
+                                    },
+                                    "experience_level": {
+                                        "score": 80,
+                                        "evidence": "No CV/preferences provided - default score applied"
+                                    },
+                                    "professional_experience": {
+                                        "score": 80,
+                                        "evidence": "No CV/preferences provided - default score applied"
+                                    },
+                                    "language_requirements": {
+                                        "score": 80,
+                                        "evidence": "No CV/preferences provided - default score applied"
+                                    },
+                                    "preference_alignment": {
+                                        "score": 80,
+                                        "evidence": "No CV/preferences provided - default score applied"
+                                    }
+                                }
+                            }
+                            matching_score = 80.0
                         else:
-                            # Score the job
-                            if not cv_text or not preferences:
-                                # No CV/preferences available, use default score of 80
+                            # Reuse a previous score for the same posting/profile/prompt if we have one
+                            cache_key = score_cache_key(job_data, fingerprint, llama_config.model)
+                            cached_score = get_cached_score(cache_key)
+                            if cached_score is not None:
+                                queue_logger.info(f"Score cache hit: {job_data['title']}")
+                                result = None
+                            else:
+                                # Score using the llama.cpp evaluator
+                                result = evaluator.evaluate(job_data, cv_text, preferences)
+                                if result.success:
+                                    pool.record_latency(result.duration_seconds)
+
+                            if cached_score is not None:
+                                score_dict = cached_score
+                                matching_score = float(score_dict.get("overall", 0))
+                            elif result.success and result.assessment:
+                                # Convert to legacy format (0-100 scale) with evidence
+                                score_dict = result.assessment.to_legacy_format()
+                                matching_score = float(score_dict.get("overall", 0))
+                                store_score(cache_key, score_dict)
+                            elif result.retryable or attempts + 1 < SCORING_MAX_ATTEMPTS:
+                                # Don't persist a fake score; keep the job for the next run
+                                park_job(job_data, result.error, attempts + 1, pending_id, job_search_criteria_id)
+                                queue_logger.warning(f"Scoring failed for {job_data['title']}, parked for re-scoring: {result.error}")
+                                continue
+                            else:
+                                # Evaluation keeps failing for this job, use default score
+                                queue_logger.warning(f"Evaluation failed for {job_data['title']}: {result.error}")
                                 score_dict = {
-                                    "skillset": 80,
-                                    "academic": 80,
-                                    "experience": 80,
-                                    "professional": 80,
-                                    "language": 80,
-                                    "preference": 80,
-                                    "overall": 80,
+                                    "skillset": 50,
+                                    "academic": 50,
+                                    "experience": 50,
+                                    "professional": 50,
+                                    "language": 50,
+                                    "preference": 50,
+                                    "overall": 50,
                                     "reasoning": {
                                         "skillset_match": {
-                                            "score": 80,
-                                            "evidence": "No CV/preferences provided - default score applied"
+                                            "score": 50,
+                                            "evidence": f"Evaluation error: {result.error}"
                                         },
                                         "academic_requirements": {
-                                            "score": 80,
-                                            "evidence": "No CV/preferences provided - default score applied"
+                                            "score": 50,
+                                            "evidence": f"Evaluation error: {result.error}"
                                         },
                                         "experience_level": {
-                                            "score": 80,
-                                            "evidence": "No CV/preferences provided - default score applied"
+                                            "score": 50,
+                                            "evidence": f"Evaluation error: {result.error}"
                                         },
                                         "professional_experience": {
-                                            "score": 80,
-                                            "evidence": "No CV/preferences provided - default score applied"
+                                            "score": 50,
+                                            "evidence": f"Evaluation error: {result.error}"
                                         },
                                         "language_requirements": {
-                                            "score": 80,
-                                            "evidence": "No CV/preferences provided - default score applied"
+                                            "score": 50,
+                                            "evidence": f"Evaluation error: {result.error}"
                                         },
                                         "preference_alignment": {
-                                            "score": 80,
-                                            "evidence": "No CV/preferences provided - default score applied"
+                                            "score": 50,
+                                            "evidence": f"Evaluation error: {result.error}"
                                         }
                                     }
                                 }
-                                matching_score = 80.0
-                            else:
-                                # Score using the llama.cpp evaluator
-                                result = evaluator.evaluate(job_data, cv_text, preferences)
+                                matching_score = 50.0
 
-                                if result.success and result.assessment:
-                                    # Convert to legacy format (0-100 scale) with evidence
-                                    score_dict = result.assessment.to_legacy_format()
-                                    matching_score = float(score_dict.get("overall", 0))
-                                else:
-                                    # Evaluation failed, use default score
-                                    queue_logger.warning(f"Evaluation failed for {job_data['title']}: {result.error}")
-                                    score_dict = {
-                                        "skillset": 50,
-                                        "academic": 50,
-                                        "experience": 50,
-                                        "professional": 50,
-                                        "language": 50,
-                                        "preference": 50,
-                                        "overall": 50,
-                                        "reasoning": {
-                                            "skillset_match": {
-                                                "score": 50,
-                                                "evidence": f"Evaluation error: {result.error}"
-                                            },
-                                            "academic_requirements": {
-                                                "score": 50,
-                                                "evidence": f"Evaluation error: {result.error}"
-                                            },
-                                            "experience_level": {
-                                                "score": 50,
-                                                "evidence": f"Evaluation error: {result.error}"
-                                            },
-                                            "professional_experience": {
-                                                "score": 50,
-                                                "evidence": f"Evaluation error: {result.error}"
-                                            },
-                                            "language_requirements": {
-                                                "score": 50,
-                                                "evidence": f"Evaluation error: {result.error}"
-                                            },
-                                            "preference_alignment": {
-                                                "score": 50,
-                                                "evidence": f"Evaluation error: {result.error}"
-                                            }
-                                        }
-                                    }
-                                    matching_score = 50.0
-
-                            # Store the overall score and full details
-                            job_data["matching_score"] = matching_score
-                            job_data["score_details"] = json.dumps(score_dict)
-
-                            try:
-                                # Save to database
-                                job = Job(**job_data, search_criteria_id=search_criteria_id)
-                                db.session.add(job)
-                                db.session.commit()
-
-                                # Notify frontend
-                                socketio.emit('job_processed', {
-                                    'job': job_data['title'],
-                                    'company': job_data['company'],
-                                    'location': job_data['location'],
-                                    'score': job_data['matching_score']
-                                }, namespace='/')
-                                # worker_logger.info(f"Worker {worker_id} saved: {job_data['title']} @ {job_data['company']}")
-
-                            except IntegrityError:
-                                # Race condition: Another worker inserted it between our check and insert
-                                db.session.rollback()
-                                # worker_logger.info(f"Worker {worker_id} race condition on: {job_data['title']}")
+                        # Store the overall score and full details
+                        job_data["matching_score"] = matching_score
+                        job_data["score_details"] = score_dict
+
+                        # Hand off to the writer thread, which batches inserts and emits job_processed
+                        job_writer.submit(job_data, job_search_criteria_id, pending_id)
 
                 except Exception as e:
                     # worker_logger.error(f"Worker {worker_id} error: {e}")
                     db.session.rollback()
                     # Continue to next job even if this one failed
+                    if pending_id is not None:
+                        # Don't leave the job claimed until the lease runs out: give it back,
+                        # or park it for the next run if it keeps failing
+                        try:
+                            with app.app_context():
+                                if pending_claims >= PENDING_SCORING_MAX_CLAIMS:
+                                    park_job(job_data, str(e), attempts + 1, pending_id, job_search_criteria_id)
+                                else:
+                                    release_pending([pending_id])
+                                    db.session.commit()
+                        except Exception as release_error:
+                            queue_logger.error(f"Releasing pending job {pending_id} failed: {release_error}")
 
                 finally:
                     # Mark this job as done (important for queue.join())
                     queue.task_done()
 
+        # ===================================================================
+        # STEP 1b: Define the prefilter_stage function (optional, own thread)
+        # ===================================================================
+        def prefilter_stage(raw_queue, job_queue):
+            """
+            Sits between the scraper and the rating workers. Embeds jobs in small
+            batches and marks obvious mismatches with a low auto-filtered score so
+            the workers skip the LLM evaluation for them. Stops on a None sentinel.
+            """
+            prefilter = None
+            with app.app_context():
+                user_profile = UserProfile.query.first()
+                cv_text = (user_profile.cv_text or "") if user_profile else ""
+                preferences = (user_profile.job_preferences or "") if user_profile else ""
+            if cv_text and preferences:
+                try:
+                    prefilter = EmbeddingPrefilter(CandidateEvaluator(config=llama_config), cv_text, preferences)
+                except Exception as e:
+                    queue_logger.warning(f"Pre-filter disabled, embedding the profile failed: {e}")
+
+            finished = False
+            while not finished:
+                # Block for the first job, then collect whatever else is already waiting
+                batch = [raw_queue.get()]
+                while len(batch) < PREFILTER_BATCH_SIZE and batch[-1] is not None:
+                    try:
+                        batch.append(raw_queue.get(timeout=0.2))
+                    except Empty:
+                        break
+                if batch[-1] is None:
+                    finished = True
+                    batch.pop()
+                if not batch:
+                    continue
+
+                if prefilter is not None:
+                    try:
+                        for job_data, similarity in zip(batch, prefilter.similarities(batch)):
+                            if prefilter.is_filtered(float(similarity)):
+                                job_data['prefilter_score'] = prefilter.filtered_score(float(similarity))
+                                queue_logger.info(f"Auto-filtered ({similarity:.2f}): {job_data['title']}")
+                    except Exception as e:
+                        # Never drop jobs because embeddings failed; the LLM scores them instead
+                        queue_logger.warning(f"Pre-filter failed for {len(batch)} job(s), passing them on: {e}")
+
+                for job_data in batch:
+                    job_queue.put(job_data)
+
         # ===================================================================
         # STEP 2: Define the scrape_and_queue function (runs in scraper thread)
         # ===================================================================
-        def scrape_and_queue(job_queue):
+        def scrape_and_queue(job_queue, scoring_queue):
             """
             Scraper function that runs in its own thread.
             Creates the scraper and calls scrape_jobs(), which puts jobs
             directly into the queue as they're scraped (streaming).
+            Parked jobs go straight to `scoring_queue`, past the pre-filter.
             """
-            global scraping_active  # Need to declare global to access/modify it
             try:
                 with app.app_context():
-                    # Send initial confirmation that scraping started
-                    socketio.emit('log_message', {'data': 'Scraping task started...'}, namespace='/')
-                    socketio.sleep(0.1)  # Small delay to ensure message is sent
-
-                    # Validate that template ID is provided
-                    if 'id' not in data or not data['id']:
-                        socketio.emit('scrape_error', {'data': 'No search criteria template ID provided'}, namespace='/')
-                        return
-
-                    # Fetch the template
-                    template = SearchCriteria.query.get(data['id'])
-                    if not template:
-                        socketio.emit('scrape_error', {'data': 'Search criteria template not found'}, namespace='/')
-                        return
-
-                    # Create a new run from the template (is_template=False)
-                    search_criteria = SearchCriteria(
-                        keywords=template.keywords,
-                        locations=template.locations,
-                        distance_in_km=template.distance_in_km,
-                        date_posted=template.date_posted,
-                        exp_level=template.exp_level,
-                        job_type=template.job_type,
-                        pages=template.pages,
-                        is_template=False  # This is a run, not a template
-                    )
-                    db.session.add(search_criteria)
-                    db.session.commit()
+                    # Re-load the rows in this thread's session
+                    template = SearchCriteria.query.get(template_id)
+                    search_criteria = SearchCriteria.query.get(search_criteria_id)
+
+                    # Load the links we already have once, instead of one query per job
+                    known_links = KnownLinks.load()
 
-                    # IMPORTANT: Put the search_criteria_id into the holder
-                    # so workers can access it
-                    search_criteria_id_holder[0] = search_criteria.id
-                    queue_logger.info(f"Created search criteria run with ID: {search_criteria.id}")
+                    # Jobs whose scoring failed in earlier runs get scored in this one
+                    requeue_parked_jobs(scoring_queue)
 
                     # Create the scraper
-                    scraper = LinkedInScraper(
+                    scraper_kwargs = dict(
                         keywords=search_criteria.keywords,
                         locations=[loc.strip() for loc in search_criteria.locations.split(',')],
                         distance_in_km=search_criteria.distance_in_km,
@@ -268,90 +424,169 @@ def register_socketio_events(socketio, app):
                         exp_level=search_criteria.exp_level.split(', ') if search_criteria.exp_level else None,
                         job_type=search_criteria.job_type.split(', ') if search_criteria.job_type else None,
                         pages=search_criteria.pages,
-                        stop_callback=lambda: not scraping_active  # Pass stop check callback
+                        stop_callback=lambda: run.cancelled,  # This run's cancellation token
+                        known_callback=known_links.is_known,  # Drop duplicates before they are queued
+                        incremental=template.incremental,
+                        high_water_mark=template.high_water_mark
                     )
+                    backend = search_criteria.scraper_backend or 'browser'
+                    scraper = create_scraper(backend, **scraper_kwargs)
 
                     # Start scraping! The scraper will put jobs into the queue
                     # one-by-one as it finds them (streaming)
-                    scraper.scrape_jobs(job_queue)
+                    try:
+                        scraper.scrape_jobs(job_queue)
+                    except Exception as e:
+                        if backend == 'browser':
+                            raise
+                        # Browser mode is the fallback; jobs already queued are claimed and skipped
+                        queue_logger.warning(f"{backend} scraper failed ({e}), falling back to the browser")
+                        scraper = create_scraper('browser', **scraper_kwargs)
+                        scraper.scrape_jobs(job_queue)
+
+                    # Only a run that wasn't interrupted may advance the high-water mark,
+                    # otherwise the postings it never reached would be skipped next time
+                    if template.incremental and not run.cancelled and scraper.max_job_id_seen:
+                        template.high_water_mark = max(template.high_water_mark or 0, scraper.max_job_id_seen)
+                        db.session.commit()
+                        queue_logger.info(f"High-water mark of template {template.id} is now job {template.high_water_mark}")
 
                     # Check if scraping was stopped early
-                    if not scraping_active:
-                        queue_logger.info("Scraping was stopped by user")
-                        socketio.emit('scrape_stopped', {'data': 'Scraping was stopped by user'}, namespace='/')
+                    if run.cancelled:
+                        queue_logger.info(f"Scrape run {run.id} was stopped by user")
                     else:
                         queue_logger.info("Scraping finished successfully")
 
             except Exception as e:
                 queue_logger.error(f"An error occurred during scraping: {e}")
-                socketio.emit('scrape_error', {'data': str(e)}, namespace='/')
-            finally:
-                scraping_active = False
+                run.error = str(e)
+                socketio.emit('scrape_error', {'data': str(e), 'run_id': run.id}, namespace='/')
 
         # ===================================================================
         # STEP 3: Orchestrate the pipeline
         # ===================================================================
 
+        # Expire/trim the score cache once per run rather than on every lookup
+        try:
+            with app.app_context():
+                prune_score_cache()
+        except Exception as e:
+            queue_logger.warning(f"Score cache pruning failed: {e}")
+
+        # Size the scorer pool from the llama.cpp servers' slot count (their --parallel
+        # value) so workers map 1:1 onto slots; fall back to LLAMA_CPP_PARALLEL.
+        llama_config = LlamaCppConfig.from_env()
+        with CandidateEvaluator(config=llama_config) as probe:
+            slots_per_backend = probe.server_slot_count() or llama_config.parallel_slots
+        llama_config = dataclasses.replace(llama_config, parallel_slots=slots_per_backend)
+        server_slots = slots_per_backend * len(llama_config.backend_hosts)
+
         # Create the job queue (mailbox for jobs)
-        job_queue = Queue(maxsize=50)  # Limit to 50 to prevent memory issues
+        if PENDING_SCORING_ENABLED:
+            # Durable: scraped jobs survive a restart and are resumed on startup
+            if resume:
+                job_queue = PendingScoringQueue.for_orphaned_runs(app)
+            else:
+                job_queue = PendingScoringQueue(app, search_criteria_id)
+        else:
+            job_queue = Queue(maxsize=SCORING_QUEUE_SIZE)  # Bounded to prevent memory issues
+
+        # Single writer thread that saves scored jobs in batches and notifies the frontend
+        def notify_job_processed(job_data):
+            socketio.emit('job_processed', {
+                'job': job_data['title'],
+                'company': job_data['company'],
+                'location': job_data['location'],
+                'score': job_data['matching_score']
+            }, namespace='/')
+
+        # Scored jobs the writer could not save are parked, so the next run tries again
+        def park_unsaved_job(job_data, job_search_criteria_id, error, pending_id):
+            park_job(job_data, error, 1, pending_id, job_search_criteria_id)
 
-        # Create the thread pool executor (manages worker threads)
-        executor = ThreadPoolExecutor(max_workers=3)
+        job_writer = JobWriter(app, on_saved=notify_job_processed, on_failed=park_unsaved_job)
+
+        # Create the autoscaling pool of rating workers
+        pool = ScoringPool(
+            rating_worker,
+            job_queue,
+            server_slots=server_slots,
+            on_metrics=lambda metrics: socketio.emit('scoring_metrics', metrics, namespace='/')
+        )
 
         try:
-            # Start the 3 rating workers
-            queue_logger.info("Starting 3 rating workers...")
-            rating_futures = []
-            for i in range(3):
-                worker_id = i + 1
-                future = executor.submit(rating_worker, job_queue, worker_id)
-                rating_futures.append(future)
-
-            # Create and start the scraper thread
-            queue_logger.info("Starting scraper thread...")
-            scraper_thread = threading.Thread(
-                target=scrape_and_queue,
-                args=(job_queue,)
-            )
-            scraper_thread.start()
-
-            # Wait for scraper thread to finish
-            scraper_thread.join()
-            queue_logger.info("Scraper thread finished")
-
-            # Send sentinels (stop signals) to workers - one per worker
-            queue_logger.info("Sending stop signals to workers...")
-            for _ in range(3):
-                job_queue.put(None)
-
-            # Wait for all jobs in queue to be processed
+            # Start the writer and the rating workers
+            job_writer.start()
+            pool.start()
+
+            # Optionally put the embedding pre-filter between scraper and workers
+            scrape_queue = job_queue
+            prefilter_thread = None
+            if PREFILTER_ENABLED and not resume:
+                queue_logger.info("Starting pre-filter stage...")
+                scrape_queue = Queue(maxsize=SCORING_QUEUE_SIZE)
+                prefilter_thread = threading.Thread(
+                    target=prefilter_stage,
+                    args=(scrape_queue, job_queue),
+                    daemon=True
+                )
+                prefilter_thread.start()
+
+            if not resume:
+                # Create and start the scraper thread
+                queue_logger.info("Starting scraper thread...")
+                scraper_thread = threading.Thread(
+                    target=scrape_and_queue,
+                    args=(scrape_queue, job_queue)
+                )
+                scraper_thread.start()
+
+                # Wait for scraper thread to finish
+                scraper_thread.join()
+                queue_logger.info("Scraper thread finished")
+
+            if prefilter_thread is not None:
+                scrape_queue.put(None)  # Flush the last batch and stop the pre-filter
+                prefilter_thread.join()
+
+            # Wait for all jobs in queue to be processed, then stop the workers
             queue_logger.info("Waiting for all jobs to be processed...")
-            job_queue.join()
+            pool.shutdown()
+            job_writer.close()  # Flush the last batch
             queue_logger.info("All jobs processed successfully")
 
-            # Shutdown the executor and wait for workers to finish
-            queue_logger.info("Shutting down executor...")
-            executor.shutdown(wait=True)
-            queue_logger.info("Executor shut down successfully")
+            # Click through to the external apply pages of the best jobs in the background
+            start_link_resolver(app)
 
             # Send final completion message
             socketio.emit('scrape_finished', {
-                'data': 'Scraping and rating complete!'
+                'data': 'Scraping and rating complete!',
+                'run_id': run.id
             }, namespace='/')
 
         except Exception as e:
             logging.error(f"Error in scraping pipeline: {e}")
-            socketio.emit('scrape_error', {'data': str(e)}, namespace='/')
+            run.error = str(e)
+            socketio.emit('scrape_error', {'data': str(e), 'run_id': run.id}, namespace='/')
         finally:
             # Ensure cleanup even if there's an error
-            scraping_active = False
-            executor.shutdown(wait=False)
+            pool.stop()
+            job_writer.close()
 
     @socketio.on('start_scrape')
     def handle_start_scrape(json):
         data = json.get('data')
+        run = scrape_runs.create((data or {}).get('id'), trigger='manual')
         # Run scraping in background thread to avoid blocking SocketIO
-        socketio.start_background_task(run_scraping_task, data)
-
-    # Return the run_scraping_task function so it can be used by the scheduler
-    return run_scraping_task
+        socketio.start_background_task(start_run, data, run)
+        # Acknowledged to the client so it can stop exactly this run
+        return {'run_id': run.id}
+
+    def start_run(data, run=None):
+        """Start a run here, or queue it for a scrape worker process."""
+        if run_in_workers:
+            return submit_scrape_run(app, data, run)
+        return run_scraping_task(data, run)
+
+    # Return the start_run function so it can be used by the scheduler
+    return start_run
@@ -0,0 +1,189 @@
+"""
+Database channel between the web process and standalone scrape workers.
+
+With SCRAPE_IN_WORKERS=1 the web process does not scrape or score itself.
+Starting a run (UI, scheduler or resume) inserts a worker_run row instead,
+and any number of `python -m scrape_worker` processes claim those rows with
+`SELECT ... FOR UPDATE SKIP LOCKED` and run the usual `run_scraping_task`
+on them.
+
+Workers emit their SocketIO events through DatabaseEventBus, which stores
+them in worker_event. The web process's relay thread emits them to the
+browsers, mirrors each worker_run's status into its own scrape_runs registry
+(for /scrape/runs) and passes stop requests back via cancel_requested.
+"""
+
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+
+from models import db, WorkerRun, WorkerEvent
+from scrape_runs import scrape_runs, FINISHED_STATUSES
+
+logger = logging.getLogger('queue')
+
+SCRAPE_IN_WORKERS = os.getenv('SCRAPE_IN_WORKERS', '0') == '1'
+WORKER_POLL_SECONDS = float(os.getenv('WORKER_POLL_SECONDS', '1'))
+WORKER_HEARTBEAT_TIMEOUT = float(os.getenv('WORKER_HEARTBEAT_TIMEOUT', '120'))  # Silent longer = worker died
+WORKER_RELAY_BATCH = 500  # Events relayed per poll
+
+
+class DatabaseEventBus:
+    """
+    Stand-in for the SocketIO server inside a worker process. Implements the
+    part of its API register_socketio_events uses; events go to worker_event.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._engine = None
+
+    def _connect(self):
+        # Own connection rather than db.session, so an emit never commits the caller's session
+        if self._engine is None:
+            with self.app.app_context():
+                self._engine = db.engine
+        return self._engine.begin()
+
+    def emit(self, event, data=None, namespace=None, **kwargs):
+        try:
+            with self._connect() as connection:
+                connection.execute(WorkerEvent.__table__.insert().values(
+                    event=event,
+                    payload=json.dumps(data, default=str),
+                    created_at=datetime.utcnow()
+                ))
+        except Exception as e:
+            # Not via logging: the log handlers emit through this bus
+            print(f"Publishing {event} failed: {e}", file=sys.stderr)
+
+    def on(self, event, namespace=None):
+        # Browsers talk to the web process; there is nothing to receive here
+        return lambda handler: handler
+
+    def sleep(self, seconds):
+        time.sleep(seconds)
+
+    def start_background_task(self, target, *args, **kwargs):
+        thread = threading.Thread(target=target, args=args, kwargs=kwargs, daemon=True)
+        thread.start()
+        return thread
+
+
+# ----------------------------------------------------------------------
+# Web process side
+# ----------------------------------------------------------------------
+def submit_scrape_run(app, data, run=None):
+    """Queue a run for the scrape workers; same signature as run_scraping_task."""
+    if run is None:
+        run = scrape_runs.create((data or {}).get('id'), trigger='scheduled')
+    with app.app_context():
+        db.session.add(WorkerRun(id=run.id, template_id=run.template_id, trigger=run.trigger))
+        db.session.commit()
+    logger.info(f"Scrape run {run.id} queued for a scrape worker")
+    return run
+
+
+def _relay_events(socketio):
+    events = WorkerEvent.query.order_by(WorkerEvent.id).limit(WORKER_RELAY_BATCH).all()
+    for event in events:
+        socketio.emit(event.event, json.loads(event.payload) if event.payload else None, namespace='/')
+    if events:
+        WorkerEvent.query.filter(WorkerEvent.id <= events[-1].id).delete(synchronize_session=False)
+        db.session.commit()
+    return len(events)
+
+
+def _sync_runs():
+    now = datetime.utcnow()
+    for run in scrape_runs.active():
+        row = WorkerRun.query.get(run.id)
+        if row is None:
+            continue
+
+        if run.cancelled and not row.cancel_requested:
+            row.cancel_requested = True
+        if row.cancel_requested and row.worker is None and row.status == 'queued':
+            row.status = 'stopped'  # Never claimed, nobody else will finish it
+        if (row.status in ('running', 'stopping') and row.heartbeat_at is not None
+                and row.heartbeat_at < now - timedelta(seconds=WORKER_HEARTBEAT_TIMEOUT)):
+            row.status = 'failed'
+            row.error = f"Scrape worker {row.worker} stopped responding"
+        db.session.commit()
+
+        run.search_criteria_id = row.search_criteria_id
+        if row.status in FINISHED_STATUSES:
+            scrape_runs.release(run, row.status, row.error)
+        elif not run.cancelled:
+            run.status = row.status
+
+
+def start_worker_relay(app, socketio):
+    """Relay worker events and run statuses into this (web) process, in a daemon thread."""
+    def relay():
+        with app.app_context():
+            # Events of runs from before this process started are stale
+            WorkerEvent.query.delete()
+            db.session.commit()
+        while True:
+            try:
+                with app.app_context():
+                    relayed = _relay_events(socketio)
+                    _sync_runs()
+            except Exception as e:
+                logger.warning(f"Relaying scrape worker events failed: {e}")
+                relayed = 0
+            if relayed < WORKER_RELAY_BATCH:
+                time.sleep(WORKER_POLL_SECONDS)
+
+    thread = threading.Thread(target=relay, daemon=True)
+    thread.start()
+    return thread
+
+
+# ----------------------------------------------------------------------
+# Worker process side
+# ----------------------------------------------------------------------
+def claim_worker_run(worker_name):
+    """Claim the oldest queued run for `worker_name`, or return None (needs app context)."""
+    while True:
+        try:
+            query = WorkerRun.query.filter(
+                WorkerRun.status == 'queued',
+                WorkerRun.worker.is_(None),
+                WorkerRun.cancel_requested.is_(False)
+            ).order_by(WorkerRun.created_at)
+            if db.engine.dialect.name == 'postgresql':
+                # Skip runs other workers are claiming right now
+                query = query.with_for_update(skip_locked=True)
+            row = query.first()
+            if row is None:
+                db.session.commit()
+                return None
+            run_id, template_id, trigger = row.id, row.template_id, row.trigger
+            claimed = WorkerRun.query.filter(WorkerRun.id == run_id, WorkerRun.worker.is_(None)).update(
+                {'worker': worker_name, 'heartbeat_at': datetime.utcnow()}, synchronize_session=False)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        if claimed:
+            return scrape_runs.create(template_id, trigger=trigger, run_id=run_id)
+
+
+def report_worker_run(run):
+    """Write a local run's status to its worker_run row; stop it if the web process asked to (needs app context)."""
+    row = WorkerRun.query.get(run.id)
+    if row is None:
+        return
+    if row.cancel_requested and not run.cancelled:
+        scrape_runs.stop(run.id)
+    row.status = run.status
+    row.search_criteria_id = run.search_criteria_id
+    row.error = run.error
+    row.heartbeat_at = datetime.utcnow()
+    db.session.commit()
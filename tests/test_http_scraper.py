@@ -0,0 +1,147 @@
+"""
+HttpLinkedInScraper against the recorded guest-endpoint HTML in
+benchmarks/fixtures/linkedin/, served by the local StubLinkedInServer.
+"""
+
+from queue import Queue
+
+import pytest
+
+from scrapers import HttpLinkedInScraper
+from stub_linkedin_server import StubLinkedInServer
+
+LOCATION = 'Munich'
+
+
+@pytest.fixture
+def linkedin(monkeypatch):
+    """Stub server that records the search offsets and postings it serves."""
+    servers = []
+
+    def serve(jobs_per_location=3, page_size=10):
+        stub = StubLinkedInServer(jobs_per_location=jobs_per_location, page_size=page_size, latency=0).start()
+        stub.search_starts, stub.postings_served = [], []
+
+        search_page, job_posting = stub.search_page, stub.job_posting
+
+        def recording_search_page(location, start):
+            stub.search_starts.append(start)
+            return search_page(location, start)
+
+        def recording_job_posting(job_id):
+            stub.postings_served.append(job_id)
+            return job_posting(job_id)
+
+        stub.search_page, stub.job_posting = recording_search_page, recording_job_posting
+        monkeypatch.setattr(HttpLinkedInScraper, 'BASE_URL', stub.url)
+        servers.append(stub)
+        return stub
+
+    yield serve
+    for stub in servers:
+        stub.stop()
+
+
+def scrape(**kwargs):
+    """Run the scraper into a queue; returns (scraper, jobs in queue order)."""
+    scraper = HttpLinkedInScraper(keywords='machine learning', locations=[LOCATION], **kwargs)
+    queue = Queue()
+    scraper.scrape_jobs(queue)
+    jobs = []
+    while not queue.empty():
+        jobs.append(queue.get())
+    return scraper, jobs
+
+
+def job_ids(count):
+    """Ids of the stub's first `count` postings in LOCATION, in page order."""
+    return [StubLinkedInServer.job_id(LOCATION, index) for index in range(count)]
+
+
+def link(job_id):
+    return HttpLinkedInScraper._job_url(job_id)
+
+
+def test_parses_the_job_postings(linkedin):
+    stub = linkedin(jobs_per_location=3)
+
+    _, jobs = scrape(pages=1)
+
+    assert len(jobs) == 3
+    for job in jobs:
+        job_id = job['application_link'].rstrip('/').rsplit('/', 1)[-1]
+        posting = stub._posting(job_id)
+        assert job['title'] == posting['title']
+        assert job['company'] == posting['company']
+        assert job['location'] == 'Munich, Bavaria, Germany'
+        assert 'About the role' in job['description']
+        assert f"{posting['company']} is looking for a {posting['title']}" in job['description']
+        assert 'Design, train and evaluate machine learning models' in job['description']
+        assert f"{posting['years']}+ years of professional Python experience" in job['description']
+
+
+def test_application_link_is_the_canonical_job_url(linkedin):
+    linkedin(jobs_per_location=3)
+
+    _, jobs = scrape(pages=1)
+
+    assert sorted(job['application_link'] for job in jobs) == sorted(
+        f'https://www.linkedin.com/jobs/view/{job_id}/' for job_id in job_ids(3))
+
+
+def test_pages_by_the_number_of_cards_returned(linkedin):
+    stub = linkedin(jobs_per_location=16, page_size=7)
+
+    _, jobs = scrape(pages=5)
+
+    # 7 + 7 + 2 cards, then an empty page ends the location
+    assert stub.search_starts == [0, 7, 14, 16]
+    assert sorted(job['application_link'] for job in jobs) == sorted(
+        link(job_id) for job_id in job_ids(16))
+
+
+def test_stops_after_the_requested_pages(linkedin):
+    stub = linkedin(jobs_per_location=16, page_size=7)
+
+    _, jobs = scrape(pages=2)
+
+    assert stub.search_starts == [0, 7]
+    assert len(jobs) == 14
+
+
+def test_skips_known_links_without_fetching_them(linkedin):
+    stub = linkedin(jobs_per_location=5)
+    ids = job_ids(5)
+    known = {link(ids[1]), link(ids[3])}
+
+    scraper, jobs = scrape(pages=1, known_callback=lambda url: url in known)
+
+    assert {job['application_link'] for job in jobs} == {
+        link(job_id) for job_id in ids} - known
+    assert sorted(stub.postings_served) == sorted([ids[0], ids[2], ids[4]])
+    assert scraper.total_duplicates_skipped == 2
+
+
+def test_skips_ids_at_or_below_the_high_water_mark(linkedin):
+    stub = linkedin(jobs_per_location=8)
+    ids = sorted(job_ids(8), key=int)
+    high_water_mark = int(ids[3])
+
+    scraper, jobs = scrape(pages=1, incremental=True, high_water_mark=high_water_mark, stop_after_known=100)
+
+    assert sorted(job['application_link'] for job in jobs) == sorted(
+        link(job_id) for job_id in ids[4:])
+    assert sorted(stub.postings_served) == sorted(ids[4:])
+    assert scraper.total_duplicates_skipped == 4
+    assert scraper.max_job_id_seen == int(ids[-1])
+
+
+def test_stops_the_location_after_a_run_of_known_postings(linkedin):
+    stub = linkedin(jobs_per_location=16, page_size=7)
+    newest = max(int(job_id) for job_id in job_ids(16))
+
+    _, jobs = scrape(pages=5, incremental=True, high_water_mark=newest, stop_after_known=3)
+
+    assert jobs == []
+    assert stub.search_starts == [0]
+    assert stub.postings_served == []